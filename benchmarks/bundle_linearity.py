@@ -0,0 +1,109 @@
+"""
+Benchmark: BundleBuilder scaling for drivers, bundles and payloads
+
+Doubles the number of specs (master driver) and modules (bundle assembly
+and payload preparation) and reports time per item. With BundleBuilder the
+per-item cost stays flat; the previous master driver re-joined the whole
+driver for every spec, so its per-spec cost grows with the spec count.
+
+    python benchmarks/bundle_linearity.py [--max-specs 4000] [--max-modules 40000]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from aether import bundler, runner  # noqa: E402
+from aether.utils import get_project_paths  # noqa: E402
+from synthetic import write_project  # noqa: E402
+
+CONFIG = {"rojo_project": "default.project.json", "tree_shake": False, "bundle_workers": 1}
+
+
+def legacy_master_driver(spec_paths, tests_dir):
+    """get_master_driver's offset bookkeeping before BundleBuilder (driver text elided)"""
+    final_driver = ["-- header", "return {}", "local modules = {}"]
+    offsets = []
+    for spec_path in spec_paths:
+        with open(spec_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        final_driver.append(f"\n-- Mount {spec_path.stem}\ndo\n")
+        current_str = "\n".join(final_driver)
+        offset = current_str.count('\n') + 2
+        final_driver.append(content)
+        offsets.append({"file": spec_path, "start": offset, "end": offset + content.count('\n'), "original_start": 1})
+        final_driver.append("\nend\n")
+    return "\n".join(final_driver), offsets
+
+
+def best_of(fn, repeats=3):
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def doubling(start, maximum):
+    n = start
+    while n <= maximum:
+        yield n
+        n *= 2
+
+
+def row(label, count, seconds, unit):
+    print(f"  {label:<18} {count:7d} {unit:<8} {seconds * 1000:10.1f} ms   {seconds / count * 1e6:8.1f} us/{unit[:-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-specs", type=int, default=4000)
+    parser.add_argument("--max-modules", type=int, default=40000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["AETHER_CACHE_DIR"] = os.path.join(tmp, "cache")
+        write_project(tmp, args.max_modules, args.max_specs)
+        os.chdir(tmp)
+        paths = get_project_paths()
+        all_specs = sorted(paths["tests"].glob("*.spec.luau"))
+
+        print("Master driver")
+        for count in doubling(250, args.max_specs):
+            specs = all_specs[:count]
+            row("get_master_driver", count, best_of(lambda: bundler.get_master_driver(specs, paths["tests"])), "specs")
+            row("legacy", count, best_of(lambda: legacy_master_driver(specs, paths["tests"]), 1), "specs")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            bundle, source_map = bundler.bundle_scripts(paths, CONFIG)
+        entries = list(bundler._chunk_cache.entries.items())
+
+        print("\nBundle assembly (chunks cached, bundle not reused)")
+        for count in doubling(2500, args.max_modules):
+            subset = entries[:count]
+
+            def assemble():
+                bundler._chunk_cache.bundles.clear()
+                return bundler._assemble_bundle("rojo", ["-- header"], subset, bundler.REQUIRE_SHIM)
+
+            row("_assemble_bundle", count, best_of(assemble), "modules")
+
+        print("\nBatch payload (bundle + master driver for 100 specs)")
+        for count in doubling(2500, args.max_modules):
+            bundler._chunk_cache.bundles.clear()
+            text, sm = bundler._assemble_bundle("rojo", ["-- header"], entries[:count], bundler.REQUIRE_SHIM)
+            seconds = best_of(lambda: runner._prepare_batch(all_specs[:100], text, paths["tests"], sm))
+            row("_prepare_batch", count, seconds, "modules")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: serial vs parallel chunk loading in bundle_scripts
+
+Bundles a project with an empty chunk cache once with bundle.workers = 1
+(serial) and once with N workers, checks that both produce byte-identical
+bundles and source maps, and reports the best of several rounds.
+
+    python benchmarks/bundle_parallel.py [--modules 3000] [--workers 8]
+    python benchmarks/bundle_parallel.py --latency 2   # model a slow or network disk
+    python benchmarks/bundle_parallel.py --project path/to/your/game
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from aether import bundler  # noqa: E402
+from aether.config import get_config  # noqa: E402
+from aether.utils import get_project_paths  # noqa: E402
+from synthetic import write_project  # noqa: E402
+
+def bundle_cold(config, workers):
+    """Bundle with an empty chunk cache. Returns (seconds, bundle, source_map)"""
+    bundler._chunk_cache = bundler.ChunkCache()
+    config = dict(config, bundle_workers=workers)
+    start = time.perf_counter()
+    bundle, source_map = bundler.bundle_scripts(get_project_paths(), config)
+    return time.perf_counter() - start, bundle, source_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project", help="Bundle this project instead of a synthetic one")
+    parser.add_argument("--modules", type=int, default=3000, help="Modules in the synthetic project")
+    parser.add_argument("--workers", type=int, default=bundler.DEFAULT_BUNDLE_WORKERS)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, metavar="MS",
+                        help="Add this much latency to every module read (models cold or network storage)")
+    args = parser.parse_args()
+
+    if args.latency:
+        read_module = bundler._read_module
+
+        def slow_read(path):
+            time.sleep(args.latency / 1000)
+            return read_module(path)
+
+        bundler._read_module = slow_read
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.project:
+            os.chdir(args.project)
+        else:
+            write_project(tmp, args.modules, specs=0)
+            os.chdir(tmp)
+        config = get_config()
+
+        timings = {1: [], args.workers: []}
+        outputs = {}
+        for _ in range(args.rounds):
+            for workers in timings:
+                seconds, bundle, source_map = bundle_cold(config, workers)
+                timings[workers].append(seconds)
+                outputs[workers] = (bundle, source_map)
+
+        serial, parallel = outputs[1], outputs[args.workers]
+        assert serial[0] == parallel[0], "bundles differ"
+        assert serial[1] == parallel[1], "source maps differ"
+
+        print(f"{len(serial[1])} modules, {len(serial[0]) / 1e6:.1f} MB bundle (identical in both modes)")
+        best_serial = min(timings[1])
+        best_parallel = min(timings[args.workers])
+        print(f"serial            {best_serial * 1000:8.1f} ms")
+        print(f"{args.workers} workers{'':<{9 - len(str(args.workers))}} {best_parallel * 1000:8.1f} ms"
+              f"   ({best_serial / best_parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: runner throughput and latency against the local Open Cloud stand-in
+
+Runs N spec files as concurrent single tasks (and once more as one batch
+task) against aether.cloud_stub with the given queue/execution latency and
+fault rates, and reports wall time, tasks per second, per-task latency
+beyond the scripted cloud time, polls and HTTP retries.
+
+    python benchmarks/runner_throughput.py --specs 200 --jobs 16 --queue 0.5 --execution 1
+    python benchmarks/runner_throughput.py --rate-limit 0.05 --error-rate 0.02
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from aether import runner, stats  # noqa: E402
+from aether.cloud_stub import CloudStub  # noqa: E402
+
+SPEC_SOURCE = """return function()
+    it("passes", function()
+        expect(true).to.equal(true)
+    end)
+end
+"""
+
+
+def make_config(api_url, args):
+    return {
+        "api_url": api_url,
+        "api_key": "stub",
+        "universe_id": "1",
+        "place_id": "1",
+        "json": True,
+        "result_cache": False,
+        "poll_initial": args.poll_initial,
+        "poll_max": args.poll_max,
+        "poll_backoff": 1.5,
+        "poll_jitter": 0.1,
+        "max_retries": 4,
+    }
+
+
+def report(label, wall, count, latencies, stub, before):
+    counters = stub.stats()
+    print(f"\n{label}")
+    print(f"  wall time     {wall:8.2f} s   ({count / wall:.1f} tasks/s)")
+    if latencies:
+        latencies = sorted(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"  overhead      median {statistics.median(latencies) * 1000:7.0f} ms   p95 {p95 * 1000:7.0f} ms"
+              "   (task duration beyond the scripted cloud time)")
+    print(f"  polls         {stats.get('runner.polls'):8d}")
+    print(f"  http          {stats.get('http.requests'):8d} requests, {stats.get('http.retries')} retries, "
+          f"{stats.get('http.connections_opened')} connections")
+    faults = {k: v - before.get(k, 0) for k, v in counters.items() if k.startswith("faults.") and v > before.get(k, 0)}
+    if faults:
+        print("  injected      " + ", ".join(f"{k[7:]}: {v}" for k, v in sorted(faults.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--specs", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=16)
+    parser.add_argument("--queue", type=float, default=0.5)
+    parser.add_argument("--execution", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--poll-initial", type=float, default=0.25)
+    parser.add_argument("--poll-max", type=float, default=5.0)
+    parser.add_argument("--bundle-kb", type=int, default=256, help="Size of the (dummy) bundle sent with every task")
+    args = parser.parse_args()
+
+    stub = CloudStub(
+        queue=args.queue, execution=args.execution, jitter=args.jitter,
+        rate_limit=args.rate_limit, error_rate=args.error_rate, retry_after=0.05, seed=0
+    )
+    config = make_config(stub.start(), args)
+    cloud_time = args.queue + args.execution
+    bundle = ("-- padding\n" * (args.bundle_kb * 1024 // 11)) + "return nil"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Recorded durations seed the poll schedule; keep them out of the real cache
+            os.environ["AETHER_CACHE_DIR"] = os.path.join(tmp, "cache")
+            tests_dir = Path(tmp) / "tests"
+            tests_dir.mkdir()
+            files = []
+            for i in range(args.specs):
+                spec = tests_dir / f"spec{i}.spec.luau"
+                spec.write_text(SPEC_SOURCE, encoding="utf-8")
+                files.append(spec)
+
+            print(f"{args.specs} specs, {args.jobs} jobs, queue {args.queue}s + execution {args.execution}s "
+                  f"(+/-{args.jitter:.0%}), {args.bundle_kb} KB bundle")
+
+            stats.reset()
+            before = stub.stats()
+            failed = 0
+            latencies = []
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _, output in runner.run_tests_concurrent(files, bundle, tests_dir, config, jobs=args.jobs, timeout=120):
+                    failed += not output["success"]
+                    latencies.append(output["duration"] - cloud_time)
+            report(f"Concurrent ({failed} failed)", time.perf_counter() - start, args.specs, latencies, stub, before)
+
+            stats.reset()
+            before = stub.stats()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                output = runner.run_tests_batch(files, bundle, tests_dir, config, timeout=120)
+            wall = time.perf_counter() - start
+            report(f"Batch ({'passed' if output['success'] else 'failed: ' + str(output.get('error'))})",
+                   wall, 1, [output["duration"] - cloud_time], stub, before)
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
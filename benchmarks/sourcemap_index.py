@@ -0,0 +1,115 @@
+"""
+Benchmark: SourcemapIndex vs the previous recursive sourcemap mappings
+
+Builds a synthetic Rojo sourcemap and compares build time, lookup time and
+retained memory of the two implementations.
+
+    python benchmarks/sourcemap_index.py [--nodes 150000] [--fanout 12]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from aether.rojo_resolver import SourcemapIndex  # noqa: E402
+from synthetic import synthetic_sourcemap  # noqa: E402
+
+
+class LegacyMappings:
+    """The recursive builder RojoResolver used before SourcemapIndex"""
+
+    def __init__(self, sourcemap):
+        self.mappings = {}
+        self._build_mappings(sourcemap, [])
+
+    def _build_mappings(self, node, current_path):
+        if "filePaths" in node:
+            for file_path in node["filePaths"]:
+                self.mappings[Path(file_path).resolve()] = current_path
+        if "children" in node:
+            for child in node["children"]:
+                self._build_mappings(child, current_path + [child["name"]])
+
+    def get_roblox_path(self, file_path):
+        return self.mappings.get(file_path.resolve()) or None
+
+
+def deep_sourcemap(depth):
+    """A single chain of `depth` nested folders with a module at the bottom"""
+    root = node = {"name": "Game", "className": "DataModel", "children": []}
+    path = "src"
+    for i in range(depth):
+        child = {"name": f"F{i}", "className": "Folder", "children": []}
+        node["children"].append(child)
+        node = child
+        path += f"/F{i}"
+    node["children"].append({"name": "Leaf", "className": "ModuleScript", "filePaths": [f"{path}/Leaf.luau"]})
+    return root
+
+
+def measure(label, build, lookup):
+    """Time build and lookups, then measure memory in a separate traced build"""
+    gc.collect()
+    start = time.perf_counter()
+    built = build()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = lookup(built)
+    lookup_time = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    traced = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+
+    print(f"{label:<16} build {build_time * 1000:8.1f} ms   lookups {lookup_time * 1000:8.1f} ms   "
+          f"retained {retained / 1e6:6.1f} MB   peak {peak / 1e6:6.1f} MB   ({found} files)")
+    return built
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=150000)
+    parser.add_argument("--fanout", type=int, default=12)
+    parser.add_argument("--depth", type=int, default=5000, help="Depth of the deep-tree check")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # Sourcemap file paths are relative to the working directory
+        sourcemap = synthetic_sourcemap(args.nodes, args.fanout)
+        print(f"Synthetic sourcemap: {args.nodes} instances, fanout {args.fanout}")
+
+        legacy = measure(
+            "legacy",
+            lambda: LegacyMappings(sourcemap),
+            lambda m: sum(1 for p in list(m.mappings) if m.get_roblox_path(p)),
+        )
+        index = measure(
+            "SourcemapIndex",
+            lambda: SourcemapIndex(sourcemap),
+            lambda i: sum(1 for f in i.files if i.path_for_file(f)),
+        )
+        assert {str(p): tuple(v) for p, v in legacy.mappings.items()} == \
+            {f: index.path_for_file(f) for f in index.files}, "implementations disagree"
+
+        print(f"\nDeep sourcemap: {args.depth} nested folders")
+        deep = deep_sourcemap(args.depth)
+        try:
+            LegacyMappings(deep)
+            print("legacy           ok")
+        except RecursionError:
+            print("legacy           RecursionError")
+        print(f"SourcemapIndex   ok ({len(SourcemapIndex(deep).files)} file)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmark suite: bundling, driver generation and source-map resolution
+
+Generates synthetic Rojo projects at several scales and measures time
+(best and median of --repeats runs) and peak traced memory (one extra
+run under tracemalloc) for:
+
+  bundle_testez             TestEZ prelude, cold (empty memo and cache dir)
+  bundle_scripts            Rojo path (sourcemap.json), cold chunk cache
+  bundle_scripts (warm)     Rojo path again with every chunk cached
+  bundle_scripts_fallback   File-scan path, cold chunk cache
+  get_master_driver         Master driver for every spec
+  SourcemapIndex            Indexing the project sourcemap (what
+                            RojoResolver._build_mappings used to do)
+  resolve_source_map        1000 ten-frame tracebacks against the bundle
+
+Results are written as JSON; pass --compare to print the change against
+an earlier results file.
+
+    python benchmarks/suite.py                          # all scales
+    python benchmarks/suite.py --scales small,medium
+    python benchmarks/suite.py --compare benchmarks/results/<earlier>.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO / "src"))
+
+from aether import __version__, bundler  # noqa: E402
+from aether.rojo_resolver import SourcemapIndex  # noqa: E402
+from aether.runner import resolve_source_map  # noqa: E402
+from aether.utils import get_project_paths  # noqa: E402
+from synthetic import write_project  # noqa: E402
+
+# name: (modules, specs)
+SCALES = {
+    "small": (100, 10),
+    "medium": (5000, 200),
+    "large": (50000, 2000),
+}
+
+CONFIG = {"rojo_project": "default.project.json", "tree_shake": True, "bundle_workers": 1}
+
+
+def measure(fn, setup=None, repeats=3):
+    """
+    Time fn() `repeats` times (setup() runs untimed before each), then run it
+    once more under tracemalloc for the peak. Returns a result dict.
+    """
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "best_ms": min(times) * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "peak_mb": peak / 1e6,
+        "repeats": repeats,
+    }
+
+
+def fresh_chunk_cache():
+    bundler._chunk_cache = bundler.ChunkCache()
+
+
+def tracebacks(source_map, count=1000, frames=10, seed=0):
+    """Error messages with `frames` TaskScript frames on random mapped lines"""
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        lines = [rng.randint(m["start"], m["end"]) for m in rng.sample(source_map, min(frames, len(source_map)))]
+        head = f"TaskScript:{lines[0]}: attempt to index nil with 'value'"
+        messages.append("\n".join([head] + [f"TaskScript:{line} function value" for line in lines]))
+    return messages
+
+
+def run_scale(name, modules, specs, repeats, workdir):
+    """Generate one project and run every benchmark against it"""
+    root = Path(workdir) / name
+    root.mkdir()
+    start = time.perf_counter()
+    sourcemap = write_project(str(root), modules, specs)
+    print(f"\n{name}: {modules} modules, {specs} specs (generated in {time.perf_counter() - start:.1f}s)")
+
+    os.chdir(root)
+    paths = get_project_paths()
+    spec_paths = sorted(paths["tests"].glob("*.spec.luau"))
+    cache_dir = Path(workdir) / "cache"
+
+    def cold_prelude():
+        bundler._testez_prelude = None
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def bundle_rojo():
+        return bundler.bundle_scripts(paths, CONFIG)
+
+    results = {}
+    benches = [
+        ("bundle_testez", bundler.bundle_testez, cold_prelude),
+        ("bundle_scripts", bundle_rojo, fresh_chunk_cache),
+        ("bundle_scripts (warm)", bundle_rojo, None),
+        ("bundle_scripts_fallback", lambda: bundler.bundle_scripts_fallback(paths, config=CONFIG), fresh_chunk_cache),
+        ("get_master_driver", lambda: bundler.get_master_driver(spec_paths, paths["tests"]), None),
+        ("SourcemapIndex", lambda: SourcemapIndex(sourcemap), None),
+    ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for bench, fn, setup in benches:
+            results[bench] = measure(fn, setup, repeats)
+
+        fresh_chunk_cache()
+        _, source_map = bundle_rojo()
+        messages = tracebacks(source_map)
+        results["resolve_source_map"] = measure(
+            lambda: [resolve_source_map(m, source_map) for m in messages], None, repeats
+        )
+
+    for bench, r in results.items():
+        print(f"  {bench:<26} best {r['best_ms']:10.1f} ms   median {r['median_ms']:10.1f} ms   peak {r['peak_mb']:8.1f} MB")
+    return {"modules": modules, "specs": specs, "benchmarks": results}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous_path):
+    """Print best-time and peak-memory ratios against an earlier results file"""
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} ({previous['meta'].get('commit') or 'unknown commit'}):")
+    for scale, data in current["scales"].items():
+        before_scale = previous["scales"].get(scale)
+        if not before_scale:
+            print(f"  {scale}: not in the earlier results")
+            continue
+        print(f"  {scale}")
+        for bench, r in data["benchmarks"].items():
+            before = before_scale["benchmarks"].get(bench)
+            if not before:
+                continue
+            time_ratio = r["best_ms"] / before["best_ms"] if before["best_ms"] else float("inf")
+            mem_ratio = r["peak_mb"] / before["peak_mb"] if before["peak_mb"] else float("inf")
+            flag = "  <-- slower" if time_ratio > 1.1 else ""
+            print(f"    {bench:<26} time {time_ratio:5.2f}x   memory {mem_ratio:5.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=",".join(SCALES), help=f"Comma-separated subset of {', '.join(SCALES)}")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", metavar="FILE", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    commit = git_commit()
+    now = datetime.now(timezone.utc)
+    output = Path(args.output) if args.output else (
+        REPO / "benchmarks" / "results" / f"{now:%Y%m%dT%H%M%S}-{commit or 'nocommit'}.json"
+    )
+    results = {
+        "meta": {
+            "commit": commit,
+            "aether_version": __version__,
+            "timestamp": now.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "scales": {},
+    }
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["AETHER_CACHE_DIR"] = str(Path(workdir) / "cache")
+        try:
+            for scale in scales:
+                modules, specs = SCALES[scale]
+                results["scales"][scale] = run_scale(scale, modules, specs, args.repeats, workdir)
+        finally:
+            os.chdir(cwd)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Synthetic Rojo projects and sourcemaps for the benchmarks
+
+write_project lays out a project the way the bundler expects it (src/,
+Packages/, tests/) together with a matching sourcemap.json, so both the
+Rojo and the fallback bundling paths can run against it.
+"""
+import json
+import os
+from collections import deque
+
+MODULE_SOURCE = """local {name} = {{}}
+{requires}
+function {name}.value(x)
+    -- {padding}
+    return x + {index}
+end
+
+return {name}
+"""
+
+PACKAGE_SOURCE = """local {name} = {{}}
+
+function {name}.new()
+    return setmetatable({{}}, {{ __index = {name} }})
+end
+
+return {name}
+"""
+
+SPEC_SOURCE = """local ReplicatedStorage = game:GetService("ReplicatedStorage")
+{requires}
+return function()
+    describe("{name}", function()
+        it("adds", function()
+            expect(1 + 1).to.equal(2)
+        end)
+
+        it("requires", function()
+            expect(Module0).to.be.ok()
+        end)
+    end)
+end
+"""
+
+
+def synthetic_sourcemap(nodes, fanout, subfolders=3):
+    """
+    A sourcemap with `nodes` instances, filled breadth-first: every folder
+    holds `fanout` children, `subfolders` of them folders and the rest modules
+    """
+    root = {"name": "Game", "className": "DataModel", "children": []}
+    service = {"name": "ReplicatedStorage", "className": "ReplicatedStorage", "children": []}
+    root["children"].append(service)
+    folders = deque([(service, "src")])
+    count = 2
+    while count < nodes:
+        parent, directory = folders.popleft()
+        for i in range(fanout):
+            if count >= nodes:
+                break
+            if i < subfolders:
+                folder = {"name": f"Folder{i}", "className": "Folder", "children": []}
+                parent["children"].append(folder)
+                folders.append((folder, f"{directory}/Folder{i}"))
+            else:
+                parent["children"].append({
+                    "name": f"Module{i}",
+                    "className": "ModuleScript",
+                    "filePaths": [f"{directory}/Module{i}.luau"],
+                })
+            count += 1
+    return root
+
+
+def write_project(root, modules, specs, per_folder=25, package_share=0.1):
+    """
+    Write a project with `modules` ModuleScripts (a `package_share` of them
+    as Packages) and `specs` spec files, plus a matching sourcemap.json.
+    Each module requires its predecessor in the same folder and each spec
+    requires a handful of modules, so tree shaking has real work to do.
+    Returns: the project's sourcemap (as written to sourcemap.json)
+    """
+    packages = int(modules * package_share)
+    shared = modules - packages
+
+    shared_node = {"name": "Shared", "className": "Folder", "children": []}
+    packages_node = {"name": "Packages", "className": "Folder", "children": []}
+    storage = {"name": "ReplicatedStorage", "className": "ReplicatedStorage", "children": [shared_node, packages_node]}
+    sourcemap = {"name": "Game", "className": "DataModel", "children": [storage]}
+
+    group_node = None
+    for i in range(shared):
+        group = f"Group{i // per_folder}"
+        directory = os.path.join(root, "src", "shared", group)
+        if i % per_folder == 0:
+            os.makedirs(directory, exist_ok=True)
+            group_node = {"name": group, "className": "Folder", "children": []}
+            shared_node["children"].append(group_node)
+        name = f"Module{i}"
+        requires = f"local Previous = require(script.Parent.Module{i - 1})\n" if i % per_folder else ""
+        with open(os.path.join(directory, f"{name}.luau"), "w", encoding="utf-8") as f:
+            f.write(MODULE_SOURCE.format(name=name, requires=requires, index=i, padding="x" * 120))
+        group_node["children"].append({
+            "name": name,
+            "className": "ModuleScript",
+            "filePaths": [f"src/shared/{group}/{name}.luau"],
+        })
+
+    for i in range(packages):
+        name = f"Package{i}"
+        directory = os.path.join(root, "Packages", name)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "init.lua"), "w", encoding="utf-8") as f:
+            f.write(PACKAGE_SOURCE.format(name=name))
+        packages_node["children"].append({
+            "name": name,
+            "className": "ModuleScript",
+            "filePaths": [f"Packages/{name}/init.lua"],
+        })
+
+    tests = os.path.join(root, "tests")
+    os.makedirs(tests, exist_ok=True)
+    with open(os.path.join(tests, "_helpers.luau"), "w", encoding="utf-8") as f:
+        f.write("return {}\n")
+    for i in range(specs):
+        module = (i * per_folder) % max(shared, 1)
+        requires = "".join(
+            f"local Module{j} = require(ReplicatedStorage.Shared.Group{m // per_folder}.Module{m})\n"
+            for j, m in enumerate((module, (module + per_folder - 1) % max(shared, 1)))
+        )
+        with open(os.path.join(tests, f"spec{i}.spec.luau"), "w", encoding="utf-8") as f:
+            f.write(SPEC_SOURCE.format(name=f"spec{i}", requires=requires))
+
+    with open(os.path.join(root, "sourcemap.json"), "w", encoding="utf-8") as f:
+        json.dump(sourcemap, f)
+    return sourcemap
@@ -0,0 +1,151 @@
+"""
+Aether - Bundle composition profiler
+
+Breaks a test payload down per module, per top-level package and per
+service: bytes and lines contributed, wrapper overhead versus source, and
+the time spent reading and rendering each module, next to the TestEZ
+prelude, bundle header, require shim and driver (--profile-bundle).
+"""
+import os
+
+from .ui import console
+
+
+def package_of(header):
+    """
+    Top-level package of a module from its chunk header: the Wally package
+    for anything under Packages, else the service plus its first folder
+    """
+    service, folders, script_name, _ = header
+    path = (service,) + tuple(folders) + (script_name,)
+    if len(path) > 2 and path[1] == "Packages":
+        if path[2] == "_Index" and len(path) > 4:
+            # Packages._Index.<owner_name@version>.<name>... groups as ReplicatedStorage.Packages.<name>
+            return ".".join(path[:2] + path[4:5])
+        return ".".join(path[:3])
+    return ".".join(path[:2])
+
+
+def _module_row(path, entry, root):
+    service, folders, script_name, _ = entry["header"]
+    return {
+        "file": os.path.relpath(path, root),
+        "instance": ".".join((service,) + tuple(folders) + (script_name,)),
+        "service": service,
+        "package": package_of(entry["header"]),
+        "bytes": entry["chunk_bytes"] + 1,  # Plus the newline joining it to the bundle
+        "source_bytes": entry["content_bytes"],
+        "wrapper_bytes": entry["chunk_bytes"] + 1 - entry["content_bytes"],
+        "lines": entry["chunk_lines"],
+        "read_ms": entry["read_time"] * 1000,
+        "render_ms": entry["render_time"] * 1000,
+    }
+
+
+def _group(rows, key):
+    groups = {}
+    for row in rows:
+        group = groups.setdefault(row[key], {
+            "name": row[key], "modules": 0, "bytes": 0, "source_bytes": 0,
+            "wrapper_bytes": 0, "lines": 0, "read_ms": 0.0, "render_ms": 0.0,
+        })
+        group["modules"] += 1
+        for field in ("bytes", "source_bytes", "wrapper_bytes", "lines", "read_ms", "render_ms"):
+            group[field] += row[field]
+    return sorted(groups.values(), key=lambda g: (-g["bytes"], g["name"]))
+
+
+def build_report(profile, prelude, drivers, root, bundle_seconds=None):
+    """
+    Build the report for one payload layout.
+
+    profile: dict filled by bundle_scripts(profile=...)
+    prelude: the TestEZ prelude source
+    drivers: [(label, driver_source)]; one per task in per-file mode
+    Returns: a JSON-serialisable dict
+    """
+    modules = sorted(
+        (_module_row(path, entry, root) for path, entry in profile.get("modules", [])),
+        key=lambda r: (-r["bytes"], r["file"])
+    )
+
+    # Parts are joined with newlines: prelude + "\n" + bundle + "\n" + driver
+    sections = [{"name": "TestEZ prelude", "bytes": len(prelude.encode("utf-8")) + 1, "lines": prelude.count("\n") + 1}]
+    for name, (size, lines) in profile.get("sections", {}).items():
+        sections.append({"name": name, "bytes": size, "lines": lines})
+    sections.append({
+        "name": "modules",
+        "bytes": sum(r["bytes"] for r in modules),
+        "lines": sum(r["lines"] for r in modules),
+    })
+    for label, driver in drivers:
+        sections.append({"name": label, "bytes": len(driver.encode("utf-8")) + 1, "lines": driver.count("\n") + 1})
+
+    shared = [s for s in sections if not s["name"].startswith("driver")]
+    largest_driver = max((s for s in sections if s["name"].startswith("driver")), key=lambda s: s["bytes"], default=None)
+    payload_bytes = sum(s["bytes"] for s in shared) + (largest_driver["bytes"] if largest_driver else 0)
+
+    return {
+        "payload_bytes": payload_bytes,  # Largest single task payload
+        "tasks": max(len(drivers), 1),
+        "bundle_ms": bundle_seconds * 1000 if bundle_seconds is not None else None,
+        "totals": {
+            "modules": len(modules),
+            "source_bytes": sum(r["source_bytes"] for r in modules),
+            "wrapper_bytes": sum(r["wrapper_bytes"] for r in modules),
+            "read_ms": sum(r["read_ms"] for r in modules),
+            "render_ms": sum(r["render_ms"] for r in modules),
+        },
+        "sections": sections,
+        "services": _group(modules, "service"),
+        "packages": _group(modules, "package"),
+        "modules": modules,
+    }
+
+
+def _size(n):
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f} MB"
+    if n >= 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n} B"
+
+
+def print_report(report, top=20):
+    """Print the report as aligned tables"""
+    payload = report["payload_bytes"]
+    totals = report["totals"]
+
+    def share(n):
+        return f"{100 * n / payload:5.1f}%" if payload else "    -"
+
+    console.print(f"\n[bold]Bundle profile[/bold]  payload {_size(payload)}"
+                  + (f" per task ({report['tasks']} tasks)" if report["tasks"] > 1 else ""))
+    if report["bundle_ms"] is not None:
+        console.print(f"[dim]Bundled in {report['bundle_ms']:.1f}ms; module reads {totals['read_ms']:.1f}ms, "
+                      f"renders {totals['render_ms']:.1f}ms (cached modules show their last read)[/dim]")
+
+    console.print("\n[bold]Sections:[/bold]")
+    for s in report["sections"]:
+        console.print(f"  {_size(s['bytes']):>10} {share(s['bytes'])} {s['lines']:>8} lines  {s['name']}")
+    console.print(f"  [dim]{totals['modules']} modules: {_size(totals['source_bytes'])} source + "
+                  f"{_size(totals['wrapper_bytes'])} wrappers[/dim]")
+
+    header = f"  {'bytes':>10} {'share':>6} {'lines':>8} {'source':>10} {'wrapper':>10} {'read':>8} {'render':>8}  "
+    for title, rows, label in (
+        ("Services", report["services"], "name"),
+        ("Packages", report["packages"], "name"),
+        (f"Largest modules (top {top})", report["modules"], "file"),
+    ):
+        console.print(f"\n[bold]{title}:[/bold]")
+        console.print(f"[dim]{header}{'modules' if label == 'name' else 'file'}[/dim]", soft_wrap=True)
+        for row in rows[:top]:
+            name = row[label] + (f" ({row['modules']})" if label == "name" else "")
+            console.print(
+                f"  {_size(row['bytes']):>10} {share(row['bytes'])} {row['lines']:>8} "
+                f"{_size(row['source_bytes']):>10} {_size(row['wrapper_bytes']):>10} "
+                f"{row['read_ms']:>6.2f}ms {row['render_ms']:>6.2f}ms  {name}",
+                soft_wrap=True
+            )
+        if len(rows) > top:
+            console.print(f"  [dim]... {len(rows) - top} more (use --json for everything)[/dim]")
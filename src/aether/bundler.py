@@ -4,7 +4,14 @@ Aether - Script bundler for Roblox Cloud execution
 from pathlib import Path
 import sys
 import os
+import json
+import time
+import hashlib
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from aether.ui import console
+from . import __version__, stats, tracing
+from .utils import get_cache_dir
 
 if hasattr(sys, '_MEIPASS'):
     PACKAGE_DIR = Path(sys._MEIPASS) / "aether"
@@ -13,15 +20,94 @@ else:
 
 TESTEZ_DIR = PACKAGE_DIR / "vendor" / "testez"
 
+# In-process memo of the rendered TestEZ prelude: (text, line_count)
+_testez_prelude = None
+# Hash of the vendor directory; it cannot change while the process runs
+_testez_key = None
+
+
+def _testez_cache_key():
+    """
+    Hash of the vendored TestEZ files (path and contents) and the aether
+    version, computed once per process. Contents rather than mtimes, as a
+    --onefile build extracts the vendor directory afresh on every launch.
+    """
+    global _testez_key
+    if _testez_key is not None:
+        return _testez_key
+    h = hashlib.sha256(__version__.encode("utf-8"))
+    for file_path in sorted(TESTEZ_DIR.rglob("*.lua")):
+        rel = file_path.relative_to(TESTEZ_DIR).as_posix()
+        h.update(f"{rel}\n".encode("utf-8"))
+        h.update(file_path.read_bytes())
+        h.update(b"\0")
+    _testez_key = h.hexdigest()
+    return _testez_key
+
+
+def get_testez_prelude():
+    """
+    Get the rendered TestEZ prelude and its line count.
+
+    Memoized in-process and persisted under the cache directory, keyed by
+    a hash of the vendor directory and the aether version.
+    Returns: (prelude_source, line_count)
+    """
+    global _testez_prelude
+
+    if _testez_prelude:
+        stats.incr("testez_prelude.memory_hits")
+        return _testez_prelude
+
+    if not TESTEZ_DIR.exists():
+        raise FileNotFoundError(f"TestEZ not found at {TESTEZ_DIR}")
+
+    key = _testez_cache_key()
+    cache_file = get_cache_dir() / "testez" / f"{key}.json"
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        _testez_prelude = (cached["prelude"], cached["lines"])
+        stats.incr("testez_prelude.disk_hits")
+        return _testez_prelude
+    except (OSError, ValueError, KeyError):
+        pass
+
+    stats.incr("testez_prelude.misses")
+    prelude = _render_testez()
+    line_count = prelude.line_count
+    _testez_prelude = (prelude, line_count)
+
+    # Persisting is best-effort; a read-only cache dir must not break runs
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"prelude": prelude, "lines": line_count}, f)
+        os.replace(tmp_file, cache_file)
+        # Preludes of other TestEZ/aether versions are never read again
+        for stale in cache_file.parent.glob("*.json"):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+    return prelude, line_count
+
 
 def bundle_testez():
     """Bundle TestEZ framework from internal package directory"""
-    bundle = []
+    return get_testez_prelude()[0]
+
+
+def _render_testez():
+    """Render the TestEZ prelude from the vendored sources"""
+    builder = BundleBuilder()
     
     if not TESTEZ_DIR.exists():
         raise FileNotFoundError(f"TestEZ not found at {TESTEZ_DIR}")
     
-    bundle.append("""
+    builder.add("""
 -- Bundle TestEZ framework
 local ReplicatedStorage = game:GetService("ReplicatedStorage")
 local TestEZFolder = Instance.new("Folder")
@@ -41,7 +127,7 @@ ReportersFolder.Parent = testezModule
     if init_path.exists():
         with open(init_path, "r", encoding="utf-8") as f:
             init_content = f.read()
-        bundle.append(f"""
+        builder.add(f"""
 do
     _G.VirtualFiles = _G.VirtualFiles or {{}}
     _G.VirtualFiles[testezModule] = function()
@@ -77,7 +163,7 @@ end
             continue
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
-        bundle.append(f"""
+        builder.add(f"""
 do
     local scriptInstance = Instance.new("ModuleScript")
     scriptInstance.Name = "{name}"
@@ -95,7 +181,7 @@ end
             continue
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
-        bundle.append(f"""
+        builder.add(f"""
 do
     local scriptInstance = Instance.new("ModuleScript")
     scriptInstance.Name = "{name}"
@@ -108,7 +194,7 @@ do
 end
 """)
     
-    return "\n".join(bundle)
+    return builder.build()[0]
 
 
 def get_roblox_path(file_path, root_dir):
@@ -160,86 +246,170 @@ def get_roblox_path(file_path, root_dir):
 
 
 from .rojo_resolver import RojoResolver
+from .require_graph import reachable_files, spec_entry_points
 
-def bundle_scripts(paths, config):
-    """Bundle all source code into a Lua script using Rojo sourcemap"""
-    bundle = []
-    source_map = []
-    current_line = 1
-    
-    chunk = "print('--- Bundling Game Source (Rojo) ---')"
-    bundle.append(chunk)
-    current_line += chunk.count('\n') + 1
-    
-    chunk = """
-local function GetOrCreate(parent, name)
-    local existing = parent:FindFirstChild(name)
-    if existing then return existing end
-    local folder = Instance.new("Folder")
-    folder.Name = name
-    folder.Parent = parent
-    return folder
-end
-"""
-    bundle.append(chunk)
-    current_line += chunk.count('\n') + 1
 
-    rojo_project = config.get("rojo_project", "default.project.json")
-    resolver = RojoResolver(rojo_project)
-    
-    if not resolver.generate_sourcemap():
-        # Use yellow for warning, but respecting console settings (highlight=False)
-        console.print("[yellow][!] Rojo sourcemap not found. Falling back to file system scan.[/yellow]")
-        return bundle_scripts_fallback(paths)
-        
-    print("Bundling scripts...")
-    files_to_process = resolver.get_all_scripts()
-    files_to_process.sort(key=lambda p: str(p))
-    
-    for path in files_to_process:
-        path_components = resolver.get_roblox_path(path)
-        if not path_components:
-            continue
-            
-        service_name = path_components[0]
-        remaining = path_components[1:]
-        script_name = remaining[-1]
-        folders = remaining[:-1]
-        fname = path.name
-        class_name = "ModuleScript"
-        is_json = fname.lower().endswith(".json")
+# Threads used to read and render module chunks (bundle.workers; 1 = serial).
+# Reads are I/O-bound, so this exceeds the core count like the stdlib default.
+DEFAULT_BUNDLE_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Below this many modules to read, thread startup costs more than it saves
+PARALLEL_MIN_MODULES = 64
+
+# Modules per worker task, to keep per-task overhead small
+PARALLEL_BATCH = 32
+
+
+class ChunkCache:
+    """
+    Rendered module chunks for bundle_scripts, reused across watch-mode runs.
+
+    Entries are keyed by path and validated by mtime + size, falling back to
+    a content hash when the stat changed but the file did not. Each entry
+    keeps its chunk text and line counts so source-map offsets can be
+    shifted without re-counting, and the last full bundle per kind is kept
+    so an unchanged module set reuses it as-is.
+    """
+
+    def __init__(self):
+        self.entries = {}  # {str(path): entry}
+        self.bundles = {}  # {kind: (signature, bundle_text, source_map)}
+        self.known = {}  # {kind: paths seen by the last scan}
+        self._version = 0
+
+    def get_many(self, items, workers=1):
+        """
+        Entries for [(path, header)], in order, where header is (service,
+        folders, name, class). Modules that need reading are read and
+        rendered on up to `workers` threads in batches; results are merged
+        into the cache in input order on the calling thread, so the entries
+        (and any bundle built from them) are identical to loading each item
+        in turn.
+        Returns: [(path, entry_or_exception)]
+        """
+        loaded = [self._try_load(item, read=False) for item in items]
+        pending = [i for i, outcome in enumerate(loaded) if outcome is None]
+        if workers > 1 and len(pending) >= PARALLEL_MIN_MODULES:
+            batches = [pending[i:i + PARALLEL_BATCH] for i in range(0, len(pending), PARALLEL_BATCH)]
+            load_batch = lambda batch: [self._try_load(items[i]) for i in batch]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for batch, outcomes in zip(batches, pool.map(load_batch, batches)):
+                    for i, outcome in zip(batch, outcomes):
+                        loaded[i] = outcome
+        else:
+            for i in pending:
+                loaded[i] = self._try_load(items[i])
         
-        if fname.endswith(".server.luau") or fname.endswith(".server.lua"):
-            class_name = "Script"
-        elif fname.endswith(".client.luau") or fname.endswith(".client.lua"):
-            class_name = "LocalScript"
-             
+        results = []
+        for (path, _), outcome in zip(items, loaded):
+            if not isinstance(outcome, Exception):
+                outcome = self._commit(str(path), outcome)
+            results.append((path, outcome))
+        return results
+
+    def _try_load(self, item, read=True):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            if is_json:
-                level = 0
-                while True:
-                    eq = "=" * level
-                    close_seq = f"]{eq}]"
-                    if close_seq not in content:
-                        start_delim = f"[{eq}["
-                        end_delim = close_seq
-                        break
-                    level += 1
-                content = f"return game:GetService('HttpService'):JSONDecode({start_delim}{content}{end_delim})"
+            return self._load(*item, read=read)
         except Exception as e:
-            print(f"Skipping {path}: {e}")
-            continue
+            return e
+
+    def _load(self, path, header, read=True):
+        """
+        Stat, read and render one module without touching the cache (safe to
+        run on worker threads). Returns a (status, ...) tuple for _commit,
+        or None when the module needs reading and `read` is False.
+        """
+        st = os.stat(path)
+        entry = self.entries.get(str(path))
+        if entry and entry["header"] == header:
+            if entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                return ("hit", entry)
+        if not read:
+            return None
+
+        start = time.perf_counter()
+        content = _read_module(path)
+        read_time = time.perf_counter() - start
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if entry and entry["header"] == header and entry["digest"] == digest:
+            return ("touched", entry, st.st_mtime_ns, st.st_size)
+
+        start = time.perf_counter()
+        chunk, preamble_lines = _render_module_chunk(header, content)
+        render_time = time.perf_counter() - start
+        return ("miss", {
+            "mtime": st.st_mtime_ns,
+            "size": st.st_size,
+            "digest": digest,
+            "header": header,
+            "chunk": chunk,
+            "preamble_lines": preamble_lines,
+            "content_lines": content.count('\n') + 1,
+            "chunk_lines": chunk.count('\n') + 1,
+            "content_bytes": len(content.encode("utf-8")),
+            "chunk_bytes": len(chunk.encode("utf-8")),
+            "read_time": read_time,
+            "render_time": render_time,
+        })
+
+    def _commit(self, key, loaded):
+        """Apply a _load result to the cache. Returns the entry."""
+        status, entry = loaded[0], loaded[1]
+        if status == "hit":
+            stats.incr("bundle.chunk_hits")
+            return entry
+        if status == "touched":
+            entry["mtime"], entry["size"] = loaded[2], loaded[3]
+            stats.incr("bundle.chunk_hits")
+            return entry
+
+        stats.incr("bundle.chunk_misses")
+        self._version += 1
+        entry["version"] = self._version
+        self.entries[key] = entry
+        return entry
 
-        preamble = f"""
+    def prune(self, kind, known_paths):
+        """Drop entries for paths that are no longer part of any project scan"""
+        self.known[kind] = set(known_paths)
+        keep = set().union(*self.known.values())
+        for key in list(self.entries):
+            if key not in keep:
+                del self.entries[key]
+
+
+_chunk_cache = ChunkCache()
+
+
+def _read_module(path):
+    """Read a module source, wrapping .json files in a JSONDecode call"""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    if path.name.lower().endswith(".json"):
+        level = 0
+        while True:
+            eq = "=" * level
+            close_seq = f"]{eq}]"
+            if close_seq not in content:
+                start_delim = f"[{eq}["
+                end_delim = close_seq
+                break
+            level += 1
+        content = f"return game:GetService('HttpService'):JSONDecode({start_delim}{content}{end_delim})"
+    return content
+
+
+def _render_module_chunk(header, content):
+    """Render the Instance/_G.VirtualFiles wrapper for one module. Returns (chunk, preamble_lines)"""
+    service_name, folders, script_name, class_name = header
+    preamble = f"""
 do
     local current = game:GetService("{service_name}")
 """
-        for folder in folders:
-            preamble += f'    current = GetOrCreate(current, "{folder}")\n'
-            
-        preamble += f"""
+    for folder in folders:
+        preamble += f'    current = GetOrCreate(current, "{folder}")\n'
+        
+    preamble += f"""
     local scriptInstance = current:FindFirstChild("{script_name}")
     if not scriptInstance then
         scriptInstance = Instance.new("{class_name}")
@@ -251,24 +421,203 @@ do
     _G.VirtualFiles[scriptInstance] = function(...) 
         local script = scriptInstance 
 """
-        chunk = preamble + f"        {content}\n    end\nend\n"
-        preamble_lines = preamble.count('\n')
-        start_map = current_line + preamble_lines
-        content_lines_count = content.count('\n') + 1
-        end_map = start_map + content_lines_count - 1
-        
-        source_map.append({
-            "file": str(path),
-            "start": start_map,
-            "end": end_map,
+    chunk = preamble + f"        {content}\n    end\nend\n"
+    return chunk, preamble.count('\n')
+
+
+class BundleText(str):
+    """Payload text that knows its line count, so consumers never re-count it"""
+    line_count = None
+
+
+def _line_count(text, lines=None):
+    """Lines in text: `lines` when the caller already knows, else the text's own count"""
+    if lines is not None:
+        return lines
+    if getattr(text, "line_count", None) is not None:
+        return text.line_count
+    return text.count('\n') + 1
+
+
+class BundleBuilder:
+    """
+    Append-only builder for bundles, drivers and payloads.
+
+    Segments are joined with newlines (like "\\n".join(parts)) once, in
+    build(). The line each segment starts on is tracked as segments are
+    added, from line counts the caller already has where possible, so no
+    segment is ever scanned twice and source-map ranges are recorded as
+    they go.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.source_map = []
+        self.line = 1  # Line the next segment starts on
+
+    def add(self, text, lines=None):
+        """Append a segment (`lines`: its line count, if known). Returns its first line."""
+        start = self.line
+        self.parts.append(text)
+        self.line += _line_count(text, lines)
+        return start
+
+    def add_mapped(self, text, file, skip=0, length=None, lines=None):
+        """
+        Append a segment and map `length` of its lines, starting `skip` lines
+        in, to lines 1.. of `file`. By default the whole segment is mapped.
+        Returns: the segment's first line
+        """
+        lines = _line_count(text, lines)
+        start = self.add(text, lines)
+        length = lines - skip if length is None else length
+        self.source_map.append({
+            "file": file,
+            "start": start + skip,
+            "end": start + skip + length - 1,
             "original_start": 1
         })
+        return start
+
+    def add_bundle(self, text, source_map, lines=None):
+        """Append a built bundle or driver, shifting its source map to where it lands"""
+        start = self.add(text, lines)
+        for mapping in source_map:
+            mapping = dict(mapping)
+            mapping["start"] += start - 1
+            mapping["end"] += start - 1
+            self.source_map.append(mapping)
+        return start
+
+    @property
+    def line_count(self):
+        return self.line - 1
+
+    def build(self):
+        """Join the segments. Returns: (BundleText, source_map)"""
+        text = BundleText("\n".join(self.parts))
+        text.line_count = self.line_count
+        return text, self.source_map
+
+
+def _assemble_bundle(kind, header_chunks, entries, shim, profile=None):
+    """
+    Join header chunks, module entries and the require shim.
+
+    Source-map offsets are computed from cached line counts (BundleBuilder).
+    When the same entries are assembled again the previous bundle text is reused.
+    `profile`, if given, is filled with the composition (see bundle_profile.py).
+    Returns: (bundle_source, source_map)
+    """
+    if profile is not None:
+        header = "\n".join(header_chunks)
+        profile["sections"] = {
+            "bundle header": (len(header.encode("utf-8")) + 1, header.count("\n") + 1),
+            "require shim": (len(shim.encode("utf-8")), shim.count("\n") + 1),
+        }
+        profile["modules"] = [(path, entry) for path, entry in entries]
+
+    signature = tuple((path, entry["version"]) for path, entry in entries)
+    cached = _chunk_cache.bundles.get(kind)
+    if cached and cached[0] == signature:
+        stats.incr("bundle.reused")
+        return cached[1], [dict(m) for m in cached[2]]
+
+    builder = BundleBuilder()
+    for chunk in header_chunks:
+        builder.add(chunk)
+    for path, entry in entries:
+        builder.add_mapped(
+            entry["chunk"], path, skip=entry["preamble_lines"],
+            length=entry["content_lines"], lines=entry["chunk_lines"]
+        )
+    builder.add(shim)
+    bundle_text, source_map = builder.build()
+    _chunk_cache.bundles[kind] = (signature, bundle_text, source_map)
+    return bundle_text, [dict(m) for m in source_map]
+
+
+GET_OR_CREATE = """
+local function GetOrCreate(parent, name)
+    local existing = parent:FindFirstChild(name)
+    if existing then return existing end
+    local folder = Instance.new("Folder")
+    folder.Name = name
+    folder.Parent = parent
+    return folder
+end
+"""
+
+
+def _load_entries(items, config):
+    """
+    Cached chunk entries for [(path, header)] in order, read and rendered on
+    config["bundle_workers"] threads. Unreadable modules are reported and left out.
+    Returns: [(path_str, entry)]
+    """
+    workers = config.get("bundle_workers") or DEFAULT_BUNDLE_WORKERS
+    with tracing.span("load modules", modules=len(items), workers=workers):
+        loaded = _chunk_cache.get_many(items, workers)
+    entries = []
+    for path, outcome in loaded:
+        if isinstance(outcome, (OSError, UnicodeDecodeError)):
+            print(f"Skipping {path}: {outcome}")
+            continue
+        if isinstance(outcome, Exception):
+            raise outcome
+        entries.append((str(path), outcome))
+    return entries
+
+
+def _tree_shake(files_to_process, instance_map, specs, paths, config):
+    """
+    Keep only the files reachable from the selected specs and _helpers.
+    Falls back to every file when a reachable require is dynamic or unknown.
+    """
+    if specs is None or not config.get("tree_shake", True):
+        return files_to_process
+    
+    keep, reason = reachable_files(spec_entry_points(specs, paths["tests"]), instance_map)
+    if keep is None:
+        stats.incr("bundle.tree_shake.fallbacks")
+        if config.get("verbose"):
+            console.print(f"[dim]\\[tree-shake] {reason}; bundling everything[/dim]")
+        return files_to_process
+    
+    kept = [p for p in files_to_process if str(p) in keep]
+    stats.incr("bundle.tree_shake.kept", len(kept))
+    stats.incr("bundle.tree_shake.dropped", len(files_to_process) - len(kept))
+    return kept
+
+
+def bundle_scripts(paths, config, specs=None, profile=None, modules=None):
+    """
+    Bundle all source code into a Lua script using Rojo sourcemap.
+    When `specs` is given, only modules those specs can require are bundled.
+    `profile` (a dict) collects the bundle's composition for --profile-bundle.
+    `modules` is a scan_modules() result to reuse instead of resolving again.
+    """
+    header_chunks = ["print('--- Bundling Game Source (Rojo) ---')", GET_OR_CREATE]
+
+    scan = modules or scan_modules(paths, config)
+    if scan["kind"] == "fallback":
+        # Use yellow for warning, but respecting console settings (highlight=False)
+        console.print("[yellow][!] Rojo sourcemap not found. Falling back to file system scan.[/yellow]")
+        return bundle_scripts_fallback(paths, specs=specs, config=config, profile=profile, scan=scan)
         
-        bundle.append(chunk)
-        current_line += chunk.count('\n') + 1
+    print("Bundling scripts...")
+    instance_map = scan["instance_map"]
+    _chunk_cache.prune("rojo", instance_map)
+    with tracing.span("tree shake"):
+        files_to_process = _tree_shake(scan["files"], instance_map, specs, paths, config)
+    
+    items = [(path, scan["headers"][str(path)]) for path in files_to_process]
+    entries = _load_entries(items, config)
+    with tracing.span("assemble", modules=len(entries)):
+        return _assemble_bundle("rojo", header_chunks, entries, REQUIRE_SHIM, profile)
 
-    # Require shim
-    shim = """
+
+REQUIRE_SHIM = """
 local _oldRequire = require
 _G.LoadedModules = {}
 
@@ -294,94 +643,8 @@ function require(module)
     error("REQUIRE_INVALID_TYPE: " .. typeof(module) .. " " .. tostring(module))
 end
 """
-    bundle.append(shim)
-    
-    return "\n".join(bundle), source_map
-
 
-def bundle_scripts_fallback(paths):
-    """Legacy bundling logic (fallback)"""
-    bundle = []
-    source_map = []
-    current_line = 1
-    
-    chunk = "print('--- Bundling Game Source (Legacy Fallback) ---')"
-    bundle.append(chunk)
-    current_line += chunk.count('\n') + 1
-    
-    chunk = """
-local function GetOrCreate(parent, name)
-    local existing = parent:FindFirstChild(name)
-    if existing then return existing end
-    local folder = Instance.new("Folder")
-    folder.Name = name
-    folder.Parent = parent
-    return folder
-end
-"""
-    bundle.append(chunk)
-    current_line += chunk.count('\n') + 1
-
-    src_files = list(paths["src"].rglob("*.luau"))
-    pkg_files = list(paths["packages"].rglob("*.lua")) + list(paths["packages"].rglob("*.luau"))
-    files_to_process = src_files + pkg_files
-    
-    def sort_key(p):
-        is_init = p.name in ('init.lua', 'init.luau')
-        return (len(p.parts), 0 if is_init else 1, str(p))
-    
-    files_to_process.sort(key=sort_key)
-    
-    for path in files_to_process:
-        info = get_roblox_path(path, paths["root"])
-        if not info:
-            continue
-        
-        service_name, folders, script_name, instance_type = info
-        
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except:
-            continue
-
-        preamble = f"""
-do
-    local current = game:GetService("{service_name}")
-"""
-        for folder in folders:
-            preamble += f'    current = GetOrCreate(current, "{folder}")\n'
-            
-        preamble += f"""
-    local scriptInstance = current:FindFirstChild("{script_name}")
-    if not scriptInstance then
-        scriptInstance = Instance.new("{instance_type}")
-        scriptInstance.Name = "{script_name}"
-        scriptInstance.Parent = current
-    end
-    
-    _G.VirtualFiles = _G.VirtualFiles or {{}}
-    _G.VirtualFiles[scriptInstance] = function(...) 
-        local script = scriptInstance 
-"""
-        chunk = preamble + f"        {content}\n    end\nend\n"
-        
-        preamble_lines = preamble.count('\n')
-        start_map = current_line + preamble_lines
-        content_lines_count = content.count('\n') + 1
-        end_map = start_map + content_lines_count - 1
-        
-        source_map.append({
-            "file": str(path),
-            "start": start_map,
-            "end": end_map,
-            "original_start": 1
-        })
-        
-        bundle.append(chunk)
-        current_line += chunk.count('\n') + 1
-
-    shim = """
+FALLBACK_REQUIRE_SHIM = """
 local _oldRequire = require
 _G.LoadedModules = {}
 
@@ -404,9 +667,270 @@ function require(module)
     error("REQUIRE_INVALID_TYPE: " .. typeof(module) .. " " .. tostring(module))
 end
 """
-    bundle.append(shim)
+
+
+# Folders and files the fallback scan never descends into or bundles.
+# Patterns are fnmatch globs tested against the entry name and its path
+# relative to the project root (e.g. "_Index", "Packages/_Index/*/roact").
+DEFAULT_SCAN_IGNORE = ("node_modules",)
+
+# Module extensions the fallback scan picks up, per scanned folder
+_SCAN_EXTENSIONS = {"src": (".luau",), "packages": (".lua", ".luau")}
+
+
+def _ignored_by(name, rel_path, patterns):
+    """The first ignore pattern matching an entry, or None"""
+    for pattern in patterns:
+        if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(rel_path, pattern):
+            return pattern
+    return None
+
+
+def _scan_tree(top, root, extensions, ignore, found, skipped):
+    """
+    Walk `top` once with os.scandir, appending module files to `found`
+    as (sort_key, path_str) and skipped entries to `skipped` as (path, reason).
+    Symlinked folders are not followed (same as Path.rglob).
+    """
+    if not os.path.isdir(top):
+        return
+    root_prefix = len(str(root)) + 1
+    stack = [str(top)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            skipped.append((directory, f"unreadable: {e.strerror or e}"))
+            continue
+        for entry in entries:
+            rel_path = entry.path[root_prefix:].replace(os.sep, "/")
+            pattern = _ignored_by(entry.name, rel_path, ignore)
+            if pattern:
+                skipped.append((entry.path, f"ignored by '{pattern}'"))
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+            except OSError as e:
+                skipped.append((entry.path, f"unreadable: {e.strerror or e}"))
+                continue
+            if entry.name.endswith(extensions):
+                # Shallow paths first, init modules before their siblings
+                is_init = entry.name in ('init.lua', 'init.luau')
+                found.append(((rel_path.count("/"), 0 if is_init else 1, entry.path), entry.path))
+
+
+def _rojo_files(resolver):
+    """
+    The sourcemap's scripts, resolving each one's instance path once.
+    Returns: {"files": sorted Paths, "instance_map": {path: instance_path},
+              "headers": {path: (service, folders, name, class)}}
+    """
+    files_to_process = []
+    instance_map = {}
+    headers = {}
+    for path in sorted(resolver.get_all_scripts(), key=str):
+        path_components = resolver.get_roblox_path(path)
+        if not path_components:
+            continue
+        path_str = str(path)
+        files_to_process.append(path)
+        instance_map[path_str] = tuple(path_components)
+        
+        fname = path.name
+        class_name = "ModuleScript"
+        if fname.endswith(".server.luau") or fname.endswith(".server.lua"):
+            class_name = "Script"
+        elif fname.endswith(".client.luau") or fname.endswith(".client.lua"):
+            class_name = "LocalScript"
+        headers[path_str] = (path_components[0], tuple(path_components[1:-1]), path_components[-1], class_name)
+    return {"files": files_to_process, "instance_map": instance_map, "headers": headers}
+
+
+def _fallback_files(paths, config=None):
+    """
+    Scan src and Packages for modules in one pass each.
+    Returns: {"files": sorted Paths, "instance_map": {path: instance_path},
+              "headers": {path: (service, folders, name, class)},
+              "skipped": [(path, reason)]}
+    """
+    config = config or {}
+    ignore = tuple(config.get("bundle_ignore", DEFAULT_SCAN_IGNORE))
+    found = []
+    skipped = []
+    with tracing.span("scan"):
+        for folder, extensions in _SCAN_EXTENSIONS.items():
+            _scan_tree(paths[folder], paths["root"], extensions, ignore, found, skipped)
+        found.sort()
+    
+    files_to_process = []
+    instance_map = {}
+    headers = {}
+    for _, path_str in found:
+        path = Path(path_str)
+        info = get_roblox_path(path, paths["root"])
+        if not info:
+            skipped.append((path_str, "unmapped (not under a src service folder or Packages)"))
+            continue
+        files_to_process.append(path)
+        service_name, folders, script_name, class_name = info
+        instance_map[path_str] = (service_name,) + tuple(folders) + (script_name,)
+        headers[path_str] = (service_name, tuple(folders), script_name, class_name)
+    
+    for _, reason in skipped:
+        stats.incr("bundle.scan." + reason.split(" ")[0].rstrip(":"))
+    return {"files": files_to_process, "instance_map": instance_map, "headers": headers, "skipped": skipped}
+
+
+def _report_skipped(skipped, config):
+    """Warn about unreadable entries; list every skipped entry in verbose mode"""
+    for path, reason in skipped:
+        if reason.startswith("unreadable"):
+            console.print(f"[yellow][!] Skipped {path}: {reason}[/yellow]")
+        elif config.get("verbose"):
+            console.print(f"[dim]\\[scan] skipped {path}: {reason}[/dim]")
+
+
+def scan_modules(paths, config):
+    """
+    Every bundleable module, from the Rojo sourcemap or else a file system
+    scan. Resolve once and pass the result to bundle_scripts(modules=...)
+    to reuse it.
+    Returns: the _rojo_files / _fallback_files dict plus "kind" ("rojo" or "fallback")
+    """
+    resolver = RojoResolver(config.get("rojo_project", "default.project.json"))
+    if resolver.generate_sourcemap():
+        scan = _rojo_files(resolver)
+        scan["kind"] = "rojo"
+    else:
+        scan = _fallback_files(paths, config)
+        scan["kind"] = "fallback"
+    return scan
+
+
+def bundle_scripts_fallback(paths, specs=None, config=None, profile=None, scan=None):
+    """Legacy bundling logic (fallback)"""
+    header_chunks = ["print('--- Bundling Game Source (Legacy Fallback) ---')", GET_OR_CREATE]
+
+    config = config or {}
+    scan = scan or _fallback_files(paths, config)
+    _report_skipped(scan["skipped"], config)
+    instance_map = scan["instance_map"]
+    _chunk_cache.prune("fallback", instance_map)
+    with tracing.span("tree shake"):
+        files_to_process = _tree_shake(scan["files"], instance_map, specs, paths, config)
     
-    return "\n".join(bundle), source_map
+    items = [(path, scan["headers"][str(path)]) for path in files_to_process]
+    entries = _load_entries(items, config)
+    with tracing.span("assemble", modules=len(entries)):
+        return _assemble_bundle("fallback", header_chunks, entries, FALLBACK_REQUIRE_SHIM, profile)
+
+
+# Driver tail shared by the single and master drivers. Expects `modules`,
+# `TestPlanner`, `TestRunner` and ROOT_DEPTH (how many describe levels the
+# module path adds above the spec's own describes) to be defined. The
+# top-level describe of each module is named after its spec, which tags every
+# result with the spec it came from.
+# TestSession.pushNode/popNode are wrapped so every It and Describe node gets
+# an os.clock() duration that includes its beforeEach/afterEach hooks, and so
+# each test prints AETHER_START/AETHER_RESULT lines as it runs (progress.py).
+DRIVER_RESULTS = """
+local HttpService = game:GetService("HttpService")
+local TestSession = TestEZ.TestSession
+local _pushNode = TestSession.pushNode
+local _popNode = TestSession.popNode
+
+function TestSession:pushNode(planNode)
+    _pushNode(self, planNode)
+    self.nodeStack[#self.nodeStack].startClock = os.clock()
+    if planNode.type == "It" then
+        print("AETHER_START " .. HttpService:JSONEncode({
+            name = planNode.phrase,
+            spec = self.nodeStack[1].planNode.phrase
+        }))
+    end
+end
+
+function TestSession:popNode()
+    local node = self.nodeStack[#self.nodeStack]
+    if node and node.startClock then
+        node.duration = os.clock() - node.startClock
+    end
+    if node and node.planNode.type == "It" then
+        print("AETHER_RESULT " .. HttpService:JSONEncode({
+            name = node.planNode.phrase,
+            status = node.status,
+            errors = node.errors,
+            duration = node.duration,
+            spec = self.nodeStack[1].planNode.phrase
+        }))
+    end
+    _popNode(self)
+end
+
+local plan = TestPlanner.createPlan(modules, nil, {})
+local results = TestRunner.runPlan(plan)
+
+local function collectResults(node, list, describes, path, depth, spec)
+    list = list or {}
+    describes = describes or {}
+    path = path or {}
+    depth = depth or 0
+    
+    if depth == 1 and node.planNode then
+        spec = node.planNode.phrase
+    end
+    
+    if node.planNode and node.planNode.type == "It" then
+        local status = "Unknown"
+        if node.status == "Success" then status = "Success" end
+        if node.status == "Failure" then status = "Failure" end
+        if node.status == "Skipped" then status = "Skipped" end
+        
+        table.insert(list, {
+            name = node.planNode.phrase,
+            status = status,
+            errors = node.errors,
+            duration = node.duration,
+            spec = spec
+        })
+    elseif node.planNode and node.planNode.type == "Describe" and depth > ROOT_DEPTH then
+        path = table.clone(path)
+        table.insert(path, node.planNode.phrase)
+        table.insert(describes, {
+            name = table.concat(path, " > "),
+            duration = node.duration,
+            spec = spec
+        })
+    end
+    
+    if node.children then
+        for _, child in ipairs(node.children) do
+            collectResults(child, list, describes, path, depth + 1, spec)
+        end
+    end
+    
+    return list, describes
+end
+
+local flatResults, describeTimings = collectResults(results)
+
+local status = "Success"
+if results.failureCount > 0 then
+    status = "FAILED"
+end
+
+return {
+    status = status,
+    results = flatResults,
+    describes = describeTimings,
+    failures = results.errors,
+    failureCount = results.failureCount
+}
+"""
 
 
 def get_testez_driver(spec_path, tests_dir):
@@ -421,8 +945,8 @@ def get_testez_driver(spec_path, tests_dir):
     else:
         helpers_content = "return {}"
     
-    driver = []
-    driver.append("""
+    driver = BundleBuilder()
+    driver.add("""
 -- --- TEST RUNNER (TestEZ) ---
 local ReplicatedStorage = game:GetService("ReplicatedStorage")
 local TestEZ = require(ReplicatedStorage.TestEZ.testez)
@@ -441,82 +965,40 @@ _G.VirtualFiles = _G.VirtualFiles or {}
 _G.VirtualFiles[HelpersModule] = function()
     local script = HelpersModule
 """)
-    driver.append(helpers_content)
-    driver.append("""
+    driver.add(helpers_content)
+    driver.add("""
 end
 
 local SpecModule = Instance.new("ModuleScript")
 """)
-    driver.append(f'SpecModule.Name = "{spec_path.stem}"')
-    driver.append("""
+    driver.add(f'SpecModule.Name = "{spec_path.stem}"')
+    driver.add("""
 SpecModule.Parent = TestsFolder
 
 local testMethod = (function()
     local script = SpecModule
 """)
-    pre_spec_lines = sum(chunk.count('\n') for chunk in driver) + len(driver) - 1
-    spec_offset = pre_spec_lines + 1
-    
-    driver.append(spec_content)
     spec_len = spec_content.count('\n') + 1
+    spec_offset = driver.add(spec_content, spec_len)
     
-    driver.append("""
+    driver.add(f"""
 end)()
 
 local TestPlanner = TestEZ.TestPlanner
 local TestRunner = TestEZ.TestRunner
 
-local modules = {
-    {
+local modules = {{
+    {{
         method = testMethod,
-        path = {"TestSpec"},
+        path = {{"{spec_path.stem}"}},
         pathStringForSorting = "testspec"
-    }
-}
-
-local plan = TestPlanner.createPlan(modules, nil, {})
-local results = TestRunner.runPlan(plan)
-
-local function collectResults(node, list)
-    list = list or {}
-    
-    if node.planNode and node.planNode.type == "It" then
-        local status = "Unknown"
-        if node.status == "Success" then status = "Success" end
-        if node.status == "Failure" then status = "Failure" end
-        if node.status == "Skipped" then status = "Skipped" end
-        
-        table.insert(list, {
-            name = node.planNode.phrase,
-            status = status,
-            errors = node.errors
-        })
-    end
-    
-    if node.children then
-        for _, child in ipairs(node.children) do
-            collectResults(child, list)
-        end
-    end
-    
-    return list
-end
-
-local flatResults = collectResults(results)
+    }}
+}}
 
-local status = "Success"
-if results.failureCount > 0 then
-    status = "FAILED"
-end
-
-return {
-    status = status,
-    results = flatResults,
-    failures = results.errors,
-    failureCount = results.failureCount
-}
+local ROOT_DEPTH = 1
 """)
-    return "\n".join(driver), spec_offset, spec_len
+    driver.add(DRIVER_RESULTS)
+    return driver.build()[0], spec_offset, spec_len
 
 
 def get_master_driver(spec_paths, tests_dir):
@@ -531,13 +1013,8 @@ def get_master_driver(spec_paths, tests_dir):
     else:
         helpers_content = "return {}"
         
-    final_driver = []
-    offsets = []
-    
-    def add_chunk(c):
-        final_driver.append(c)
-        
-    add_chunk("""
+    driver = BundleBuilder()
+    driver.add("""
 -- --- MASTER TEST RUNNER (TestEZ) ---
 local ReplicatedStorage = game:GetService("ReplicatedStorage")
 local TestEZ = require(ReplicatedStorage.TestEZ.testez)
@@ -556,8 +1033,8 @@ _G.VirtualFiles = _G.VirtualFiles or {}
 _G.VirtualFiles[HelpersModule] = function()
     local script = HelpersModule
 """)
-    add_chunk(helpers_content)
-    add_chunk("""
+    driver.add(helpers_content)
+    driver.add("""
 end
 
 local modules = {}
@@ -573,7 +1050,7 @@ local modules = {}
             
         spec_name = spec_path.stem
         
-        add_chunk(f"""
+        driver.add(f"""
 -- Mount {spec_name}
 do
     local specModule = Instance.new("ModuleScript")
@@ -583,22 +1060,9 @@ do
     local testMethod = (function()
         local script = specModule
 """)
-        # Calculate offset
-        current_str = "\n".join(final_driver)
-        current_lines = current_str.count('\n') + 1
-        offset = current_lines + 1
-        
-        add_chunk(content)
-        len_content = content.count('\n') + 1
+        driver.add_mapped(content, spec_path)
         
-        offsets.append({
-            "file": spec_path,
-            "start": offset,
-            "end": offset + len_content - 1,
-            "original_start": 1
-        })
-        
-        add_chunk(f"""
+        driver.add(f"""
     end)()
     
     table.insert(modules, {{
@@ -609,51 +1073,12 @@ do
 end
 """)
 
-    add_chunk("""
+    driver.add("""
 local TestPlanner = TestEZ.TestPlanner
 local TestRunner = TestEZ.TestRunner
 
-local plan = TestPlanner.createPlan(modules, nil, {})
-local results = TestRunner.runPlan(plan)
-
-local function collectResults(node, list)
-    list = list or {}
-    
-    if node.planNode and node.planNode.type == "It" then
-        local status = "Unknown"
-        if node.status == "Success" then status = "Success" end
-        if node.status == "Failure" then status = "Failure" end
-        if node.status == "Skipped" then status = "Skipped" end
-        
-        table.insert(list, {
-            name = node.planNode.phrase,
-            status = status,
-            errors = node.errors
-        })
-    end
-    
-    if node.children then
-        for _, child in ipairs(node.children) do
-            collectResults(child, list)
-        end
-    end
-    
-    return list
-end
-
-local flatResults = collectResults(results)
-
-local status = "Success"
-if results.failureCount > 0 then
-    status = "FAILED"
-end
-
-return {
-    status = status,
-    results = flatResults,
-    failures = results.errors,
-    failureCount = results.failureCount
-}
+local ROOT_DEPTH = 2
 """)
+    driver.add(DRIVER_RESULTS)
 
-    return "\n".join(final_driver), offsets
+    return driver.build()
@@ -54,6 +54,39 @@ def create_parser():
         metavar="SECONDS",
         help=f"Timeout per test in seconds"
     )
+    run_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run spec files as separate tasks, up to N at once (disables batch mode)"
+    )
+    run_parser.add_argument(
+        "--slowest",
+        type=int,
+        metavar="N",
+        help="Report the N slowest tests and describe blocks"
+    )
+    run_parser.add_argument(
+        "--profile-bundle",
+        action="store_true",
+        help="Report what the payload is made of (per module, package and service) instead of running"
+    )
+    run_parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Write a Chrome trace (chrome://tracing, Perfetto) of every run phase and task to FILE"
+    )
+    run_parser.add_argument(
+        "--no-tree-shake",
+        action="store_true",
+        help="Bundle every module instead of only those the selected specs require"
+    )
+    run_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always execute on the cloud instead of reusing cached results for unchanged payloads"
+    )
     run_parser.add_argument(
         "--api",
         metavar="KEY",
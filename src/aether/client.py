@@ -0,0 +1,158 @@
+"""
+Aether - Open Cloud HTTP client
+
+A shared, connection-pooled requests session used by every runner path,
+with connect/read timeouts and retries that honour Retry-After.
+"""
+import email.utils
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+from . import stats
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_RETRY_BACKOFF = 0.5
+
+# Longest we are willing to wait for a single Retry-After
+MAX_RETRY_WAIT = 30.0
+
+# GET is idempotent, so any transient server error is retried. A POST that
+# got a 5xx other than 503 may already have created the task, so only
+# responses that guarantee nothing was processed are retried for it.
+RETRY_STATUSES = {
+    "GET": (429, 500, 502, 503, 504),
+    "POST": (429, 503),
+}
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        stats.incr("http.connections_opened")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        stats.incr("http.connections_opened")
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count the connections they open"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _failed_to_connect(error):
+    """True if a request failed while opening its connection, before anything was sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # requests wraps urllib3's MaxRetryError, whose reason is the underlying error
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _retry_after(resp):
+    """Parse a Retry-After header (seconds or HTTP date). Returns seconds or None."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CloudClient:
+    """Keep-alive HTTP client with per-request timeouts and bounded retries"""
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_RETRY_BACKOFF, pool_size=32):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = _PooledAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _wait(self, attempt, resp=None):
+        delay = _retry_after(resp) if resp is not None else None
+        if delay is None:
+            delay = self.backoff * (2 ** attempt)
+            delay += random.uniform(0, delay * 0.25)
+        time.sleep(min(delay, MAX_RETRY_WAIT))
+
+    def request(self, method, url, **kwargs):
+        """Send a request, retrying transient failures. Returns the last response."""
+        kwargs.setdefault("timeout", self.timeout)
+        retry_statuses = RETRY_STATUSES.get(method.upper(), ())
+        attempt = 0
+        while True:
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # A POST whose body may have been sent (read timeout, connection
+                # reset or aborted mid-request) may have created the task
+                unsafe = method.upper() == "POST" and not _failed_to_connect(e)
+                if unsafe or attempt >= self.max_retries:
+                    raise
+                stats.incr("http.retries")
+                self._wait(attempt)
+                attempt += 1
+                continue
+
+            stats.incr("http.requests")
+            stats.counters["http.connections_reused"] = max(
+                0, stats.get("http.requests") - stats.get("http.connections_opened")
+            )
+            if resp.status_code in retry_statuses and attempt < self.max_retries:
+                stats.incr("http.retries")
+                self._wait(attempt, resp)
+                attempt += 1
+                continue
+            return resp
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+
+def get_client(config):
+    """Get the shared client for these [runner] HTTP settings"""
+    global _client, _client_key
+    key = (
+        config.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+        config.get("read_timeout", DEFAULT_READ_TIMEOUT),
+        config.get("max_retries", DEFAULT_MAX_RETRIES),
+    )
+    with _client_lock:
+        if _client is None or _client_key != key:
+            _client = CloudClient(connect_timeout=key[0], read_timeout=key[1], max_retries=key[2])
+            _client_key = key
+        return _client
@@ -0,0 +1,341 @@
+"""
+Aether - Local Open Cloud stand-in
+
+A small HTTP server speaking the part of the Open Cloud Luau execution API
+that Aether uses (create task, get task, task logs, cancel), for offline
+end-to-end runs and load tests. Point a run at it with [runner] api_url or
+AETHER_API_URL:
+
+    python -m aether.cloud_stub --port 8787 --queue 0.5 --execution 2
+    AETHER_API_URL=http://127.0.0.1:8787 aether run
+
+No Luau is executed. Each task walks through a scripted list of states
+(QUEUED, PROCESSING, then COMPLETE by default) with configurable durations
+and reports a canned output or error. Its canned log lines are revealed
+gradually while it is PROCESSING. Requests can be answered at random with
+429s (with Retry-After) or 5xx responses to exercise retries.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TERMINAL_STATES = ("COMPLETE", "FAILED", "CANCELLED")
+ERROR_STATUSES = (500, 502, 503, 504)
+
+# One passing test, so runs against the stub report something
+DEFAULT_OUTPUT = {
+    "results": [{
+        "status": "Success",
+        "failureCount": 0,
+        "results": [{"name": "stub passes", "status": "Success", "duration": 0.001, "errors": []}],
+    }]
+}
+DEFAULT_ERROR = "TaskScript:1: stub task failed"
+
+_CREATE_RE = re.compile(r"^/cloud/v2/(universes/[^/]+/places/[^/]+(?:/versions/[^/]+)?/luau-execution-session-tasks)$")
+_TASK_RE = re.compile(r"^/cloud/v2/(universes/[^/]+/places/[^/]+(?:/versions/[^/]+)?/luau-execution-session-tasks/[^/:]+)(/logs|:cancel)?$")
+
+
+def parse_script(text):
+    """
+    Parse a state script such as "QUEUED:0.5,PROCESSING:2,COMPLETE" into
+    [(state, seconds)]. The last state is where the task stays.
+    """
+    steps = []
+    for part in text.split(","):
+        state, _, seconds = part.strip().partition(":")
+        steps.append((state.strip().upper(), float(seconds) if seconds else 0.0))
+    if not steps or steps[-1][0] not in TERMINAL_STATES:
+        raise ValueError(f"state script must end in one of {', '.join(TERMINAL_STATES)}: {text!r}")
+    return steps
+
+
+def progress_logs(output):
+    """The AETHER_START/AETHER_RESULT lines a driver would print for a canned output"""
+    lines = []
+    for suite in output.get("results", []):
+        for result in suite.get("results") or []:
+            lines.append("AETHER_START " + json.dumps({"name": result.get("name"), "spec": result.get("spec")}))
+            lines.append("AETHER_RESULT " + json.dumps(result))
+    return lines
+
+
+def _timestamp(at):
+    return datetime.fromtimestamp(at, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class CloudStub:
+    """
+    Task store and behaviour of the stand-in.
+
+    scripts: state scripts ([(state, seconds)], see parse_script), assigned
+    to new tasks in turn; by default QUEUED for `queue` seconds, PROCESSING
+    for `execution` seconds, then `outcome`
+    jitter: +/- fraction applied to every step's duration
+    rate_limit / error_rate: probability of answering a request with a 429
+    (Retry-After: `retry_after`) or a random 5xx instead
+    """
+
+    def __init__(self, queue=0.5, execution=1.0, outcome="COMPLETE", scripts=None, jitter=0.0,
+                 output=None, error_message=DEFAULT_ERROR, logs=None,
+                 rate_limit=0.0, error_rate=0.0, retry_after=0.1, seed=None):
+        self.scripts = scripts or [[("QUEUED", queue), ("PROCESSING", execution), (outcome.upper(), 0.0)]]
+        self.jitter = jitter
+        self.output = output if output is not None else DEFAULT_OUTPUT
+        self.error_message = error_message
+        self.logs = logs if logs is not None else progress_logs(self.output)
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.tasks = {}  # {task_path: {"created", "steps", "cancelled", "payload_bytes"}}
+        self.counters = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def stats(self):
+        """Request, task and fault counters so far"""
+        with self._lock:
+            counters = dict(self.counters)
+        counters["tasks.open"] = sum(
+            1 for path in list(self.tasks) if self.task_state(path)[0] not in TERMINAL_STATES
+        )
+        return counters
+
+    def fault(self):
+        """The status to inject for this request (429 or 5xx), or None"""
+        with self._lock:
+            roll = self._rng.random()
+            if roll < self.rate_limit:
+                return 429
+            if roll < self.rate_limit + self.error_rate:
+                return self._rng.choice(ERROR_STATUSES)
+        return None
+
+    def create_task(self, parent, payload_bytes):
+        with self._lock:
+            script = self.scripts[len(self.tasks) % len(self.scripts)]
+            steps = [
+                (state, max(0.0, seconds * (1 + self._rng.uniform(-self.jitter, self.jitter))))
+                for state, seconds in script
+            ]
+            path = f"{parent}/{uuid.uuid4()}"
+            self.tasks[path] = {
+                "created": time.time(), "steps": steps, "cancelled": None, "payload_bytes": payload_bytes
+            }
+        self.count("tasks.created")
+        return path
+
+    def task_state(self, path, now=None):
+        """(state, seconds since it was entered, its scripted duration or None) at `now`"""
+        task = self.tasks[path]
+        now = time.time() if now is None else now
+        if task["cancelled"] is not None and now >= task["cancelled"]:
+            return "CANCELLED", now - task["cancelled"], None
+        since = task["created"]
+        for i, (state, seconds) in enumerate(task["steps"]):
+            last = i == len(task["steps"]) - 1
+            if last or now < since + seconds:
+                return state, now - since, None if last else seconds
+            since += seconds
+
+    def cancel_task(self, path):
+        task = self.tasks[path]
+        if self.task_state(path)[0] not in TERMINAL_STATES:
+            task["cancelled"] = time.time()
+            self.count("tasks.cancelled")
+
+    def task_json(self, path):
+        task = self.tasks[path]
+        state, elapsed, _ = self.task_state(path)
+        data = {
+            "path": path,
+            "createTime": _timestamp(task["created"]),
+            "updateTime": _timestamp(time.time() - elapsed),
+            "user": "0",
+            "state": state,
+        }
+        if state == "COMPLETE":
+            data["output"] = self.output
+        elif state == "FAILED":
+            data["error"] = {"code": "SCRIPT_ERROR", "message": self.error_message}
+        return data
+
+    def logs_json(self, path):
+        """Logs so far: revealed evenly over the PROCESSING step, all of them once it ends"""
+        task = self.tasks[path]
+        now = time.time()
+        if task["cancelled"] is not None:
+            now = min(now, task["cancelled"])
+        share = 1.0 if self.task_state(path, now)[0] in TERMINAL_STATES else 0.0
+        start = task["created"]
+        for state, seconds in task["steps"][:-1]:
+            if state == "PROCESSING":
+                share = min(1.0, max(0.0, (now - start) / seconds)) if seconds else float(now >= start)
+                break
+            start += seconds
+        visible = int(len(self.logs) * share)
+        return {
+            "luauExecutionSessionTaskLogs": [{"path": f"{path}/logs/1", "messages": self.logs[:visible]}],
+            "nextPageToken": "",
+        }
+
+    def start(self, host="127.0.0.1", port=0, verbose=False):
+        """Serve on a background thread. Returns the base URL (for api_url)."""
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._server.verbose = verbose
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like Open Cloud
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, code, message, headers=None):
+        self._send(status, {"code": code, "message": message}, headers)
+
+    def _handle(self, method):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = self.path.split("?", 1)[0]
+        stub.count(f"requests.{method}")
+
+        if path == "/_stub/stats":
+            return self._send(200, stub.stats())
+        if not self.headers.get("x-api-key"):
+            return self._error(401, "UNAUTHENTICATED", "Missing x-api-key header")
+
+        fault = stub.fault()
+        if fault == 429:
+            stub.count("faults.429")
+            return self._error(429, "RESOURCE_EXHAUSTED", "Too many requests", {"Retry-After": str(stub.retry_after)})
+        if fault:
+            stub.count(f"faults.{fault}")
+            return self._error(fault, "INTERNAL", "Injected server error")
+
+        create = _CREATE_RE.match(path)
+        if create and method == "POST":
+            try:
+                script = json.loads(body or b"{}").get("script")
+            except ValueError:
+                script = None
+            if not isinstance(script, str):
+                return self._error(400, "INVALID_ARGUMENT", "Body must be JSON with a string 'script'")
+            task_path = stub.create_task(create.group(1), len(script))
+            return self._send(200, stub.task_json(task_path))
+
+        task = _TASK_RE.match(path)
+        if not task or task.group(1) not in stub.tasks:
+            return self._error(404, "NOT_FOUND", f"No such resource: {path}")
+        task_path, suffix = task.group(1), task.group(2)
+        if suffix == ":cancel" and method == "POST":
+            stub.cancel_task(task_path)
+            return self._send(200, stub.task_json(task_path))
+        if suffix == "/logs" and method == "GET":
+            return self._send(200, stub.logs_json(task_path))
+        if suffix is None and method == "GET":
+            return self._send(200, stub.task_json(task_path))
+        return self._error(405, "METHOD_NOT_ALLOWED", f"{method} {path}")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m aether.cloud_stub",
+        description="Local stand-in for the Open Cloud Luau execution API"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--queue", type=float, default=0.5, help="Seconds each task stays QUEUED")
+    parser.add_argument("--execution", type=float, default=1.0, help="Seconds each task stays PROCESSING")
+    parser.add_argument("--outcome", default="COMPLETE", choices=("COMPLETE", "FAILED"), help="Final state")
+    parser.add_argument("--script", action="append", metavar="STATES",
+                        help='State script, e.g. "QUEUED:0.5,PROCESSING:2,FAILED" (repeat to alternate between tasks)')
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- fraction on every duration")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 5xx")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--output", metavar="FILE", help="JSON file with the task output to report")
+    parser.add_argument("--logs", metavar="FILE", help="Text file of log lines to report (one per line)")
+    parser.add_argument("--error-message", default=DEFAULT_ERROR, help="Error message of FAILED tasks")
+    parser.add_argument("--seed", type=int, help="Seed for jitter and fault injection")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    output = None
+    if args.output:
+        with open(args.output, "r", encoding="utf-8") as f:
+            output = json.load(f)
+    logs = None
+    if args.logs:
+        with open(args.logs, "r", encoding="utf-8") as f:
+            logs = f.read().splitlines()
+    try:
+        scripts = [parse_script(s) for s in args.script] if args.script else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    stub = CloudStub(
+        queue=args.queue, execution=args.execution, outcome=args.outcome, scripts=scripts,
+        jitter=args.jitter, output=output, error_message=args.error_message, logs=logs,
+        rate_limit=args.rate_limit, error_rate=args.error_rate, retry_after=args.retry_after, seed=args.seed
+    )
+    url = stub.start(args.host, args.port, verbose=args.verbose)
+    print(f"Open Cloud stand-in listening on {url} (set AETHER_API_URL={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+        print(json.dumps(stub.stats(), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
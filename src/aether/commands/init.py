@@ -16,11 +16,29 @@ timeout = 60
 watch_interval = 1.0
 # Folder containing your test files
 tests_folder = "tests"
+# Status polling: first delay, maximum delay (seconds), backoff factor and jitter fraction
+poll_initial = 0.25
+poll_max = 5.0
+poll_backoff = 1.5
+poll_jitter = 0.1
+# HTTP: connect/read timeouts (seconds) and retries for 429/5xx (Retry-After is honoured)
+connect_timeout = 5.0
+read_timeout = 30.0
+max_retries = 4
 
 [project]
 # Path to your Rojo project file
 rojo_project = "default.project.json"
 
+[bundle]
+# Only bundle modules reachable from the selected specs' require() calls
+tree_shake = true
+
+[cache]
+# Reuse results of unchanged payloads (disable per run with --no-cache)
+results = true
+max_size_mb = 100
+
 [auth]
 # Optional: Set your Universe and Place IDs here
 universe_id = "9635698060"
@@ -1,25 +1,58 @@
 """
 Aether run command - Professional Watch Mode
 """
+import asyncio
+import json
 import time
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from ..config import get_config, validate_config
-from ..bundler import bundle_scripts, bundle_testez
-from ..runner import run_test_suite, run_tests_batch
+from ..bundler import BundleBuilder, bundle_scripts, get_testez_prelude, scan_modules, get_master_driver, get_testez_driver
+from ..bundle_profile import build_report, print_report
+from ..require_graph import ImpactIndex
+from ..rojo_resolver import SourcemapWatcher
+from ..runner import run_test_suite, select_test_files, print_slowest, print_cancelled
+from .. import engine
+from .. import stats, tracing
 from ..utils import get_project_paths
 from ..ui import Dashboard, get_key_press
 
+# Watch mode: file types that trigger a run, and generated files and VCS
+# metadata whose changes never should
+WATCH_EXTENSIONS = ('.luau', '.lua', '.toml', '.json')
+WATCH_IGNORED_DIRS = {".git"}
+WATCH_IGNORED_FILES = {".test-results", "sourcemap.json"}
+
 def command(args):
-    """Handle run command"""
-    
-    config = get_config()
+    """Handle run command (writing the --trace file however the run ends)"""
+    if not getattr(args, "trace", None):
+        return _run(args)
+    tracing.enable()
+    try:
+        with tracing.span("aether run"):
+            return _run(args)
+    finally:
+        tracing.write(args.trace)
+        if not args.json:
+            print(f"Trace written to {args.trace}")
+
+
+def _run(args):
+    with tracing.span("config"):
+        config = get_config()
     
     if args.timeout:
         config["timeout"] = args.timeout
     if args.api:
         config["api_key"] = args.api
+    if args.no_tree_shake:
+        config["tree_shake"] = False
+    if args.no_cache:
+        config["result_cache"] = False
+    config["verbose"] = args.verbose
     
     missing = validate_config(config)
     
@@ -71,29 +104,53 @@ def command(args):
         # State for debounce, smart detection, and commands
         watch_state = {
             "last_change_time": 0,
-            "changed_path": None,
+            "changed_paths": set(),  # Everything created/modified/moved/deleted since the last run
             "trigger_run": False,
-            "run_mode": "all",  # "all", "failed", or "single"
+            "run_mode": "all",  # "all", "failed", or "smart" (specs impacted by changed_paths)
             "last_results": None,
             "failed_files": set()
         }
+        changes_lock = threading.Lock()
+        
+        # Reverse require graph used to pick the specs a source change affects
+        impact_index = ImpactIndex()
+        
+        def is_watched(path):
+            parts = Path(path).parts
+            if any(part in WATCH_IGNORED_DIRS for part in parts):
+                return False
+            return parts[-1] not in WATCH_IGNORED_FILES
         
         class ChangeHandler(FileSystemEventHandler):
-            def on_modified(self, event):
-                if event.is_directory:
+            def on_any_event(self, event):
+                if event.event_type not in ("created", "modified", "moved", "deleted"):
+                    return
+                if event.is_directory and event.event_type in ("created", "modified"):
+                    return  # Files inside report their own events
+                
+                # Editors that save via rename show up as a move onto the real file
+                candidates = [event.src_path, getattr(event, "dest_path", "")]
+                changed = {
+                    p for p in candidates
+                    if p and is_watched(p) and (event.is_directory or p.endswith(WATCH_EXTENSIONS))
+                }
+                if not changed:
                     return
-                if event.src_path.endswith(('.luau', '.lua', '.toml', '.json')):
+                with changes_lock:
+                    watch_state["changed_paths"] |= changed
                     watch_state["last_change_time"] = time.time()
-                    watch_state["changed_path"] = event.src_path
                     watch_state["trigger_run"] = True
                     watch_state["run_mode"] = "smart"  # Will be determined by path
         
-        def run_tests_with_dashboard(mode="all", specific_file=None):
-            """Run tests with professional dashboard output"""
+        def select_files(mode, changed_paths=(), modules=None):
+            """
+            Pick the specs for a run (`modules`: this run's scan_modules result).
+            Returns: (files_to_run, batch_mode), or None when no spec is affected
+            """
             files_to_run = list(tests_dir.glob("*.spec.luau"))
             files_to_run = [f for f in files_to_run if not f.name.startswith("_")]
             
-            batch_mode = True
+            batch_mode = args.jobs <= 1
             
             # Determine which files to run
             if mode == "failed" and watch_state["failed_files"]:
@@ -102,134 +159,164 @@ def command(args):
                     mode = "all"
                     files_to_run = list(tests_dir.glob("*.spec.luau"))
                     files_to_run = [f for f in files_to_run if not f.name.startswith("_")]
-            elif mode == "smart" and specific_file:
-                p = Path(specific_file)
-                if p.name.endswith(".spec.luau") and p.parent.resolve() == tests_dir.resolve():
-                    matches = [f for f in files_to_run if f.resolve() == p.resolve()]
-                    if matches:
-                        files_to_run = matches
-                        batch_mode = False
-            elif mode == "single" and specific_file:
-                p = Path(specific_file)
-                matches = [f for f in files_to_run if f.resolve() == p.resolve()]
-                if matches:
-                    files_to_run = matches
-                    batch_mode = False
-            
-            # Show running status
-            dashboard.clear()
-            dashboard.print_header()
+            elif mode == "smart" and changed_paths:
+                changed = [Path(p) for p in changed_paths]
+                try:
+                    impact_index.update(changed, files_to_run, tests_dir, modules["instance_map"])
+                    impacted = impact_index.impacted_specs(changed)
+                except Exception:
+                    impacted = None  # Unknown impact, run everything
+                
+                if impacted is not None:
+                    if not impacted:
+                        return None
+                    files_to_run = impacted
+                    batch_mode = batch_mode and len(files_to_run) > 1
             
-            if batch_mode:
-                file_display = f"{len(files_to_run)} test file(s)"
-            else:
-                file_display = files_to_run[0].name if files_to_run else "tests"
+            return files_to_run, batch_mode
+        
+        def prepare_run(mode, changed_paths=()):
+            """
+            Select the specs and build the bundle. Runs on the bundling thread,
+            so it can start while a previous run is still on screen (and still
+            counting its own stats, so this thread's counters are collected
+            separately and returned rather than reset here).
+            Returns: (files_to_run, batch_mode, bundle, source_map, counters) or None
+            """
+            with stats.collect() as counters:
+                # Resolved once for both spec selection and bundling
+                modules = scan_modules(paths, config)
+                with tracing.span("select specs", mode=mode):
+                    selection = select_files(mode, changed_paths, modules)
+                if selection is None:
+                    return None
+                files_to_run, batch_mode = selection
                 
-            dashboard.print_running(file_display)
-            print()
+                with tracing.span("prelude"):
+                    testez_bundle, offset = get_testez_prelude()
+                with tracing.span("bundle", specs=len(files_to_run)):
+                    scripts_bundle, source_map = bundle_scripts(paths, config, specs=files_to_run, modules=modules)
             
-            # Start spinner
-            dashboard.start_spinner(file_display)
+            bundle, source_map = join_prelude(testez_bundle, offset, scripts_bundle, source_map)
+            return files_to_run, batch_mode, bundle, source_map, counters
+        
+        async def run_tests_with_dashboard(prepared_future, changed_paths=()):
+            """Run tests with professional dashboard output"""
+            from ..runner import run_tests_batch_async, run_test_async, run_tests_concurrent_async
+            from ..utils import DEFAULT_TIMEOUT
+            
+            dashboard.clear()
+            dashboard.print_header()
             
             try:
-                # Build bundle
-                testez_bundle = bundle_testez()
-                scripts_bundle, source_map = bundle_scripts(paths, config)
-                
-                offset = testez_bundle.count('\n') + 1
-                for mapping in source_map:
-                    mapping["start"] += offset
-                    mapping["end"] += offset
-                
-                bundle = testez_bundle + "\n" + scripts_bundle
+                # Usually already built during the debounce window
+                prepared = await engine.run_with_background(
+                    asyncio.wrap_future(prepared_future),
+                    background=[dashboard.spin("Bundling...")]
+                )
+                if prepared is None:
+                    if len(changed_paths) == 1:
+                        changed = os.path.relpath(next(iter(changed_paths)), os.getcwd())
+                    else:
+                        changed = f"the {len(changed_paths)} changed files"
+                    print(f"\nNo specs depend on {changed}")
+                    dashboard.print_watching()
+                    return
+                files_to_run, batch_mode, bundle, source_map, bundle_counters = prepared
                 
-                # Create a mock args object for the runner
-                class MockArgs:
-                    def __init__(self):
-                        self.json = False
-                        self.verbose = args.verbose
-                        self.timeout = args.timeout
-                        self.test = "all"
-                        self.failed = False
+                # The previous run has finished by now (RunWorker), so its counters are final
+                stats.reset()
+                stats.counters.update(bundle_counters)
                 
-                mock_args = MockArgs()
                 config["json"] = False
                 
-                # Stop spinner before showing results
-                dashboard.stop_spinner()
+                to = args.timeout or config.get("timeout") or DEFAULT_TIMEOUT
                 
-                # Clear and show results
-                dashboard.clear()
-                dashboard.print_header()
+                streamed = []  # Results already printed while their task ran
                 
-                # Run tests and collect results
-                from ..runner import run_tests_batch as batch_runner, run_test as single_runner
-                from ..utils import DEFAULT_TIMEOUT
+                def show_result(r):
+                    status = r.get("status", "FAILED")
+                    if status == "PASSED":
+                        dashboard.print_result(r.get("name", "Unknown"), "PASS", r.get("duration") or 0)
+                    elif status == "FAILED":
+                        dashboard.print_result(r.get("name", "Unknown"), "FAIL", 0, r.get("error", ""), r.get("traceback", ""))
+                    else:
+                        dashboard.print_result(r.get("name", "Unknown"), "SKIP", 0)
                 
-                to = args.timeout or config.get("timeout") or DEFAULT_TIMEOUT
+                def live_result(r):
+                    dashboard.clear_line()
+                    if not streamed:
+                        print()  # Add spacing after header
+                    streamed.append(r)
+                    show_result(r)
                 
                 start_time = time.time()
                 all_results = []
+                all_describes = []
                 files_passed = 0
                 files_failed = 0
                 
                 if batch_mode and len(files_to_run) > 1:
-                    run_output = batch_runner(
-                        files_to_run, bundle, tests_dir, config,
-                        timeout=to, verbose=args.verbose, source_map=source_map
+                    run_output = await engine.run_with_background(
+                        run_tests_batch_async(
+                            files_to_run, bundle, tests_dir, config,
+                            timeout=to, verbose=args.verbose, source_map=source_map,
+                            on_result=live_result
+                        ),
+                        background=[dashboard.spin()]
                     )
                     all_results = run_output.get("results", [])
-                    duration = run_output.get("duration", 0)
+                    all_describes = run_output.get("describes", [])
                     
                     # For batch mode, show individual test results (not file-level)
                     # Since tests are flat, we display them directly
-                    print()  # Add spacing after header
+                    if not streamed:
+                        print()  # Add spacing after header
                     
-                    for r in all_results:
-                        name = r.get("name", "Unknown")
-                        status = r.get("status", "FAILED")
-                        
-                        if status == "PASSED":
-                            dashboard.print_result(name, "PASS", duration / max(len(all_results), 1))
-                        elif status == "FAILED":
-                            error = r.get("error", "")
-                            traceback = r.get("traceback", "")
-                            dashboard.print_result(name, "FAIL", 0, error, traceback)
-                        else:
-                            dashboard.print_result(name, "SKIP", 0)
+                    # Tests streamed while the batch ran are already on screen
+                    for r in all_results[len(streamed):]:
+                        show_result(r)
                     
                     # Use file counts from batch result
                     files_passed = run_output.get("files_passed", len(files_to_run))
                     files_failed = run_output.get("files_failed", 0)
                     
                     # Update failed_files tracking for 'f' key
-                    if files_failed > 0:
-                        # We can't know exactly which files failed in batch mode,
-                        # so mark all as suspect if any failed
-                        for f in files_to_run:
-                            watch_state["failed_files"].add(f.stem)
+                    if "failed_specs" in run_output:
+                        failed_specs = set(run_output["failed_specs"])
+                    elif not run_output.get("success"):
+                        failed_specs = {f.stem for f in files_to_run}
                     else:
-                        for f in files_to_run:
+                        failed_specs = set()
+                    for f in files_to_run:
+                        if f.stem in failed_specs:
+                            watch_state["failed_files"].add(f.stem)
+                        else:
                             watch_state["failed_files"].discard(f.stem)
                             
                 else:
-                    for f in files_to_run:
-                        run_output = single_runner(
-                            f, bundle, tests_dir, config,
+                    if args.jobs > 1 and len(files_to_run) > 1:
+                        outputs = run_tests_concurrent_async(
+                            files_to_run, bundle, tests_dir, config, jobs=args.jobs,
                             timeout=to, verbose=args.verbose, source_map=source_map
                         )
-                        
+                    else:
+                        async def sequential():
+                            for f in files_to_run:
+                                yield f, await run_test_async(
+                                    f, bundle, tests_dir, config,
+                                    timeout=to, verbose=args.verbose, source_map=source_map,
+                                    on_result=live_result
+                                )
+                        outputs = sequential()
+                    
+                    async for f, run_output in outputs:
                         duration = run_output.get("duration", 0)
                         
                         if run_output.get("results"):
-                             for r in run_output["results"]:
-                                 dashboard.print_result(
-                                     r["name"], 
-                                     r["status"], 
-                                     0, # No per-test duration available
-                                     r.get("error"), 
-                                     r.get("traceback")
-                                 )
+                             for r in run_output["results"][len(streamed):]:
+                                 show_result(r)
+                             streamed.clear()
                         else:
                              # Fallback for system errors or empty results
                              rel_path = os.path.relpath(f, os.getcwd())
@@ -244,6 +331,7 @@ def command(args):
                             watch_state["failed_files"].add(f.stem)
                         
                         all_results.extend(run_output.get("results", []))
+                        all_describes.extend(run_output.get("describes", []))
                 
                 total_time = time.time() - start_time
                 
@@ -259,30 +347,74 @@ def command(args):
                     total_time
                 )
                 
+                # Includes the tasks of any run this one superseded
+                print_cancelled(engine.cancelled_tasks())
+                engine.reset_cancelled()
+                
+                if args.slowest:
+                    print_slowest(all_results, all_describes, args.slowest)
+                
+                if args.verbose:
+                    stats.print_stats()
+                
                 # Print watching status
                 dashboard.print_watching()
                 
                 watch_state["last_results"] = all_results
                 
             except Exception as e:
-                dashboard.stop_spinner()
                 dashboard.clear()
                 dashboard.print_header()
                 print(f"\n[ERROR] {e}")
                 dashboard.print_watching()
         
+        # Runs execute on a background worker so key presses and file events
+        # are handled mid-run; bundling has its own thread so it can start as
+        # soon as a change arrives
+        worker = engine.RunWorker()
+        bundler_pool = ThreadPoolExecutor(max_workers=1)
+        prebundle = {"change_time": None, "changed_paths": frozenset(), "future": None}
+        
+        def start_run(mode, changed_paths=(), prepared_future=None):
+            """Supersede the current run (cancelling its tasks) with a new one"""
+            if prepared_future is None:
+                prepared_future = bundler_pool.submit(prepare_run, mode, changed_paths)
+            worker.start(run_tests_with_dashboard(prepared_future, changed_paths))
+        
+        # Keeps the Rojo sourcemap current without a rojo process per change
+        sourcemap_watcher = SourcemapWatcher(config.get("rojo_project", "default.project.json"))
+        
+        def stop_watching():
+            # Briefly let the run cancel its own tasks; any left are cancelled below
+            worker.cancel(wait=1.0)
+            bundler_pool.shutdown(wait=False)
+            observer.stop()
+            observer.join()
+            sourcemap_watcher.stop()
+            engine.cancel_in_flight_sync("interrupted")
+            print_cancelled(engine.cancelled_tasks())
+            print("\n\nGoodbye! 👋")
+        
         observer = Observer()
         handler = ChangeHandler()
         observer.schedule(handler, str(paths["src"]), recursive=True)
         observer.schedule(handler, str(tests_dir), recursive=True)
         observer.schedule(handler, str(paths["root"]), recursive=False)
+        if paths["packages"].exists():
+            observer.schedule(handler, str(paths["packages"]), recursive=True)
         
         observer.start()
+        sourcemap_watcher.start()
         
-        # Initial run
-        run_tests_with_dashboard("all")
+        try:
+            impact_index.rebuild(files, tests_dir, scan_modules(paths, config)["instance_map"])
+        except Exception:
+            pass  # Rebuilt on the first source change
         
         try:
+            # Initial run
+            start_run("all")
+            
             while True:
                 time.sleep(0.05)  # Check more frequently for key presses
                 
@@ -290,41 +422,106 @@ def command(args):
                 key = get_key_press()
                 if key:
                     if key == 'q':
-                        observer.stop()
-                        observer.join()
-                        print("\n\nGoodbye! 👋")
+                        stop_watching()
                         return 0
                     elif key == 'f':
-                        run_tests_with_dashboard("failed")
+                        start_run("failed")
                     elif key == 'a':
-                        run_tests_with_dashboard("all")
+                        start_run("all")
                     elif key == 'enter':
-                        run_tests_with_dashboard("all")
+                        start_run("all")
                 
                 # Check for file changes (with debounce)
                 if watch_state["trigger_run"]:
-                    if time.time() - watch_state["last_change_time"] > 0.3:
-                        watch_state["trigger_run"] = False
-                        path = watch_state["changed_path"]
-                        run_tests_with_dashboard("smart", path)
+                    with changes_lock:
+                        change_time = watch_state["last_change_time"]
+                        changed_paths = frozenset(watch_state["changed_paths"])
+                    
+                    # Bundle during the debounce window; a newer change replaces
+                    # the pending bundle (the chunk cache keeps the work done)
+                    if prebundle["change_time"] != change_time:
+                        if prebundle["future"] is not None:
+                            prebundle["future"].cancel()
+                        prebundle["change_time"] = change_time
+                        prebundle["changed_paths"] = changed_paths
+                        prebundle["future"] = bundler_pool.submit(prepare_run, "smart", changed_paths)
+                    
+                    if time.time() - change_time > 0.3:
+                        with changes_lock:
+                            # Events that arrived meanwhile stay queued for the next run
+                            settled = watch_state["last_change_time"] == change_time
+                            if settled:
+                                watch_state["changed_paths"] -= prebundle["changed_paths"]
+                                watch_state["trigger_run"] = False
+                        if settled:
+                            start_run("smart", prebundle["changed_paths"], prebundle["future"])
+                            prebundle["change_time"] = prebundle["future"] = None
                         
         except KeyboardInterrupt:
-            observer.stop()
-            observer.join()
-            print("\n\nGoodbye! 👋")
+            stop_watching()
             return 0
     
     # Normal execution (non-watch mode)
-    testez_bundle = bundle_testez()
-    scripts_bundle, source_map = bundle_scripts(paths, config)
+    files, exit_code = select_test_files(args, files, tests_dir)
+    if files is None:
+        return exit_code
+    # Decided after selection: --failed or a name filter can leave a single spec
+    batch_mode = len(files) > 1 and args.jobs <= 1
     
-    offset = testez_bundle.count('\n') + 1
-    for mapping in source_map:
-        mapping["start"] += offset
-        mapping["end"] += offset
-
-    bundle = testez_bundle + "\n" + scripts_bundle
+    stats.reset()
+    engine.reset_cancelled()
+    with tracing.span("prelude"):
+        testez_bundle, offset = get_testez_prelude()
+    profile = {} if args.profile_bundle else None
+    bundle_start = time.perf_counter()
+    with tracing.span("bundle", specs=len(files)):
+        scripts_bundle, source_map = bundle_scripts(paths, config, specs=files, profile=profile)
     
-    batch_mode = len(files) > 1 and args.test == "all"
+    if profile is not None:
+        return report_bundle_profile(
+            args, profile, testez_bundle, files, tests_dir, paths,
+            batch_mode, time.perf_counter() - bundle_start
+        )
     
-    return run_test_suite(args, files, bundle, tests_dir, config, source_map=source_map, batch_mode=batch_mode)
+    bundle, source_map = join_prelude(testez_bundle, offset, scripts_bundle, source_map)
+    
+    try:
+        with tracing.span("run tests", specs=len(files), batch=batch_mode):
+            exit_code = run_test_suite(
+                args, files, bundle, tests_dir, config,
+                source_map=source_map, batch_mode=batch_mode, preselected=True
+            )
+    except KeyboardInterrupt:
+        # Don't leave tasks running on Roblox that nobody will read
+        engine.cancel_in_flight_sync("interrupted")
+        if not args.json:
+            print()
+            print_cancelled(engine.cancelled_tasks())
+        return 130
+    
+    if args.verbose and not args.json:
+        stats.print_stats()
+    
+    return exit_code
+
+
+def join_prelude(prelude, prelude_lines, scripts_bundle, source_map):
+    """Put the TestEZ prelude ahead of the scripts bundle. Returns: (bundle, source_map)"""
+    builder = BundleBuilder()
+    builder.add(prelude, prelude_lines)
+    builder.add_bundle(scripts_bundle, source_map)
+    return builder.build()
+
+
+def report_bundle_profile(args, profile, prelude, files, tests_dir, paths, batch_mode, bundle_seconds):
+    """Print the --profile-bundle report for the payload(s) this run would upload"""
+    if batch_mode and len(files) > 1:
+        drivers = [("driver", get_master_driver(files, tests_dir)[0])]
+    else:
+        drivers = [(f"driver ({f.stem})", get_testez_driver(f, tests_dir)[0]) for f in files]
+    report = build_report(profile, prelude, drivers, paths["root"], bundle_seconds)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
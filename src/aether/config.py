@@ -27,6 +27,9 @@ load_dotenv()
 USER_CONFIG_DIR = Path.home() / ".config" / "aether"
 USER_CONFIG_FILE = USER_CONFIG_DIR / "config.toml"
 
+# Open Cloud; point [runner] api_url (or AETHER_API_URL) elsewhere to use a stand-in
+DEFAULT_API_URL = "https://apis.roblox.com"
+
 def load_toml_file(path: Path) -> dict:
     """Load a single TOML file"""
     if not path.exists():
@@ -81,16 +84,35 @@ def get_config():
     runner = file_config.get("runner", {})
     project = file_config.get("project", {})
     auth = file_config.get("auth", {})
+    bundle = file_config.get("bundle", {})
+    cache = file_config.get("cache", {})
 
     return {
         # Runnable settings
         "timeout": runner.get("timeout", 60),
         "watch_interval": runner.get("watch_interval", 1.0),
         "tests_folder": runner.get("tests_folder", "tests"),
+        "poll_initial": runner.get("poll_initial", 0.25),
+        "poll_max": runner.get("poll_max", 5.0),
+        "poll_backoff": runner.get("poll_backoff", 1.5),
+        "poll_jitter": runner.get("poll_jitter", 0.1),
+        "connect_timeout": runner.get("connect_timeout", 5.0),
+        "read_timeout": runner.get("read_timeout", 30.0),
+        "max_retries": runner.get("max_retries", 4),
+        "api_url": os.environ.get("AETHER_API_URL") or runner.get("api_url", DEFAULT_API_URL),
         
         # Project integration
         "rojo_project": project.get("rojo_project", "default.project.json"),
 
+        # Bundling
+        "tree_shake": bundle.get("tree_shake", True),
+        "bundle_ignore": bundle.get("ignore", ["node_modules"]),
+        "bundle_workers": bundle.get("workers"),
+
+        # Result cache
+        "result_cache": cache.get("results", True),
+        "result_cache_max_mb": cache.get("max_size_mb", 100),
+
         # Authentication
         "api_key": os.environ.get("ROBLOX_API_KEY") or auth.get("api_key") or "vGtiGKMpOUuH7X1i1ddehLEVXFLgZ2JjOtW/3gQCEwlvYLFQZXlKaGJHY2lPaUpTVXpJMU5pSXNJbXRwWkNJNkluTnBaeTB5TURJeExUQTNMVEV6VkRFNE9qVXhPalE1V2lJc0luUjVjQ0k2SWtwWFZDSjkuZXlKaGRXUWlPaUpTYjJKc2IzaEpiblJsY201aGJDSXNJbWx6Y3lJNklrTnNiM1ZrUVhWMGFHVnVkR2xqWVhScGIyNVRaWEoyYVdObElpd2lZbUZ6WlVGd2FVdGxlU0k2SW5aSGRHbEhTMDF3VDFWMVNEZFlNV2t4WkdSbGFFeEZWbGhHVEdkYU1rcHFUM1JYTHpOblVVTkZkMngyV1V4R1VTSXNJbTkzYm1WeVNXUWlPaUl4TURReU1ETXhPREkzTnlJc0ltVjRjQ0k2TVRjMk9UVTRNRFl4T1N3aWFXRjBJam94TnpZNU5UYzNNREU1TENKdVltWWlPakUzTmprMU56Y3dNVGw5Lmsyb29MTW9YVy05a0lNUUJPOThpZURDUW1CXzJtS3g4OW5JdEY3YlpQcWNYRmk5SVRadnJaZndHbkRuM19KSUg3aXBXQ3kyWWNQbUhFTmlmZGVGQ3ViUDlybkQxX21veS1OZW15LXQ2SUFRZVZYUXloT1JuYi1aUEFzR2FNdEsxdm1aZEJ0YS1PQlh5YzZvbGlkcnRZdUlPUl9pQThQTjdCZVVQTWdDMUFCaVU1enNDUGl3cTktdHMzUG1FV0NadENjRl83MkFabXhBcGtzMzJmVWJfVzU0dXd2RV9vckF2c0t1d3FFVEhVY3pYa3g4b2M0cmN5Tk1MMnQ4b2FjcTB1cVdoOXZpcFJ4aTRMRXZwTzNwbXVWbEY1MkJKa0g2TUdRQWJaMW83QmNBNk1uYU4tcVQyRWdncm5KdHlhV2ZqV09ONk9yUFFicnVheUVVN1F1ekd1QQ==",
         "universe_id": os.environ.get("UNIVERSE_ID") or auth.get("universe_id") or "9635698060",
@@ -148,6 +170,13 @@ def validate_config(config):
         missing.append("PLACE_ID (env) or place_id (config)")
     return missing
 
+def _api_base(config):
+    return (config.get("api_url") or DEFAULT_API_URL).rstrip("/")
+
 def get_api_url(config):
     """Build API URL from config"""
-    return f"https://apis.roblox.com/cloud/v2/universes/{config['universe_id']}/places/{config['place_id']}/luau-execution-session-tasks"
+    return f"{_api_base(config)}/cloud/v2/universes/{config['universe_id']}/places/{config['place_id']}/luau-execution-session-tasks"
+
+def get_task_url(task_path, config=None):
+    """Build the URL for an execution task path returned by the API"""
+    return f"{_api_base(config or {})}/cloud/v2/{task_path}"
@@ -0,0 +1,273 @@
+"""
+Aether - Asynchronous execution engine
+
+Task submission, status polling, timeouts and cancellation for Luau
+execution tasks as coroutines, so bundling, uploads, polling and UI work can share one event
+loop. Blocking HTTP calls go through the shared pooled client (client.py)
+and run in the loop's default executor.
+
+The synchronous functions in runner.py are thin facades over these
+coroutines (see run_sync / iterate_sync).
+"""
+import asyncio
+import functools
+import threading
+import time
+
+import requests
+
+from . import stats, tracing
+from .client import get_client
+from .config import get_api_url, get_task_url
+
+# Task states after which polling stops
+TERMINAL_STATES = ("COMPLETE", "FAILED", "CANCELLED")
+
+
+class TaskTimeout(Exception):
+    """Raised when a task does not finish within its time limit"""
+
+    def __init__(self, task_path, elapsed):
+        super().__init__(f"Task {task_path} exceeded {elapsed:.1f}s")
+        self.task_path = task_path
+        self.elapsed = elapsed
+
+
+async def _call(fn, *args, **kwargs):
+    """Run a blocking call in the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+# Submitted tasks that have not reached a terminal state: {task_path: config}
+_in_flight = {}
+
+# Tasks cancelled since the last reset_cancelled(): [(task_path, reason)]
+_cancelled = []
+
+# Guards _in_flight and _cancelled: the RunWorker loop and the main thread
+# (cancel_in_flight_sync after a timed-out worker.cancel) both change them
+_registry_lock = threading.Lock()
+
+
+async def submit_task(config, payload):
+    """Create a Luau execution task. Returns the task path."""
+    with tracing.span("submit", "http", payload_bytes=len(payload)) as info:
+        resp = await _call(
+            get_client(config).post,
+            get_api_url(config),
+            headers={"x-api-key": config["api_key"], "Content-Type": "application/json"},
+            json={"script": payload}
+        )
+        resp.raise_for_status()
+        task_path = resp.json().get("path")
+        info["task"] = task_path
+    if task_path:
+        with _registry_lock:
+            _in_flight[task_path] = config
+        tracing.task_submitted(task_path)
+    return task_path
+
+
+async def cancel_task(config, task_path, reason):
+    """
+    Ask Open Cloud to cancel a task whose result is no longer wanted.
+    Best-effort: returns False if the request failed, or if the task already
+    finished or is being cancelled by another caller.
+    """
+    with _registry_lock:
+        if _in_flight.pop(task_path, None) is None:
+            return False
+    tracing.task_ended(task_path, reason)
+    try:
+        with tracing.span("cancel", "http", task=task_path, reason=reason):
+            resp = await _call(
+                get_client(config).post,
+                get_task_url(task_path, config) + ":cancel",
+                headers={"x-api-key": config["api_key"], "Content-Type": "application/json"},
+                json={}
+            )
+            resp.raise_for_status()
+    except requests.exceptions.RequestException:
+        stats.incr("tasks.cancel_errors")
+        return False
+    with _registry_lock:
+        _cancelled.append((task_path, reason))
+    stats.incr("tasks.cancelled")
+    return True
+
+
+async def cancel_in_flight(reason):
+    """Cancel every task still in flight"""
+    with _registry_lock:
+        pending = list(_in_flight.items())
+    await asyncio.gather(*(cancel_task(config, path, reason) for path, config in pending))
+
+
+def cancel_in_flight_sync(reason):
+    """cancel_in_flight for synchronous code outside any event loop (e.g. after Ctrl-C)"""
+    if _in_flight:
+        asyncio.run(cancel_in_flight(reason))
+
+
+def cancelled_tasks():
+    """[(task_path, reason)] for the tasks cancelled since the last reset"""
+    with _registry_lock:
+        return list(_cancelled)
+
+
+def reset_cancelled():
+    with _registry_lock:
+        _cancelled.clear()
+
+
+async def get_task(config, task_path):
+    """Fetch the current state of a Luau execution task"""
+    with tracing.span("poll", "http", task=task_path) as info:
+        resp = await _call(
+            get_client(config).get,
+            get_task_url(task_path, config),
+            headers={"x-api-key": config["api_key"]}
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        info["state"] = data.get("state")
+    return data
+
+
+async def get_task_logs(config, task_path, page_token=None):
+    """Fetch one page of a task's log output"""
+    params = {"pageToken": page_token} if page_token else None
+    with tracing.span("logs", "http", task=task_path):
+        resp = await _call(
+            get_client(config).get,
+            get_task_url(task_path, config) + "/logs",
+            headers={"x-api-key": config["api_key"]},
+            params=params
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+
+async def wait_for_task(config, task_path, start_time, timeout, policy, on_poll=None):
+    """
+    Poll a task until it reaches a terminal state, waiting between polls as
+    directed by `policy` (a PollPolicy, which also counts the polls made).
+    `on_poll`, if given, is awaited after every poll that found the task
+    still running (e.g. to fetch incremental logs).
+
+    Raises TaskTimeout once `timeout` seconds have passed since `start_time`.
+    Cancelling the awaiting coroutine stops polling immediately.
+    Returns: the final task data
+    """
+    for delay in policy.delays():
+        # Never sleep past the deadline just because the backoff grew large
+        remaining = start_time + timeout - time.time()
+        await asyncio.sleep(min(delay, max(0.0, remaining) + 0.05))
+        elapsed = time.time() - start_time
+        if elapsed > timeout:
+            tracing.task_ended(task_path, "timeout")
+            raise TaskTimeout(task_path, elapsed)
+
+        policy.polls += 1
+        stats.incr("runner.polls")
+        data = await get_task(config, task_path)
+        tracing.task_state(task_path, data.get("state"))
+        if data.get("state") in TERMINAL_STATES:
+            with _registry_lock:
+                _in_flight.pop(task_path, None)
+            return data
+        if on_poll is not None:
+            await on_poll()
+
+
+async def run_with_background(coro, background=()):
+    """Await coro while background coroutines (e.g. a spinner) run alongside it"""
+    tasks = [asyncio.ensure_future(b) for b in background]
+    try:
+        return await coro
+    finally:
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_sync(coro, background=()):
+    """Run a coroutine to completion from synchronous code"""
+    return asyncio.run(run_with_background(coro, background))
+
+
+def iterate_sync(agen):
+    """Drive an async generator from synchronous code, yielding as items arrive"""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        try:
+            loop.run_until_complete(agen.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            if hasattr(loop, "shutdown_default_executor"):
+                loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            loop.close()
+
+
+class RunWorker:
+    """
+    Runs one coroutine at a time on a background thread with its own event
+    loop, so the caller (e.g. the watch loop) stays responsive. Starting a
+    new run cancels the current one without waiting for it: the new run's
+    thread waits for the cancelled run to clean up (cancelling its remote
+    tasks) before it starts.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    @property
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, coro):
+        """Cancel the current run (if any) and run coro in the background once it has finished"""
+        previous = self._thread
+        self.cancel(wait=0)
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(coro)
+        self._loop, self._task = loop, task
+
+        def target():
+            if previous is not None:
+                previous.join()
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                try:
+                    loop.run_until_complete(loop.shutdown_asyncgens())
+                    if hasattr(loop, "shutdown_default_executor"):
+                        loop.run_until_complete(loop.shutdown_default_executor())
+                finally:
+                    loop.close()
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def cancel(self, wait=10.0):
+        """Cancel the current run and wait (up to `wait` seconds) for it to clean up"""
+        if not self.busy:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        except RuntimeError:
+            return  # The loop closed as the run finished
+        if wait:
+            self._thread.join(wait)
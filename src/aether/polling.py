@@ -0,0 +1,96 @@
+"""
+Aether - Adaptive polling policy
+
+Decides how long to wait between task status checks: fast right after
+submission, then exponential backoff with jitter. When a previous run of
+the same spec set took a known amount of time, the first wait sleeps
+through most of it before polling quickly around the expected finish.
+"""
+import hashlib
+import json
+import os
+import random
+
+from .utils import get_cache_dir
+
+DEFAULT_POLL_INITIAL = 0.25
+DEFAULT_POLL_MAX = 5.0
+DEFAULT_POLL_BACKOFF = 1.5
+DEFAULT_POLL_JITTER = 0.1
+
+# Fraction of the previously observed duration slept before the first poll
+SEED_FRACTION = 0.8
+
+
+class PollPolicy:
+    """Generates delays between status polls and counts the polls made"""
+
+    def __init__(self, initial=DEFAULT_POLL_INITIAL, maximum=DEFAULT_POLL_MAX,
+                 backoff=DEFAULT_POLL_BACKOFF, jitter=DEFAULT_POLL_JITTER, expected=None):
+        self.initial = initial
+        self.maximum = max(maximum, initial)
+        self.backoff = max(backoff, 1.0)
+        self.jitter = jitter
+        self.expected = expected
+        self.polls = 0
+
+    @classmethod
+    def from_config(cls, config, expected=None):
+        """Build a policy from the [runner] poll_* settings"""
+        return cls(
+            initial=config.get("poll_initial", DEFAULT_POLL_INITIAL),
+            maximum=config.get("poll_max", DEFAULT_POLL_MAX),
+            backoff=config.get("poll_backoff", DEFAULT_POLL_BACKOFF),
+            jitter=config.get("poll_jitter", DEFAULT_POLL_JITTER),
+            expected=expected,
+        )
+
+    def delays(self):
+        """Infinite sequence of delays (seconds) to wait before each poll"""
+        if self.expected:
+            yield max(self.initial, self.expected * SEED_FRACTION)
+        delay = self.initial
+        while True:
+            spread = delay * self.jitter
+            yield max(0.0, delay + random.uniform(-spread, spread))
+            delay = min(self.maximum, delay * self.backoff)
+
+
+def duration_key(files, mode):
+    """Key identifying a spec set (project directory, run mode and spec names)"""
+    h = hashlib.sha1(f"{os.getcwd()}\n{mode}".encode("utf-8"))
+    for name in sorted(f.stem for f in files):
+        h.update(f"\n{name}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _durations_file():
+    return get_cache_dir() / "durations.json"
+
+
+def _load_durations():
+    try:
+        with open(_durations_file(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_expected_duration(key):
+    """Get the duration observed for this spec set on the previous run, if any"""
+    return _load_durations().get(key)
+
+
+def record_duration(key, seconds):
+    """Remember how long this spec set took (best-effort)"""
+    durations = _load_durations()
+    durations[key] = round(seconds, 3)
+    try:
+        path = _durations_file()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(durations, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
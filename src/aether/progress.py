@@ -0,0 +1,80 @@
+"""
+Aether - Streaming test progress
+
+The drivers print one machine-readable line when each test starts and one
+when it finishes. ProgressStream reads them from a running task's logs, so
+results can be shown as they happen and kept when the task later times out
+or fails.
+"""
+import json
+
+import requests
+
+from . import engine, stats
+
+START_PREFIX = "AETHER_START "
+RESULT_PREFIX = "AETHER_RESULT "
+
+
+def is_progress_line(message):
+    """True for the driver's machine-readable progress lines"""
+    return message.startswith((START_PREFIX, RESULT_PREFIX))
+
+
+def _log_messages(data):
+    """Flatten the messages of a logs response (FLAT or STRUCTURED view)"""
+    messages = []
+    for log in data.get("luauExecutionSessionTaskLogs", []):
+        messages.extend(log.get("messages", []))
+        messages.extend(m.get("message", "") for m in log.get("structuredMessages", []))
+    return messages
+
+
+class ProgressStream:
+    """
+    Incremental reader of a task's progress lines.
+
+    finished: raw driver results (name, status, errors, duration, spec) in
+    the order the tests finished
+    running: {"name", "spec"} of the test that started and has not finished
+    """
+
+    def __init__(self, config, task_path, on_result=None):
+        self.config = config
+        self.task_path = task_path
+        self.on_result = on_result
+        self.finished = []
+        self.running = None
+        self._page_token = None
+        self._seen = 0  # Messages already handled on the current page
+
+    async def poll(self):
+        """Read any new log lines. Best-effort: errors only skip this read."""
+        try:
+            while True:
+                data = await engine.get_task_logs(self.config, self.task_path, self._page_token)
+                messages = _log_messages(data)
+                for message in messages[self._seen:]:
+                    self._handle(message)
+                next_token = data.get("nextPageToken")
+                if not next_token:
+                    self._seen = len(messages)
+                    break
+                self._page_token = next_token
+                self._seen = 0
+        except (requests.exceptions.RequestException, ValueError):
+            stats.incr("progress.log_errors")
+
+    def _handle(self, message):
+        try:
+            if message.startswith(START_PREFIX):
+                self.running = json.loads(message[len(START_PREFIX):])
+            elif message.startswith(RESULT_PREFIX):
+                result = json.loads(message[len(RESULT_PREFIX):])
+                self.finished.append(result)
+                self.running = None
+                stats.incr("progress.results")
+                if self.on_result:
+                    self.on_result(result)
+        except ValueError:
+            pass  # A truncated line; the final results still carry the test
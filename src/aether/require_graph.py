@@ -0,0 +1,343 @@
+"""
+Aether - Static require graph
+
+Finds require(...) calls in Luau sources, resolves them to Roblox instance
+paths and computes which modules a set of specs can reach, so bundles only
+carry what the selected specs need.
+
+Anything that cannot be resolved statically (requires of variables, string
+requires, unknown instances) makes the caller fall back to bundling
+everything.
+"""
+import os
+import re
+
+# Where the drivers mount specs and _helpers, and where the prelude puts TestEZ
+TESTS_FOLDER = ("ReplicatedStorage", "Tests")
+PROVIDED_PREFIXES = (TESTS_FOLDER, ("ReplicatedStorage", "TestEZ"))
+
+_COMMENT_RE = re.compile(r'--\[(=*)\[.*?\]\1\]|--[^\n]*', re.DOTALL)
+_REQUIRE_RE = re.compile(r'\brequire\s*\(')
+_LOCAL_RE = re.compile(r'^[ \t]*local[ \t]+([A-Za-z_]\w*)[ \t]*(?::[^=\n]+)?=[ \t]*([^\n;]+?)[ \t]*;?[ \t]*$', re.MULTILINE)
+_BASE_RE = re.compile(r'\s*([A-Za-z_]\w*)')
+_SEGMENT_RE = re.compile(r'''\s*(?:
+      \.\s*(?P<dot>[A-Za-z_]\w*)
+    | :\s*(?:WaitForChild|FindFirstChild)\s*\(\s*(?P<q1>["'])(?P<child>.*?)(?P=q1)\s*(?:,[^)]*)?\)
+    | :\s*GetService\s*\(\s*(?P<q2>["'])(?P<service>.*?)(?P=q2)\s*\)
+    | \[\s*(?P<q3>["'])(?P<index>.*?)(?P=q3)\s*\]
+)''', re.VERBOSE)
+
+# Parsed dependencies per file: {path: (mtime_ns, size, instance_path, targets)}
+_parse_cache = {}
+
+
+def strip_comments(source):
+    """Remove Luau line and block comments"""
+    return _COMMENT_RE.sub("", source)
+
+
+def find_require_arguments(source):
+    """Return the argument text of every require(...) call in source"""
+    args = []
+    for match in _REQUIRE_RE.finditer(source):
+        depth = 1
+        pos = match.end()
+        while pos < len(source) and depth:
+            ch = source[pos]
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            pos += 1
+        if depth == 0:
+            args.append(source[match.end():pos - 1].strip())
+    return args
+
+
+def resolve_expression(expr, script_path, aliases):
+    """
+    Resolve an instance expression such as `script.Parent.Foo` or
+    `game:GetService("ReplicatedStorage").Packages.Bar` to a path tuple.
+    Returns None if the expression is not a static instance path.
+    """
+    base = _BASE_RE.match(expr)
+    if not base:
+        return None
+    name = base.group(1)
+    if name == "script":
+        path = list(script_path)
+    elif name == "game":
+        path = []
+    elif name == "workspace":
+        path = ["Workspace"]
+    elif aliases.get(name) is not None:
+        path = list(aliases[name])
+    else:
+        return None
+
+    pos = base.end()
+    expr = expr.rstrip()
+    while pos < len(expr):
+        seg = _SEGMENT_RE.match(expr, pos)
+        if not seg:
+            return None
+        if seg.group("dot") == "Parent":
+            if not path:
+                return None
+            path.pop()
+        else:
+            path.append(seg.group("dot") or seg.group("child") or seg.group("service") or seg.group("index"))
+        pos = seg.end()
+    return tuple(path)
+
+
+def parse_dependencies(source, script_path):
+    """
+    Resolve every require in source. Returns a list of
+    (instance_path_or_None, expression) tuples, None marking a dynamic require.
+    """
+    source = strip_comments(source)
+
+    # Locals bound to instance paths; names bound more than once are ambiguous
+    aliases = {}
+    for match in _LOCAL_RE.finditer(source):
+        name, rhs = match.group(1), match.group(2)
+        resolved = None if "require" in rhs else resolve_expression(rhs, script_path, aliases)
+        if name in aliases and aliases[name] != resolved:
+            resolved = None
+        aliases[name] = resolved
+
+    return [(resolve_expression(arg, script_path, aliases), arg) for arg in find_require_arguments(source)]
+
+
+def file_dependencies(file_path, instance_path):
+    """parse_dependencies for a file, cached by path + mtime + size"""
+    st = os.stat(file_path)
+    cached = _parse_cache.get(file_path)
+    if cached and cached[:3] == (st.st_mtime_ns, st.st_size, instance_path):
+        return cached[3]
+    with open(file_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    if file_path.lower().endswith(".json"):
+        targets = []
+    else:
+        targets = parse_dependencies(source, instance_path)
+    _parse_cache[file_path] = (st.st_mtime_ns, st.st_size, instance_path, targets)
+    return targets
+
+
+def is_provided(instance_path):
+    """True for instances created by the prelude/driver rather than the bundle"""
+    return any(instance_path[:len(prefix)] == prefix for prefix in PROVIDED_PREFIXES)
+
+
+def spec_entry_points(spec_paths, tests_dir):
+    """(file, instance_path) pairs for the specs and _helpers as the drivers mount them"""
+    entries = [(str(p), TESTS_FOLDER + (p.stem,)) for p in spec_paths]
+    helpers_path = tests_dir / "_helpers.luau"
+    if helpers_path.exists():
+        entries.append((str(helpers_path), TESTS_FOLDER + ("_helpers",)))
+    return entries
+
+
+def reachable_files(entry_points, instance_map):
+    """
+    Compute the transitive closure of requires from entry_points.
+
+    entry_points: [(file_path, instance_path)]
+    instance_map: {file_path: instance_path} for every bundleable module
+    Returns: (set_of_file_paths, None) or (None, reason) when a reachable
+    require cannot be resolved statically.
+    """
+    by_instance = {path: file for file, path in instance_map.items()}
+    seen = set()
+    queue = list(entry_points)
+    while queue:
+        file_path, instance_path = queue.pop()
+        try:
+            targets = file_dependencies(file_path, instance_path)
+        except (OSError, UnicodeDecodeError) as e:
+            return None, f"could not read {file_path}: {e}"
+        for target, expr in targets:
+            if target is None:
+                return None, f"dynamic require({expr}) in {file_path}"
+            if is_provided(target):
+                continue
+            dep_file = by_instance.get(target)
+            if dep_file is None:
+                return None, f"unresolved require({expr}) in {file_path}"
+            if dep_file not in seen:
+                seen.add(dep_file)
+                queue.append((dep_file, target))
+    return seen, None
+
+
+class ImpactIndex:
+    """
+    Reverse dependency index for watch mode: module file -> specs that
+    transitively require it.
+
+    _helpers.luau is mounted next to every spec, so the modules it reaches
+    are part of every spec's closure. Specs whose closure contains a dynamic
+    or unresolved require are treated as depending on everything. Changed
+    files are re-parsed on update and only the specs that reached them get
+    their closures recomputed.
+    """
+
+    def __init__(self):
+        self.instance_map = {}  # {real_path: instance_path}
+        self.by_instance = {}  # {instance_path: real_path}
+        self.specs = {}  # {real_path: spec Path}
+        self.helpers = None  # real path of _helpers.luau
+        self.helpers_closure = set()  # Modules _helpers reaches (None when dynamic)
+        self.deps = {}  # {real_path: set(real_paths) or None when dynamic}
+        self.closures = {}  # {spec real_path: set(real_paths) or None when dynamic}
+        self.reverse = {}  # {module real_path: set(spec real_paths)}
+        self.stale = set()  # Specs that reached the last changed files before the update
+
+    def rebuild(self, spec_paths, tests_dir, instance_map):
+        """Build the index from scratch"""
+        self.instance_map = {os.path.realpath(f): p for f, p in instance_map.items()}
+        self.by_instance = {p: f for f, p in self.instance_map.items()}
+        self.helpers = os.path.realpath(tests_dir / "_helpers.luau")
+        self.specs = {}
+        self.deps = {}
+        self.closures = {}
+        self.reverse = {}
+        self._update_helpers()
+        for spec in spec_paths:
+            self._add_spec(spec)
+
+    def _update_helpers(self):
+        if os.path.exists(self.helpers):
+            self.helpers_closure = self._closure(self.helpers, TESTS_FOLDER + ("_helpers",))
+        else:
+            self.helpers_closure = set()
+
+    def _spec_closure(self, real, spec):
+        """Modules a spec can reach, directly or through _helpers"""
+        closure = self._closure(real, TESTS_FOLDER + (spec.stem,))
+        if closure is None or self.helpers_closure is None:
+            return None
+        return closure | self.helpers_closure
+
+    def _add_spec(self, spec):
+        real = os.path.realpath(spec)
+        self.specs[real] = spec
+        self._set_closure(real, self._spec_closure(real, spec))
+
+    def _remove_spec(self, real):
+        self._set_closure(real, None)
+        del self.closures[real]
+        del self.specs[real]
+
+    def _set_closure(self, spec_real, closure):
+        old = self.closures.get(spec_real) or set()
+        for module in old:
+            owners = self.reverse.get(module)
+            if owners:
+                owners.discard(spec_real)
+        for module in closure or ():
+            self.reverse.setdefault(module, set()).add(spec_real)
+        self.closures[spec_real] = closure
+
+    def _file_deps(self, real_path, instance_path):
+        if real_path not in self.deps:
+            deps = set()
+            try:
+                targets = file_dependencies(real_path, instance_path)
+            except (OSError, UnicodeDecodeError):
+                targets = [(None, "")]
+            for target, _ in targets:
+                if target is None:
+                    deps = None
+                    break
+                if is_provided(target):
+                    continue
+                dep = self.by_instance.get(target)
+                if dep is None:
+                    deps = None
+                    break
+                deps.add(dep)
+            self.deps[real_path] = deps
+        return self.deps[real_path]
+
+    def _closure(self, spec_real, instance_path):
+        seen = set()
+        stack = [(spec_real, instance_path)]
+        while stack:
+            file_path, path = stack.pop()
+            deps = self._file_deps(file_path, path)
+            if deps is None:
+                return None
+            for dep in deps:
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append((dep, self.instance_map[dep]))
+        return seen
+
+    def update(self, changed_paths, spec_paths, tests_dir, instance_map):
+        """
+        Re-parse changed files and recompute the closures of specs that
+        reached them. A changed module set (files added, removed or moved
+        in the sourcemap) rebuilds the whole index.
+        """
+        # Specs that required a changed file before this update must rerun even
+        # if the file is now gone (deleted or moved away)
+        self.stale = set()
+        for path in changed_paths:
+            self.stale |= self.reverse.get(os.path.realpath(path), set())
+
+        real_map = {os.path.realpath(f): p for f, p in instance_map.items()}
+        if real_map != self.instance_map:
+            self.rebuild(spec_paths, tests_dir, instance_map)
+            return
+
+        current_specs = {os.path.realpath(s): s for s in spec_paths}
+        for real in set(self.specs) - set(current_specs):
+            self._remove_spec(real)
+
+        affected = set()
+        helpers_changed = self.helpers_closure is None
+        for path in changed_paths:
+            real = os.path.realpath(path)
+            self.deps.pop(real, None)
+            affected |= self.reverse.get(real, set())
+            if real in current_specs:
+                affected.add(real)
+            if real == self.helpers or real in (self.helpers_closure or ()):
+                helpers_changed = True
+        if helpers_changed:
+            self._update_helpers()
+            affected |= set(self.specs)
+        # Dynamic specs may resolve now
+        affected |= {s for s, closure in self.closures.items() if closure is None}
+
+        for real, spec in current_specs.items():
+            if real not in self.specs:
+                self._add_spec(spec)
+            elif real in affected:
+                self._set_closure(real, self._spec_closure(real, spec))
+
+    def impacted_specs(self, changed_paths):
+        """
+        Specs that must rerun for these changed files.
+        Returns a sorted list of spec paths, or None when everything must rerun.
+        """
+        impacted = set()
+        for path in changed_paths:
+            real = os.path.realpath(path)
+            if real == self.helpers:
+                return None
+            if real in self.specs:
+                impacted.add(real)
+            elif real in self.instance_map:
+                impacted |= self.reverse.get(real, set())
+            elif not real.endswith((".lua", ".luau")):
+                # Project files, configs, etc.
+                return None
+        if not impacted and not changed_paths:
+            return None
+        impacted |= {s for s in self.stale if s in self.specs}
+        impacted |= {s for s, closure in self.closures.items() if closure is None}
+        return sorted((self.specs[s] for s in impacted), key=str)
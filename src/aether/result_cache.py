@@ -0,0 +1,109 @@
+"""
+Aether - Content-addressed result cache
+
+Stores the results of successful runs keyed by a hash of the exact payload
+that was executed (bundle + driver) and the place it ran in, so unchanged
+payloads report instantly instead of going back to the cloud. The cache
+directory is size-capped with least-recently-used eviction.
+"""
+import hashlib
+import json
+import os
+
+from . import stats
+from .config import DEFAULT_API_URL
+from .utils import get_cache_dir
+
+DEFAULT_MAX_SIZE_MB = 100
+
+# Bump when the stored result format changes
+CACHE_FORMAT = "1"
+
+
+def payload_key(payload, config, mode):
+    """Hash of the payload and the config that affects how it executes"""
+    h = hashlib.sha256()
+    for part in (CACHE_FORMAT, mode, str(config.get("universe_id")), str(config.get("place_id"))):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    api_url = config.get("api_url")
+    if api_url and api_url.rstrip("/") != DEFAULT_API_URL:
+        # Results from a stand-in server never answer for Open Cloud (existing keys stay valid)
+        h.update(api_url.encode("utf-8") + b"\0")
+    h.update(payload.encode("utf-8"))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Directory of JSON run outputs, one file per payload hash"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Get the cached run output for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            stats.incr("result_cache.misses")
+            return None
+        stats.incr("result_cache.hits")
+        return result
+
+    def put(self, key, result):
+        """Store a run output (best-effort) and evict old entries if over the cap"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        stats.incr("result_cache.writes")
+        self.evict()
+
+    def evict(self):
+        """Delete least-recently-used entries until the directory fits the size cap"""
+        entries = []
+        total = 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            stats.incr("result_cache.evictions")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+def get_result_cache(config):
+    """Get the result cache for this config, or None when disabled (--no-cache)"""
+    if not config.get("result_cache", True):
+        return None
+    max_mb = config.get("result_cache_max_mb", DEFAULT_MAX_SIZE_MB)
+    return ResultCache(get_cache_dir() / "results", int(max_mb * 1024 * 1024))
@@ -2,32 +2,316 @@
 Aether - Rojo Sourcemap Resolver
 
 Resolves file paths to Roblox instance paths using Rojo's sourcemap.
+
+Parsed sourcemaps are cached in memory and on disk, keyed by the project
+file and a fingerprint of the tree it references, so `rojo sourcemap` only
+runs when files are added, removed or renamed. Watch mode keeps a
+`rojo sourcemap --watch` process running (SourcemapWatcher) whose output
+replaces those one-off runs.
 """
+import hashlib
 import json
+import os
 import subprocess
 import shutil
+import sys
+import time
+from array import array
 from pathlib import Path
 
+from . import stats, tracing
+from .utils import get_cache_dir
+
+# Bump when the cached sourcemap format changes
+SOURCEMAP_CACHE_FORMAT = "1"
+
+# Parsed sourcemaps: {project key: (fingerprint, SourcemapIndex)}
+_memory_cache = {}
+
+# Running `rojo sourcemap --watch` processes: {project key: SourcemapWatcher}
+_watchers = {}
+
+
+def _project_key(project_file):
+    """
+    Cache key for a project. Rojo writes file paths relative to the working
+    directory, so that is part of the key too.
+    """
+    h = hashlib.sha1()
+    h.update(os.path.realpath(project_file).encode("utf-8"))
+    h.update(b"\0")
+    h.update(os.getcwd().encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _referenced_paths(node, base_dir, out):
+    """Collect the $path of every node in a project tree"""
+    for key, value in node.items():
+        if key == "$path":
+            path = value.get("optional") if isinstance(value, dict) else value
+            if path:
+                out.append(base_dir / path)
+        elif not key.startswith("$") and isinstance(value, dict):
+            _referenced_paths(value, base_dir, out)
+
+
+def tree_fingerprint(project_file):
+    """
+    Fingerprint everything the sourcemap depends on: the project file, the
+    names of the files and folders its $paths reference and the stat of
+    JSON files in them (meta/model files and nested projects add instances).
+    Script edits leave the fingerprint unchanged.
+
+    Returns: (fingerprint, latest_change_ns), the latter being the newest
+    mtime among the folders and JSON files, i.e. the last structural change.
+    """
+    project_file = Path(project_file)
+    data = project_file.read_bytes()
+    h = hashlib.sha1(data)
+    latest = os.stat(project_file).st_mtime_ns
+
+    roots = []
+    _referenced_paths(json.loads(data).get("tree", {}), project_file.parent, roots)
+    for root in roots:
+        h.update(b"\0" + str(root).encode("utf-8"))
+        try:
+            st = os.stat(root)
+        except OSError:
+            h.update(b"?")  # Missing (optional) path
+            continue
+        latest = max(latest, st.st_mtime_ns)
+        if not os.path.isdir(root):
+            h.update(f":{st.st_mtime_ns}:{st.st_size}".encode("utf-8"))
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            rel = os.path.relpath(dirpath, root)
+            latest = max(latest, os.stat(dirpath).st_mtime_ns)
+            h.update(f"\0{rel}/".encode("utf-8"))
+            for name in sorted(filenames):
+                h.update(f"\0{name}".encode("utf-8"))
+                if name.endswith(".json"):
+                    st = os.stat(os.path.join(dirpath, name))
+                    latest = max(latest, st.st_mtime_ns)
+                    h.update(f":{st.st_mtime_ns}:{st.st_size}".encode("utf-8"))
+    return h.hexdigest(), latest
+
+
+def _disk_cache_path(key):
+    return get_cache_dir() / "sourcemaps" / f"{key}.json"
+
+
+def _read_disk_cache(key, fingerprint):
+    """Get the cached sourcemap for this project and fingerprint, or None"""
+    try:
+        with open(_disk_cache_path(key), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("format") != SOURCEMAP_CACHE_FORMAT or cached.get("fingerprint") != fingerprint:
+        return None
+    return cached.get("sourcemap")
+
+
+def _write_disk_cache(key, fingerprint, sourcemap):
+    """Store a sourcemap (best-effort)"""
+    path = _disk_cache_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": SOURCEMAP_CACHE_FORMAT, "fingerprint": fingerprint, "sourcemap": sourcemap}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+class SourcemapWatcher:
+    """
+    A long-lived `rojo sourcemap --watch` process for watch mode. Rojo
+    rewrites its output file (under the cache directory, not the project)
+    whenever the tree changes; RojoResolver reads it instead of spawning
+    `rojo sourcemap` for every structural change.
+    """
+
+    def __init__(self, project_file="default.project.json"):
+        self.project_file = Path(project_file)
+        self.key = _project_key(self.project_file)
+        self.output = get_cache_dir() / "sourcemaps" / f"{self.key}.watch.json"
+        self.process = None
+        self._stamp = None  # (mtime_ns, size) of the output last parsed
+        self._sourcemap = None
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Start rojo. Returns False if there is no project file or rojo is not installed."""
+        if not (self.project_file.exists() and shutil.which("rojo")):
+            return False
+        try:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            if self.output.exists():
+                self.output.unlink()  # Never serve a previous session's output
+            self.process = subprocess.Popen(
+                ["rojo", "sourcemap", str(self.project_file), "--watch", "--output", str(self.output)],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            print(f"[WARN] Failed to start rojo sourcemap --watch: {e}")
+            return False
+        _watchers[self.key] = self
+        return True
+
+    def stop(self):
+        """Stop rojo (if running)"""
+        if _watchers.get(self.key) is self:
+            del _watchers[self.key]
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+    def sourcemap(self, changed_since_ns, wait=2.0):
+        """
+        The latest sourcemap rojo wrote after `changed_since_ns` (the tree's
+        last structural change), waiting up to `wait` seconds for rojo to
+        catch up. Returns None if it did not (or rojo exited).
+        """
+        deadline = time.time() + wait
+        while self.running:
+            self._read()
+            if self._sourcemap is not None and self._stamp[0] > changed_since_ns:
+                return self._sourcemap
+            if time.time() >= deadline:
+                return None
+            time.sleep(0.05)
+        return None
+
+    def _read(self):
+        try:
+            st = os.stat(self.output)
+        except OSError:
+            return  # Not written yet
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+        try:
+            with open(self.output, "r", encoding="utf-8") as f:
+                sourcemap = json.load(f)
+        except (OSError, ValueError):
+            return  # Caught mid-write; the next read sees the finished file
+        self._stamp = stamp
+        self._sourcemap = sourcemap
+
+
+class SourcemapIndex:
+    """
+    Compact two-way index between files and instances in a Rojo sourcemap.
+
+    Every instance is stored once as (parent id, interned name), so instance
+    paths share their parent prefixes instead of each holding a full copy;
+    files map to instance ids and paths are rebuilt on lookup. The tree is
+    walked iteratively, so deep sourcemaps cannot hit the recursion limit,
+    and each file path is resolved exactly once.
+    """
+
+    def __init__(self, sourcemap=None):
+        self.names = []  # Interned instance name per instance id
+        self.parents = array("i")  # Parent instance id per instance id (-1 for the root)
+        self.files = {}  # {resolved file path: instance id}
+        self._by_instance = None  # {instance path: resolved file path}, built on first use
+        if sourcemap is not None:
+            self.build(sourcemap)
+
+    def build(self, root):
+        """Index a sourcemap (its root node), preorder like Rojo lists it"""
+        resolve = _file_resolver()
+        names, parents, files = self.names, self.parents, self.files
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            ident = len(names)
+            names.append(sys.intern(node.get("name", "")))
+            parents.append(parent)
+            for file_path in node.get("filePaths", ()):
+                files[resolve(file_path)] = ident
+            children = node.get("children")
+            if children:
+                stack.extend((child, ident) for child in reversed(children))
+        self._by_instance = None
+
+    def instance_path(self, ident):
+        """Instance path (tuple of names below the root) for an instance id"""
+        parts = []
+        while self.parents[ident] != -1:
+            parts.append(self.names[ident])
+            ident = self.parents[ident]
+        parts.reverse()
+        return tuple(parts)
+
+    def path_for_file(self, file_path):
+        """Instance path for a resolved file path, or None"""
+        ident = self.files.get(file_path)
+        return None if ident is None else self.instance_path(ident)
+
+    def file_for_path(self, instance_path):
+        """Resolved file path for an instance path, or None"""
+        if self._by_instance is None:
+            self._by_instance = {self.instance_path(i): f for f, i in self.files.items()}
+        return self._by_instance.get(tuple(instance_path))
+
+
+def _file_resolver():
+    """
+    Path.resolve() for sourcemap file paths, realpath-ing each directory
+    once instead of every component of every file
+    """
+    cwd = os.getcwd()
+    dirs = {}
+
+    def resolve(file_path):
+        file_path = os.path.join(cwd, file_path)
+        if os.path.islink(file_path):
+            return os.path.realpath(file_path)
+        head, tail = os.path.split(file_path)
+        real_dir = dirs.get(head)
+        if real_dir is None:
+            real_dir = dirs[head] = os.path.realpath(head)
+        return os.path.join(real_dir, tail)
+
+    return resolve
+
+
 class RojoResolver:
     def __init__(self, project_file: str = "default.project.json"):
         self.project_file = Path(project_file)
-        self.sourcemap = None
-        self.mappings = {}  # {file_path: [instance_path_components]}
+        self.index = SourcemapIndex()
+        self.source = None  # Where the sourcemap came from: memory, disk, watch, rojo or sourcemap.json
 
     def generate_sourcemap(self):
-        """Generate sourcemap using rojo CLI or read existing sourcemap.json"""
+        """Generate sourcemap using rojo CLI (cached) or read existing sourcemap.json"""
+        with tracing.span("sourcemap") as info:
+            found = self._find_sourcemap()
+            info["source"] = self.source
+            info["files"] = len(self.index.files)
+        return found
+
+    def _find_sourcemap(self):
         # 1. Prefer generating fresh from project file if it exists and rojo is installed
         if self.project_file.exists() and shutil.which("rojo"):
             try:
-                result = subprocess.run(
-                    ["rojo", "sourcemap", str(self.project_file)],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                self.sourcemap = json.loads(result.stdout)
-                self._build_mappings(self.sourcemap, [])
-                return True
+                if self._load_project_sourcemap():
+                    return True
             except subprocess.CalledProcessError as e:
                 print(f"[WARN] Failed to run rojo sourcemap: {e}")
         
@@ -36,45 +320,84 @@ class RojoResolver:
         if sourcemap_path.exists():
             try:
                 with open(sourcemap_path, "r", encoding="utf-8") as f:
-                    self.sourcemap = json.load(f)
-                self._build_mappings(self.sourcemap, [])
+                    self.index = SourcemapIndex(json.load(f))
+                self.source = "sourcemap.json"
                 return True
             except Exception as e:
                 print(f"[WARN] Failed to read sourcemap.json: {e}")
         
         return False
 
-    def _build_mappings(self, node, current_path):
-        """Recursively build file-to-path mappings"""
-        # Handle file paths
-        if "filePaths" in node:
-            for file_path in node["filePaths"]:
-                abs_path = Path(file_path).resolve()
-                self.mappings[abs_path] = current_path
+    def _load_project_sourcemap(self):
+        """
+        Load the project's sourcemap: from memory, the disk cache or the
+        watch-mode rojo process when the tree is unchanged, else by running
+        `rojo sourcemap`.
+        """
+        key = _project_key(self.project_file)
+        try:
+            with tracing.span("fingerprint"):
+                fingerprint, changed_ns = tree_fingerprint(self.project_file)
+        except (OSError, ValueError):
+            fingerprint = changed_ns = None  # Unreadable project; always regenerate
+        
+        cached = _memory_cache.get(key)
+        if fingerprint is not None and cached and cached[0] == fingerprint:
+            stats.incr("sourcemap.memory_hits")
+            self.index = cached[1]
+            self.source = "memory"
+            return True
+        
+        sourcemap = from_disk = None
+        if fingerprint is not None:
+            sourcemap = from_disk = _read_disk_cache(key, fingerprint)
+            if sourcemap is not None:
+                stats.incr("sourcemap.disk_hits")
+                self.source = "disk"
+            elif key in _watchers:
+                with tracing.span("wait for rojo --watch"):
+                    sourcemap = _watchers[key].sourcemap(changed_ns)
+                if sourcemap is not None:
+                    stats.incr("sourcemap.watch_updates")
+                    self.source = "watch"
+        
+        if sourcemap is None:
+            with tracing.span("rojo sourcemap", "subprocess"):
+                result = subprocess.run(
+                    ["rojo", "sourcemap", str(self.project_file)],
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                sourcemap = json.loads(result.stdout)
+            stats.incr("sourcemap.generated")
+            self.source = "rojo"
         
-        # Handle children
-        if "children" in node:
-            for child in node["children"]:
-                # The sourcemap structure for children is a list of node objects
-                # Each node has "name", "className", "filePaths", "children"
-                name = child["name"]
-                self._build_mappings(child, current_path + [name])
+        with tracing.span("index sourcemap"):
+            self.index = SourcemapIndex(sourcemap)
+        if fingerprint is not None:
+            _memory_cache[key] = (fingerprint, self.index)
+            if from_disk is None:
+                _write_disk_cache(key, fingerprint, sourcemap)
+        return True
 
     def get_roblox_path(self, file_path: Path):
         """Get Roblox path components for a file"""
-        resolved_path = file_path.resolve()
-        
-        # Exact match
-        if resolved_path in self.mappings:
-            path = self.mappings[resolved_path]
-            # Root services are usually correct, but let's ensure we return (Service, [Path])
-            if not path:
-                return None
-            return path
-            
-        return None
+        # Paths from get_all_scripts are already resolved
+        path = self.index.path_for_file(str(file_path))
+        if path is None:
+            path = self.index.path_for_file(str(file_path.resolve()))
+        # Root services are usually correct, but let's ensure we return (Service, [Path])
+        if not path:
+            return None
+        return path
+
+    def get_file_path(self, instance_path):
+        """Get the file behind an instance path, or None"""
+        file_path = self.index.file_for_path(instance_path)
+        return Path(file_path) if file_path else None
 
     def get_all_scripts(self):
         """Get all scripts defined in the sourcemap"""
         # Used for bundling iteration
-        return list(self.mappings.keys())
+        return [Path(f) for f in self.index.files]
@@ -1,64 +1,128 @@
 """
 Aether - Core test execution logic
 """
+import asyncio
+import bisect
 import time
 import requests
 import json
 import re
 import os
 from .utils import DEFAULT_TIMEOUT
-from .bundler import get_testez_driver, get_master_driver
-from .config import get_api_url
+from .bundler import BundleBuilder, get_testez_driver, get_master_driver
+from . import engine
+from .polling import PollPolicy, duration_key, load_expected_duration, record_duration
+from .result_cache import get_result_cache, payload_key
+from .progress import ProgressStream, is_progress_line
+from . import tracing
 
 from .ui import console
 
+# Line references emitted by Luau errors/tracebacks ("TaskScript:12", ":12") and Roblox ("Line 12")
+_TASKSCRIPT_LINE_RE = re.compile(r'(TaskScript)?(:)(\d+)')
+_ROBLOX_LINE_RE = re.compile(r'(Line )(\d+)')
+
+
+class SourceMapIndex:
+    """
+    Sorted interval index over source-map ranges.
+
+    Lookups bisect the range starts instead of scanning every mapping, and
+    display paths (relative to the working directory) are computed once per
+    file. Ranges produced by the bundler and drivers never overlap.
+    """
+
+    def __init__(self, source_map=()):
+        entries = sorted(source_map, key=lambda m: m["start"])
+        self._starts = [m["start"] for m in entries]
+        self._ends = [m["end"] for m in entries]
+        self._original_starts = [m["original_start"] for m in entries]
+        self._files = [str(m["file"]) for m in entries]
+        self._display_names = {}
+
+    def __len__(self):
+        return len(self._starts)
+
+    def extended(self, source_map):
+        """Return a new index with extra mappings, sharing this index's path cache"""
+        extra = SourceMapIndex(source_map)
+        if extra._starts and self._starts and extra._starts[0] <= self._ends[-1]:
+            # Extra ranges interleave with ours; rebuild from scratch
+            extra = SourceMapIndex(self.mappings() + extra.mappings())
+            extra._display_names = self._display_names
+            return extra
+        extra._starts = self._starts + extra._starts
+        extra._ends = self._ends + extra._ends
+        extra._original_starts = self._original_starts + extra._original_starts
+        extra._files = self._files + extra._files
+        extra._display_names = self._display_names
+        return extra
+
+    def mappings(self):
+        """The indexed ranges as source-map dicts"""
+        return [
+            {"file": f, "start": s, "end": e, "original_start": o}
+            for f, s, e, o in zip(self._files, self._starts, self._ends, self._original_starts)
+        ]
+
+    def _display_name(self, file_name):
+        name = self._display_names.get(file_name)
+        if name is None:
+            try:
+                name = os.path.relpath(file_name, os.getcwd())
+            except ValueError:
+                name = file_name
+            self._display_names[file_name] = name
+        return name
+
+    def lookup(self, line_num):
+        """Map a bundle line number to "file:line", or None if it is not mapped"""
+        i = bisect.bisect_right(self._starts, line_num) - 1
+        if i < 0 or line_num > self._ends[i]:
+            return None
+        orig_line = self._original_starts[i] + (line_num - self._starts[i])
+        return f"{self._display_name(self._files[i])}:{orig_line}"
+
+
+# Base index for the most recently seen bundle source map: (source_map, index)
+_base_index = (None, None)
+
+
+def get_source_map_index(source_map):
+    """Get the index for a bundle source map, building it once per bundle"""
+    global _base_index
+    if isinstance(source_map, SourceMapIndex):
+        return source_map
+    if source_map is None:
+        return SourceMapIndex()
+    if _base_index[0] is not source_map:
+        _base_index = (source_map, SourceMapIndex(source_map))
+    return _base_index[1]
+
+
 def resolve_source_map(text, source_map, verbose=False):
     """
     Resolve line numbers in text using source map and format stack traces.
+    `source_map` may be a list of mappings or a prebuilt SourceMapIndex.
     """
     if not source_map or not text:
         return text
     
+    index = get_source_map_index(source_map)
     lines = text.split('\n')
     resolved_lines = []
     
+    def replace_match(match):
+        if not match.group(3):
+            return match.group(0)
+        return index.lookup(int(match.group(3))) or match.group(0)
+        
+    def replace_roblox_match(match):
+        return index.lookup(int(match.group(2))) or match.group(0)
+
     def resolve_line_content(line):
-        def replace_match(match):
-            full_match = match.group(0)
-            line_str = match.group(3)
-            if not line_str:
-                return full_match
-            line_num = int(line_str)
-            
-            for mapping in source_map:
-                if mapping["start"] <= line_num <= mapping["end"]:
-                    offset = line_num - mapping["start"]
-                    orig_line = mapping["original_start"] + offset
-                    file_name = mapping["file"]
-                    try:
-                        file_name = os.path.relpath(file_name, os.getcwd())
-                    except ValueError:
-                        pass
-                    return f"{file_name}:{orig_line}"
-            return full_match
-            
-        def replace_roblox_match(match):
-            full_match = match.group(0)
-            line_num = int(match.group(2))
-            for mapping in source_map:
-                if mapping["start"] <= line_num <= mapping["end"]:
-                    offset = line_num - mapping["start"]
-                    orig_line = mapping["original_start"] + offset
-                    file_name = mapping["file"]
-                    try:
-                        file_name = os.path.relpath(file_name, os.getcwd())
-                    except ValueError:
-                        pass
-                    return f"{file_name}:{orig_line}"
-            return full_match
-
-        line = re.sub(r'(TaskScript)?(:)(\d+)', replace_match, line)
-        line = re.sub(r'(Line )(\d+)', replace_roblox_match, line)
+        line = _TASKSCRIPT_LINE_RE.sub(replace_match, line)
+        line = _ROBLOX_LINE_RE.sub(replace_roblox_match, line)
         return line
 
     if lines:
@@ -78,352 +142,493 @@ def resolve_source_map(text, source_map, verbose=False):
     return "\n".join(resolved_lines)
 
 
-def run_test(test_file, bundle, tests_dir, config, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None):
-    """Execute a single test file on Roblox Cloud"""
-    # print(f"\n[Running Test: {test_file.name}]")
-    start_time = time.time()
-    
-    api_url = get_api_url(config)
-    api_key = config["api_key"]
-    
+def _prepare_single(test_file, bundle, tests_dir, source_map):
+    """Build the payload and source map for a single spec file"""
     driver, spec_offset, spec_len = get_testez_driver(test_file, tests_dir)
-    full_payload = bundle + "\n" + driver
-    
-    local_source_map = list(source_map) if source_map else []
-    bundle_lines = bundle.count('\n') + 1
-    absolute_start = bundle_lines + spec_offset
     
-    local_source_map.append({
+    payload = BundleBuilder()
+    payload.add(bundle)
+    payload.add_bundle(driver, [{
         "file": str(test_file),
-        "start": absolute_start,
-        "end": absolute_start + spec_len - 1,
+        "start": spec_offset,
+        "end": spec_offset + spec_len - 1,
         "original_start": 1
-    })
+    }])
+    full_payload, spec_mappings = payload.build()
     
-    # print(f"Sending request (Payload: {len(full_payload)} chars)...")
+    local_source_map = get_source_map_index(source_map).extended(spec_mappings)
+    return full_payload, local_source_map
+
+
+def _failed_result(name, error, duration):
+    """Build a run output for a spec that could not produce test results"""
+    return {
+        "success": False,
+        "results": [{
+            "name": name,
+            "status": "FAILED",
+            "error": error,
+            "traceback": ""
+        }],
+        "duration": duration
+    }
+
+
+def _single_timeout_result(config, elapsed, timeout):
+    if not config.get("json"):
+        console.print(f"\n[red][TIMEOUT][/red] Test exceeded {elapsed:.1f}s (limit: {timeout}s)")
+    return _failed_result("Suite Timeout", f"Test exceeded {elapsed:.1f}s limit", elapsed)
+
+
+def _describe_timings(output):
+    """Per-describe durations reported by the driver"""
+    return [
+        {"name": d.get("name", "Unknown"), "duration": d.get("duration"), "spec": d.get("spec")}
+        for d in output.get("describes") or []
+    ]
+
+
+def slowest(entries, count):
+    """The `count` entries with the longest measured duration, slowest first"""
+    timed = [e for e in entries if e.get("duration") is not None]
+    timed.sort(key=lambda e: e["duration"], reverse=True)
+    return [{"name": e["name"], "duration": round(e["duration"], 4)} for e in timed[:count]]
+
+
+def print_slowest(tests, describes, count):
+    """Print the --slowest report"""
+    for title, entries in (("Slowest tests", tests), ("Slowest describes", describes)):
+        top = slowest(entries, count)
+        if not top:
+            continue
+        console.print(f"\n[bold]{title}:[/bold]")
+        for e in top:
+            console.print(f"  {e['duration'] * 1000:8.1f}ms  {e['name']}")
+
+
+STATUS_MAP = {"Success": "PASSED", "Failure": "FAILED", "Skipped": "SKIPPED"}
+
+# Error reported for a task cancelled on Roblox's side (not by us)
+CANCELLED_MESSAGE = "Task was cancelled before it finished"
+
+
+def _convert_result(r, local_source_map, spec=None):
+    """Turn a raw driver result into a test case, resolving its error through the source map"""
+    res_status = r.get("status") or "Unknown"
     
-    test_results = []
-    has_suite_failure = False
+    error_msg = ""
+    traceback = ""
+    if res_status == "Failure" and r.get("errors"):
+        resolved_e = resolve_source_map(r["errors"][0], local_source_map, verbose=False)
+        parts = resolved_e.split("\n  Traceback:\n")
+        error_msg = parts[0]
+        # Clean up redundant file path
+        error_msg = re.sub(r"^.*?\.spec\.luau:\d+:\s*", "", error_msg)
+        error_msg = re.sub(r"^Error:\s*", "", error_msg)
+        if len(parts) > 1:
+            traceback = parts[1].replace("  at ", "").strip()
+    
+    return {
+        "name": r.get("name", "Unknown"),
+        "status": STATUS_MAP.get(res_status, res_status.upper()),
+        "error": error_msg,
+        "traceback": traceback,
+        "duration": r.get("duration"),
+        "spec": r.get("spec") or spec
+    }
+
+
+def _failed_specs(test_results, files, partial=False):
+    """
+    Names of the specs with a failing test. A failure that carries no spec
+    (suite-level error) makes every spec suspect, and for a partial run so
+    does every spec that never reported a result.
+    """
+    failed = set()
+    for r in test_results:
+        if r["status"] == "FAILED":
+            if not r.get("spec"):
+                return {f.stem for f in files}
+            failed.add(r["spec"])
+    if partial:
+        reported = {r.get("spec") for r in test_results}
+        failed |= {f.stem for f in files if f.stem not in reported}
+    return failed
+
+
+def _salvage(stream, local_source_map, name, error, spec=None):
+    """
+    Results of a task that timed out or failed: every test that finished
+    keeps its result and the test that was running takes the blame. When no
+    test was running, a `name` entry carries the error instead.
+    """
+    results = [_convert_result(r, local_source_map, spec) for r in stream.finished]
+    if stream.running:
+        results.append({
+            "name": stream.running.get("name", "Unknown"),
+            "status": "FAILED",
+            "error": error,
+            "traceback": "",
+            "spec": stream.running.get("spec") or spec
+        })
+    else:
+        results.append({"name": name, "status": "FAILED", "error": error, "traceback": "", "spec": spec})
+    return results
+
+
+def _stream_for(config, task_id, local_source_map, on_result, spec=None):
+    """ProgressStream for a task, forwarding finished tests to on_result as test cases"""
+    forward = None
+    if on_result:
+        forward = lambda r: on_result(_convert_result(r, local_source_map, spec))
+    return ProgressStream(config, task_id, on_result=forward)
+
+
+def _parse_single_task(data, test_file, local_source_map, config, verbose, elapsed):
+    """
+    Turn a finished task (COMPLETE, FAILED or CANCELLED) into a run output.
+    Returns None while the task is still running.
+    """
+    state = data.get("state")
+    
+    if state == "COMPLETE":
+        test_results = []
+        output = data.get("output", {}).get("results", [{}])[0] or data.get("returnValue", {})
+        
+        failure_count = output.get("failureCount", 0)
+        has_suite_failure = failure_count > 0
+        
+        if "results" in output and output["results"]:
+            for r in output["results"]:
+                test_results.append(_convert_result(r, local_source_map, test_file.stem))
+        else:
+            pass_suite = (output.get("status") == "Success" and not has_suite_failure)
+            if not pass_suite:
+                fails = output.get("failures", [])
+                msg = "Test Suite Failed"
+                if fails:
+                     msg = "; ".join(fails)
+                test_results.append({
+                    "name": test_file.stem,
+                    "status": "FAILED",
+                    "error": msg,
+                    "traceback": ""
+                })
+
+        success = not (output.get("status") in ("FAILED", "Failure") or has_suite_failure)
+        return {
+            "success": success,
+            "results": test_results,
+            "describes": _describe_timings(output),
+            "duration": elapsed
+        }
+        
+    elif state == "FAILED":
+        resolved_msg = resolve_source_map(data.get('error', {}).get('message'), local_source_map, verbose)
+        
+        if not config.get("json"):
+            console.print(f"\n[red][ERROR][/red] Execution failed after {elapsed:.2f}s")
+            print(f"   - {resolved_msg}")
+            if "logs" in data:
+                for l in data["logs"]:
+                    if not is_progress_line(l['message']):
+                        print(f"      > {l['message']}")
+                    
+        return _failed_result("Execution Error", resolved_msg, elapsed)
+    
+    elif state == "CANCELLED":
+        if not config.get("json"):
+            console.print(f"\n[red][ERROR][/red] Task was cancelled after {elapsed:.2f}s")
+        return _failed_result("Task Cancelled", CANCELLED_MESSAGE, elapsed)
+    
+    return None
+
+
+def _is_cacheable(result):
+    """Only fully passing runs are cached; failures always re-execute"""
+    return result["success"] and not any(r["status"] == "FAILED" for r in result["results"])
+
+
+def _from_cache(cached, start_time):
+    """Turn a stored run output into this run's output"""
+    result = dict(cached)
+    result["cached"] = True
+    result["polls"] = 0
+    result["duration"] = time.time() - start_time
+    return result
+
+
+async def run_test_async(test_file, bundle, tests_dir, config, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None, on_result=None):
+    """
+    Execute a single test file on Roblox Cloud (coroutine).
+    `on_result` is called with each test case as soon as the test finishes.
+    """
+    start_time = time.time()
+    tracing.set_lane(f"task {test_file.stem}")
+    
+    with tracing.span("driver", spec=test_file.stem):
+        full_payload, local_source_map = _prepare_single(test_file, bundle, tests_dir, source_map)
+    
+    result_cache = get_result_cache(config)
+    cache_key = payload_key(full_payload, config, "single") if result_cache else None
+    with tracing.span("result cache") as info:
+        cached = result_cache.get(cache_key) if result_cache else None
+        info["hit"] = cached is not None
+    if cached is not None:
+        return _from_cache(cached, start_time)
+    
+    timing_key = duration_key([test_file], "single")
+    policy = PollPolicy.from_config(config, expected=load_expected_duration(timing_key))
     
     try:
-        resp = requests.post(
-            api_url,
-            headers={"x-api-key": api_key, "Content-Type": "application/json"},
-            json={"script": full_payload}
-        )
-        resp.raise_for_status()
-        task = resp.json()
-        task_id = task.get("path")
+        task_id = await engine.submit_task(config, full_payload)
+        stream = _stream_for(config, task_id, local_source_map, on_result, test_file.stem)
         
-        elapsed = 0
-        while True:
-            time.sleep(2)
-            elapsed = time.time() - start_time
-            
-            if elapsed > timeout:
-                if not config.get("json"):
-                    console.print(f"\n[red][TIMEOUT][/red] Test exceeded {elapsed:.1f}s (limit: {timeout}s)")
-                return {
-                    "success": False, 
-                    "results": [{
-                        "name": "Suite Timeout",
-                        "status": "FAILED", 
-                        "error": f"Test exceeded {elapsed:.1f}s limit",
-                        "traceback": ""
-                    }],
-                    "duration": elapsed
-                }
-            
+        try:
+            with tracing.span("wait", task=task_id):
+                data = await engine.wait_for_task(
+                    config, task_id, start_time, timeout, policy,
+                    on_poll=stream.poll if on_result else None
+                )
+        except engine.TaskTimeout as e:
+            result = _single_timeout_result(config, e.elapsed, timeout)
+            await engine.cancel_task(config, task_id, "timeout")
+            await stream.poll()
+            if stream.finished or stream.running:
+                result["results"] = _salvage(
+                    stream, local_source_map, "Suite Timeout",
+                    f"Still running when the test timed out after {e.elapsed:.1f}s", test_file.stem
+                )
+                result["partial"] = True
+            result["polls"] = policy.polls
+            return result
+        except asyncio.CancelledError:
+            # Nobody is waiting for this result any more (Ctrl-C, superseded run)
+            await engine.cancel_task(config, task_id, "cancelled")
+            raise
+        except requests.exceptions.RequestException as e:
+            # Nobody will read this task's result; don't leave it running
+            await engine.cancel_task(config, task_id, "error")
             if not config.get("json"):
-                pass
-                
-            try:
-                status_resp = requests.get(
-                    f"https://apis.roblox.com/cloud/v2/{task_id}",
-                    headers={"x-api-key": api_key}
+                console.print(f"\n[red][ERROR][/red] Checking task status: {e}")
+            result = _failed_result("System Error", str(e), time.time() - start_time)
+            result["polls"] = policy.polls
+            return result
+        
+        elapsed = time.time() - start_time
+        if data.get("state") == "COMPLETE":
+            record_duration(timing_key, elapsed)
+        with tracing.span("parse results"):
+            result = _parse_single_task(data, test_file, local_source_map, config, verbose, elapsed)
+        if data.get("state") in ("FAILED", "CANCELLED"):
+            await stream.poll()
+            if stream.finished or stream.running:
+                result["results"] = _salvage(
+                    stream, local_source_map, "Execution Error", result["results"][0]["error"], test_file.stem
                 )
-                status_resp.raise_for_status()
-                data = status_resp.json()
-                state = data.get("state")
-            except requests.exceptions.RequestException as e:
-                if not config.get("json"):
-                    console.print(f"\n[red][ERROR][/red] Checking task status: {e}")
-                return {
-                    "success": False,
-                    "results": [{
-                        "name": "System Error",
-                        "status": "FAILED",
-                        "error": str(e),
-                        "traceback": ""
-                    }],
-                    "duration": elapsed
-                }
-            
-            if state == "COMPLETE":
-                elapsed = time.time() - start_time
-                output = data.get("output", {}).get("results", [{}])[0] or data.get("returnValue", {})
-                
-                failure_count = output.get("failureCount", 0)
-                has_suite_failure = failure_count > 0
-                
-                if "results" in output and output["results"]:
-                    for r in output["results"]:
-                        name = r.get("name", "Unknown")
-                        res_status = r.get("status", "Unknown")
-                        
-                        status_map = {
-                            "Success": "PASSED",
-                            "Failure": "FAILED",
-                            "Skipped": "SKIPPED"
-                        }
-                        final_status = status_map.get(res_status, res_status.upper())
-                        
-                        error_msg = ""
-                        traceback = ""
-                        
-                        if res_status == "Failure" and "errors" in r:
-                            raw_errors = r["errors"]
-                            if raw_errors:
-                                resolved_e = resolve_source_map(raw_errors[0], local_source_map, verbose=False)
-                                parts = resolved_e.split("\n  Traceback:\n")
-                                error_msg = parts[0]
-                                # Clean up redundant file path
-                                error_msg = re.sub(r"^.*?\.spec\.luau:\d+:\s*", "", error_msg)
-                                error_msg = re.sub(r"^Error:\s*", "", error_msg)
-                                if len(parts) > 1:
-                                    traceback = parts[1].replace("  at ", "").strip()
-                        
-                        test_results.append({
-                            "name": name,
-                            "status": final_status,
-                            "error": error_msg,
-                            "traceback": traceback
-                        })
-                else:
-                    pass_suite = (output.get("status") == "Success" and not has_suite_failure)
-                    if not pass_suite:
-                        fails = output.get("failures", [])
-                        msg = "Test Suite Failed"
-                        if fails:
-                             msg = "; ".join(fails)
-                        test_results.append({
-                            "name": test_file.stem,
-                            "status": "FAILED",
-                            "error": msg,
-                            "traceback": ""
-                        })
-
-                success = not (output.get("status") in ("FAILED", "Failure") or has_suite_failure)
-                return {
-                    "success": success,
-                    "results": test_results,
-                    "duration": elapsed
-                }
-                
-            elif state == "FAILED":
-                elapsed = time.time() - start_time
-                resolved_msg = resolve_source_map(data.get('error', {}).get('message'), local_source_map, verbose)
-                
-                if not config.get("json"):
-                    console.print(f"\n[red][ERROR][/red] Execution failed after {elapsed:.2f}s")
-                    print(f"   - {resolved_msg}")
-                    if "logs" in data:
-                        for l in data["logs"]:
-                            print(f"      > {l['message']}")
-                            
-                return {
-                    "success": False,
-                    "results": [{
-                        "name": "Execution Error",
-                        "status": "FAILED",
-                        "error": resolved_msg,
-                        "traceback": ""
-                    }],
-                    "duration": elapsed
-                }
+                result["partial"] = True
+        result["polls"] = policy.polls
+        if result_cache and _is_cacheable(result):
+            result_cache.put(cache_key, result)
+        return result
                 
     except Exception as e:
         if not config.get("json"):
              console.print(f"[red][ERROR][/red] Request Failed: {e}")
-        return {
-            "success": False,
-            "results": [{
-                "name": "Request Failed",
-                "status": "FAILED",
-                "error": str(e),
-                "traceback": ""
-            }],
-            "duration": 0
-        }
+        return _failed_result("Request Failed", str(e), 0)
 
 
-def run_tests_batch(files, bundle, tests_dir, config, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None):
-    """Execute all test files in a single Roblox Cloud request (batch mode)"""
-    # Silent start - spinner handles status
-    start_time = time.time()
+def run_test(test_file, bundle, tests_dir, config, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None, on_result=None):
+    """Execute a single test file on Roblox Cloud"""
+    return engine.run_sync(run_test_async(test_file, bundle, tests_dir, config, timeout, verbose, source_map, on_result))
+
+
+async def run_tests_concurrent_async(files, bundle, tests_dir, config, jobs=4, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None):
+    """
+    Execute spec files as separate tasks with up to `jobs` in flight at once.
+
+    Every spec keeps its own task (same isolation as run_test); all tasks
+    are polled from the same event loop. Yields (test_file, run_output) in
+    completion order.
+    """
+    semaphore = asyncio.Semaphore(jobs)
     
-    api_url = get_api_url(config)
-    api_key = config["api_key"]
+    async def run_one(test_file):
+        async with semaphore:
+            return test_file, await run_test_async(test_file, bundle, tests_dir, config, timeout, verbose, source_map)
     
+    tasks = [asyncio.ensure_future(run_one(f)) for f in files]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for t in tasks:
+            t.cancel()
+        # Let cancelled runs cancel their remote tasks before the loop closes
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_tests_concurrent(files, bundle, tests_dir, config, jobs=4, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None):
+    """Synchronous facade over run_tests_concurrent_async"""
+    return engine.iterate_sync(run_tests_concurrent_async(files, bundle, tests_dir, config, jobs, timeout, verbose, source_map))
+
+
+def _prepare_batch(files, bundle, tests_dir, source_map):
+    """Build the master driver payload and source map for a batch of spec files"""
     driver, spec_offsets = get_master_driver(files, tests_dir)
-    full_payload = bundle + "\n" + driver
     
-    local_source_map = list(source_map) if source_map else []
-    bundle_lines = bundle.count('\n') + 1
+    payload = BundleBuilder()
+    payload.add(bundle)
+    payload.add_bundle(driver, spec_offsets)
+    full_payload, spec_mappings = payload.build()
+    for mapping in spec_mappings:
+        mapping["file"] = str(mapping["file"])
     
-    for offset_info in spec_offsets:
-        abs_start = bundle_lines + offset_info["start"]
-        abs_end = bundle_lines + offset_info["end"]
-        local_source_map.append({
-            "file": str(offset_info["file"]),
-            "start": abs_start,
-            "end": abs_end,
-            "original_start": offset_info["original_start"]
-        })
-        
-    # console.print(f" * Running: {len(files)} test file(s) in batch mode ...")
+    local_source_map = get_source_map_index(source_map).extended(spec_mappings)
+    return full_payload, local_source_map
+
+
+def _parse_batch_task(data, files, local_source_map, config, verbose, elapsed):
+    """Turn a finished batch task (COMPLETE, FAILED or CANCELLED) into a run output"""
+    if data.get("state") == "FAILED":
+        resolved_msg = resolve_source_map(data.get('error', {}).get('message'), local_source_map, verbose)
+        return {"success": False, "results": [], "duration": elapsed, "error": resolved_msg}
+    if data.get("state") == "CANCELLED":
+        return {"success": False, "results": [], "duration": elapsed, "error": CANCELLED_MESSAGE}
+    
+    output = data.get("output", {}).get("results", [{}])[0] or data.get("returnValue", {})
+    
+    failure_count = output.get("failureCount", 0)
+    has_suite_failure = failure_count > 0
+    
+    if not config.get("json") and "logs" in data and verbose:
+        print("\n[LOGS]")
+        for l in data["logs"]:
+            if not is_progress_line(l['message']):
+                print(f"  > {resolve_source_map(l['message'], local_source_map, verbose=True)}")
+
+    test_results = []
+    if "results" in output and output["results"]:
+        for r in output["results"]:
+            test_results.append(_convert_result(r, local_source_map))
+    else:
+        if output.get("status") == "FAILED" or has_suite_failure:
+             fails = output.get("failures", [])
+             msg = "; ".join(fails) if fails else "Unknown Batch Logic Error"
+             test_results.append({
+                 "name": "Batch Suite",
+                 "status": "FAILED",
+                 "error": msg,
+                 "traceback": ""
+             })
+
+    success = not (output.get("status") in ("FAILED", "Failure") or has_suite_failure)
+    
+    # The driver tags every result with its spec
+    failed_specs = _failed_specs(test_results, files)
+    files_failed_count = sum(1 for f in files if f.stem in failed_specs)
+    
+    return {
+        "success": success, 
+        "results": test_results, 
+        "describes": _describe_timings(output),
+        "duration": elapsed,
+        "files_failed": files_failed_count,
+        "files_passed": len(files) - files_failed_count,
+        "failed_specs": sorted(failed_specs)
+    }
+
+
+def _salvage_batch(result, stream, files, local_source_map, name, error):
+    """Fill a timed-out or failed batch output with the results that did finish"""
+    result["results"] = _salvage(stream, local_source_map, name, error)
+    failed_specs = _failed_specs(result["results"], files, partial=True)
+    result["failed_specs"] = sorted(failed_specs)
+    result["files_failed"] = sum(1 for f in files if f.stem in failed_specs)
+    result["files_passed"] = len(files) - result["files_failed"]
+    result["partial"] = True
+
+
+async def run_tests_batch_async(files, bundle, tests_dir, config, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None, on_result=None):
+    """
+    Execute all test files in a single Roblox Cloud request (coroutine).
+    `on_result` is called with each test case as soon as the test finishes.
+    """
+    # Silent start - spinner handles status
+    start_time = time.time()
+    tracing.set_lane("batch task")
+    
+    with tracing.span("driver", specs=len(files)):
+        full_payload, local_source_map = _prepare_batch(files, bundle, tests_dir, source_map)
+    
+    result_cache = get_result_cache(config)
+    cache_key = payload_key(full_payload, config, "batch") if result_cache else None
+    with tracing.span("result cache") as info:
+        cached = result_cache.get(cache_key) if result_cache else None
+        info["hit"] = cached is not None
+    if cached is not None:
+        return _from_cache(cached, start_time)
+    
+    timing_key = duration_key(files, "batch")
+    policy = PollPolicy.from_config(config, expected=load_expected_duration(timing_key))
     
     try:
-        resp = requests.post(
-            api_url,
-            headers={"x-api-key": api_key, "Content-Type": "application/json"},
-            json={"script": full_payload}
-        )
-        resp.raise_for_status()
-        task = resp.json()
-        task_id = task.get("path")
+        task_id = await engine.submit_task(config, full_payload)
+        stream = _stream_for(config, task_id, local_source_map, on_result)
         
-        elapsed = 0
-        while True:
-            time.sleep(1)
-            elapsed = time.time() - start_time
-            
-            if elapsed > timeout:
-                if not config.get("json"):
-                    console.print(f"\n[red][TIMEOUT][/red] Batch exceeded {elapsed:.1f}s (limit: {timeout}s)")
-                return {"success": False, "results": [], "duration": elapsed, "error": "Timeout"}
-            
-            if not config.get("json"):
-                pass
-                
-            try:
-                status_resp = requests.get(
-                    f"https://apis.roblox.com/cloud/v2/{task_id}",
-                    headers={"x-api-key": api_key}
+        try:
+            with tracing.span("wait", task=task_id):
+                data = await engine.wait_for_task(
+                    config, task_id, start_time, timeout, policy,
+                    on_poll=stream.poll if on_result else None
                 )
-                status_resp.raise_for_status()
-                data = status_resp.json()
-                state = data.get("state")
-            except Exception as e:
-                return {"success": False, "results": [], "duration": elapsed, "error": str(e)}
-            
-            if state == "COMPLETE":
-                elapsed = time.time() - start_time
-                output = data.get("output", {}).get("results", [{}])[0] or data.get("returnValue", {})
-                
-                failure_count = output.get("failureCount", 0)
-                has_suite_failure = failure_count > 0
-                
-                if not config.get("json") and "logs" in data and verbose:
-                    print("\n[LOGS]")
-                    for l in data["logs"]:
-                         print(f"  > {resolve_source_map(l['message'], local_source_map, verbose=True)}")
-
-                test_results = []
-                if "results" in output and output["results"]:
-                    for r in output["results"]:
-                        name = r.get("name", "Unknown")
-                        res_status = r.get("status", "Unknown")
-                        status_map = {"Success": "PASSED", "Failure": "FAILED", "Skipped": "SKIPPED"}
-                        final_status = status_map.get(res_status, res_status.upper())
-                        
-                        error_msg = ""
-                        traceback = ""
-                        if res_status == "Failure" and "errors" in r:
-                            raw_errors = r["errors"]
-                            if raw_errors:
-                                resolved_e = resolve_source_map(raw_errors[0], local_source_map, verbose=False)
-                                parts = resolved_e.split("\n  Traceback:\n")
-                                error_msg = parts[0]
-                                # Clean up redundant file path
-                                error_msg = re.sub(r"^.*?\.spec\.luau:\d+:\s*", "", error_msg)
-                                error_msg = re.sub(r"^Error:\s*", "", error_msg)
-                                if len(parts) > 1:
-                                    traceback = parts[1].replace("  at ", "").strip()
-                        
-                        test_results.append({
-                            "name": name,
-                            "status": final_status,
-                            "error": error_msg,
-                            "traceback": traceback
-                        })
-                else:
-                    if output.get("status") == "FAILED" or has_suite_failure:
-                         fails = output.get("failures", [])
-                         msg = "; ".join(fails) if fails else "Unknown Batch Logic Error"
-                         test_results.append({
-                             "name": "Batch Suite",
-                             "status": "FAILED",
-                             "error": msg,
-                             "traceback": ""
-                         })
-
-                success = not (output.get("status") in ("FAILED", "Failure") or has_suite_failure)
-                
-                # Since we can't reliably match test names to files, 
-                # count files based on test results:
-                # - If there are any FAILED tests, count as 1 file failed
-                # - If there are any PASSED tests (and none failed), count as 1 file passed  
-                # This is a simplification since batch mode combines all tests
-                has_passing = any(r.get("status") == "PASSED" for r in test_results)
-                has_failing = any(r.get("status") == "FAILED" for r in test_results)
-                
-                # For accurate file counts, we'd need TestEZ to report file source
-                # For now, estimate: if we have mixed results, assume some files pass and some fail
-                if has_failing and has_passing:
-                    # Mixed results - can't determine exact file ownership, make best guess
-                    # Use ratio of passed/failed tests to estimate file status
-                    failed_tests = sum(1 for r in test_results if r.get("status") == "FAILED")
-                    passed_tests = sum(1 for r in test_results if r.get("status") == "PASSED")
-                    total_tests = failed_tests + passed_tests
-                    
-                    # Rough estimate: files_failed = ceil(files * failed_ratio)
-                    if total_tests > 0:
-                        fail_ratio = failed_tests / total_tests
-                        estimated_failed = max(1, int(len(files) * fail_ratio + 0.5))
-                        files_failed_count = min(estimated_failed, len(files) - 1)
-                        files_passed_count = len(files) - files_failed_count
-                    else:
-                        files_failed_count = 0
-                        files_passed_count = len(files)
-                elif has_failing:
-                    files_failed_count = len(files)
-                    files_passed_count = 0
-                else:
-                    files_failed_count = 0
-                    files_passed_count = len(files)
-                
-                return {
-                    "success": success, 
-                    "results": test_results, 
-                    "duration": elapsed,
-                    "files_failed": files_failed_count,
-                    "files_passed": files_passed_count
-                }
-                
-            elif state == "FAILED":
-                elapsed = time.time() - start_time
-                resolved_msg = resolve_source_map(data.get('error', {}).get('message'), local_source_map, verbose)
-                return {"success": False, "results": [], "duration": elapsed, "error": resolved_msg}
+        except engine.TaskTimeout as e:
+            if not config.get("json"):
+                console.print(f"\n[red][TIMEOUT][/red] Batch exceeded {e.elapsed:.1f}s (limit: {timeout}s)")
+            result = {"success": False, "results": [], "duration": e.elapsed, "error": "Timeout", "polls": policy.polls}
+            await engine.cancel_task(config, task_id, "timeout")
+            await stream.poll()
+            if stream.finished or stream.running:
+                _salvage_batch(result, stream, files, local_source_map,
+                               "Batch Timeout", f"Still running when the batch timed out after {e.elapsed:.1f}s")
+            return result
+        except asyncio.CancelledError:
+            # Nobody is waiting for this result any more (Ctrl-C, superseded run)
+            await engine.cancel_task(config, task_id, "cancelled")
+            raise
+        except requests.exceptions.RequestException as e:
+            # Nobody will read this task's result; don't leave it running
+            await engine.cancel_task(config, task_id, "error")
+            return {"success": False, "results": [], "duration": time.time() - start_time, "error": str(e), "polls": policy.polls}
+        
+        elapsed = time.time() - start_time
+        if data.get("state") == "COMPLETE":
+            record_duration(timing_key, elapsed)
+        with tracing.span("parse results"):
+            result = _parse_batch_task(data, files, local_source_map, config, verbose, elapsed)
+        if data.get("state") in ("FAILED", "CANCELLED"):
+            await stream.poll()
+            if stream.finished or stream.running:
+                _salvage_batch(result, stream, files, local_source_map, "Execution Error", result["error"])
+        result["polls"] = policy.polls
+        if result_cache and _is_cacheable(result):
+            result_cache.put(cache_key, result)
+        return result
 
     except Exception as e:
         return {"success": False, "results": [], "duration": 0, "error": str(e)}
 
 
-def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batch_mode=False):
-    """Execute a test suite (sequential or batch mode)"""
-    import sys
-    
+def run_tests_batch(files, bundle, tests_dir, config, timeout=DEFAULT_TIMEOUT, verbose=False, source_map=None, on_result=None):
+    """Execute all test files in a single Roblox Cloud request (batch mode)"""
+    return engine.run_sync(run_tests_batch_async(files, bundle, tests_dir, config, timeout, verbose, source_map, on_result))
+
+
+def select_test_files(args, files, tests_dir):
+    """
+    Apply --failed and the test name filter to the discovered spec files.
+    Returns: (selected_files, None) or (None, exit_code) when there is nothing to run.
+    """
     RESULTS_FILE = tests_dir / ".test-results"
 
     if hasattr(args, 'failed') and args.failed:
@@ -435,7 +640,7 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
                 
                 if not failed_specs:
                     console.print("[green][INFO][/green] No failed tests from last run.")
-                    return 0
+                    return None, 0
                 
                 original_count = len(files)
                 files = [f for f in files if f.stem in failed_specs]
@@ -443,7 +648,7 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
                 
                 if not files:
                     console.print("[yellow][WARN][/yellow] Failed tests from last run no longer exist.")
-                    return 0
+                    return None, 0
             except Exception as e:
                 console.print(f"[yellow][WARN][/yellow] Could not load previous results: {e}")
         else:
@@ -461,13 +666,69 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
             files = [found]
         else:
             console.print(f"[red][ERROR][/red] No test found matching '{args.test}'")
-            return 1
+            return None, 1
+    
+    return files, None
+
+
+def print_cancelled(cancelled):
+    """List the remote tasks that were cancelled, if any"""
+    if not cancelled:
+        return
+    console.print(f"[yellow]Cancelled:[/yellow]   {len(cancelled)} task(s)")
+    for task_path, reason in cancelled:
+        console.print(f"  [dim]{task_path} ({reason})[/dim]")
+
+
+def print_test_case(r):
+    """Print one test case: PASS/FAIL/SKIP line, then any error and traceback"""
+    name = r["name"]
+    status = r["status"]
+    if status == "PASSED":
+        # PASS  test_name
+        console.print(f"[bold green]PASS[/bold green]  {name}")
+    elif status == "FAILED":
+        # FAIL  test_name
+        console.print(f"[bold red]FAIL[/bold red]  {name}")
+        if r["error"]:
+            # Indented error without bullets
+            console.print(f"      {r['error']}")
+        if r.get("traceback"):
+            # Indented traceback, simplified
+            for line in r["traceback"].split("\n"):
+                if line.strip():
+                    clean_line = line.strip()
+                    # Format nicely if possible, or just print dim
+                    if not clean_line.startswith("at "):
+                         console.print(f"      [dim]at {clean_line}[/dim]")
+                    else:
+                         console.print(f"      [dim]{clean_line}[/dim]")
+    else:
+        console.print(f"[bold yellow]SKIP[/bold yellow]  {name}")
+
+
+def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batch_mode=False, preselected=False):
+    """
+    Execute a test suite (sequential or batch mode).
+    Pass preselected=True when `files` already went through select_test_files.
+    """
+    RESULTS_FILE = tests_dir / ".test-results"
+
+    if not preselected:
+        files, exit_code = select_test_files(args, files, tests_dir)
+        if files is None:
+            return exit_code
     
     passed_count = 0
     failed_count = 0
     start_time = time.time()
     all_test_cases = []
     failed_files_set = set()
+    all_describes = []
+    streamed = []  # Test cases printed live while a batch ran
+    total_polls = 0
+    cached_runs = 0
+    slowest_count = getattr(args, "slowest", None)
     
     config["json"] = args.json
     to = args.timeout or config.get("timeout") or DEFAULT_TIMEOUT
@@ -477,13 +738,24 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
         if len(files) > 5:
             to = max(to, 30)
         
+        def on_result(r):
+            if not streamed:
+                console.print()
+            streamed.append(r)
+            print_test_case(r)
+        
         run_output = run_tests_batch(
             files, bundle, tests_dir, config,
             timeout=to,
             verbose=args.verbose,
-            source_map=source_map
+            source_map=source_map,
+            on_result=None if args.json else on_result
         )
         
+        total_polls += run_output.get("polls", 0)
+        cached_runs += 1 if run_output.get("cached") else 0
+        all_describes.extend(run_output.get("describes", []))
+        
         if run_output.get("error"):
             if not args.json:
                 console.print(f"\n[red][ERROR][/red] {run_output['error']}")
@@ -494,17 +766,34 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
                 passed_count += 1
             elif r["status"] == "FAILED":
                 failed_count += 1
-                for f in files:
-                    failed_files_set.add(f.stem)
+        
+        if "failed_specs" in run_output:
+            failed_files_set.update(run_output["failed_specs"])
+        elif not run_output["success"]:
+            # The task itself failed; no spec can be cleared
+            failed_files_set.update(f.stem for f in files)
     else:
-        # Sequential execution (original behavior)
-        for f in files:
-            run_output = run_test(
-                f, bundle, tests_dir, config, 
-                timeout=to, 
+        jobs = getattr(args, "jobs", None) or 1
+        if jobs > 1 and len(files) > 1:
+            # Concurrent per-file execution, results in completion order
+            outputs = run_tests_concurrent(
+                files, bundle, tests_dir, config,
+                jobs=jobs,
+                timeout=to,
                 verbose=args.verbose,
                 source_map=source_map
             )
+        else:
+            # Sequential execution (original behavior)
+            outputs = (
+                (f, run_test(f, bundle, tests_dir, config, timeout=to, verbose=args.verbose, source_map=source_map))
+                for f in files
+            )
+        
+        for f, run_output in outputs:
+            total_polls += run_output.get("polls", 0)
+            cached_runs += 1 if run_output.get("cached") else 0
+            all_describes.extend(run_output.get("describes", []))
             
             if not run_output["success"]:
                 failed_files_set.add(f.stem)
@@ -514,24 +803,7 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
                  # Minimalist printing for sequential mode
                  if not args.json:
                      for r in run_output["results"]:
-                         name = r["name"]
-                         status = r["status"]
-                         if status == "PASSED":
-                             console.print(f"[bold green]PASS[/bold green]  {name}")
-                         elif status == "FAILED":
-                             console.print(f"[bold red]FAIL[/bold red]  {name}")
-                             if r["error"]:
-                                 console.print(f"      {r['error']}")
-                             if r.get("traceback"):
-                                 for line in r["traceback"].split("\n"):
-                                     if line.strip():
-                                         clean_line = line.strip()
-                                         if not clean_line.startswith("at "):
-                                              console.print(f"      [dim]at {clean_line}[/dim]")
-                                         else:
-                                              console.print(f"      [dim]{clean_line}[/dim]")
-                         else:
-                             console.print(f"[bold yellow]SKIP[/bold yellow]  {name}")
+                         print_test_case(r)
             
             for t in run_output["results"]:
                 if t["status"] == "PASSED":
@@ -576,39 +848,26 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
                 "passed": passed_count,
                 "failed": failed_count,
                 "total": total,
-                "duration": round(total_time, 2)
+                "duration": round(total_time, 2),
+                "polls": total_polls,
+                "cached": cached_runs,
+                "cancelled": [path for path, _ in engine.cancelled_tasks()]
             },
             "tests": all_test_cases
         }
+        if slowest_count:
+            output["slowest"] = {
+                "tests": slowest(all_test_cases, slowest_count),
+                "describes": slowest(all_describes, slowest_count)
+            }
         print(json.dumps(output, indent=2))
     else:
         if batch_mode and len(files) > 1:
-            console.print()
-            for r in all_test_cases:
-                name = r["name"]
-                status = r["status"]
-                if status == "PASSED":
-                    # PASS  test_name
-                    console.print(f"[bold green]PASS[/bold green]  {name}")
-                elif status == "FAILED":
-                    # FAIL  test_name
-                    console.print(f"[bold red]FAIL[/bold red]  {name}")
-                    if r["error"]:
-                        # Indented error without bullets
-                        console.print(f"      {r['error']}")
-                    if r.get("traceback"):
-                        # Indented traceback, simplified
-                        # console.print() # Compact
-                        for line in r["traceback"].split("\n"):
-                            if line.strip():
-                                clean_line = line.strip()
-                                # Format nicely if possible, or just print dim
-                                if not clean_line.startswith("at "):
-                                     console.print(f"      [dim]at {clean_line}[/dim]")
-                                else:
-                                     console.print(f"      [dim]{clean_line}[/dim]")
-                else:
-                    console.print(f"[bold yellow]SKIP[/bold yellow]  {name}")
+            if not streamed:
+                console.print()
+            # Tests streamed while the batch ran were already printed
+            for r in all_test_cases[len(streamed):]:
+                print_test_case(r)
             
             console.print()
             console.print("-" * 60, style="dim")
@@ -633,6 +892,8 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
             console.print(f"Tests:       {', '.join(parts)}")
             
             console.print(f"Time:        {total_time:.2f}s")
+            if cached_runs:
+                console.print(f"[dim]Cached:      {cached_runs} run(s) served from the result cache[/dim]")
         else:
             console.print()
             console.print("-" * 60, style="dim")
@@ -645,5 +906,12 @@ def run_test_suite(args, files, bundle, tests_dir, config, source_map=None, batc
             console.print(f"Tests:       {', '.join(parts)}")
             
             console.print(f"Time:        {total_time:.2f}s")
+            if cached_runs:
+                console.print(f"[dim]Cached:      {cached_runs} run(s) served from the result cache[/dim]")
+        
+        print_cancelled(engine.cancelled_tasks())
+        
+        if slowest_count:
+            print_slowest(all_test_cases, all_describes, slowest_count)
     
     return 1 if failed_count > 0 else 0
@@ -0,0 +1,59 @@
+"""
+Aether - Run statistics
+
+Lightweight counters used to report cache hits, polls and other
+per-run numbers in verbose output.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from .ui import console
+
+counters = Counter()
+
+# Per-thread redirection of incr() set up by collect()
+_local = threading.local()
+
+
+def incr(name, amount=1):
+    """Increment a named counter"""
+    target = getattr(_local, "counters", None)
+    if target is None:
+        target = counters
+    target[name] += amount
+
+
+@contextmanager
+def collect():
+    """
+    Count this thread's increments in a separate Counter instead of the
+    shared one, e.g. to bundle the next run while the current one is still
+    counting. Yields the Counter.
+    """
+    previous = getattr(_local, "counters", None)
+    _local.counters = Counter()
+    try:
+        yield _local.counters
+    finally:
+        _local.counters = previous
+
+
+def get(name):
+    """Get the current value of a counter"""
+    return counters[name]
+
+
+def reset():
+    """Reset all counters (called at the start of every run)"""
+    counters.clear()
+
+
+def print_stats():
+    """Print all non-zero counters (verbose output)"""
+    if not counters:
+        return
+    console.print()
+    console.print("[dim]Stats:[/dim]")
+    for name in sorted(counters):
+        console.print(f"[dim]  {name}: {counters[name]}[/dim]")
@@ -0,0 +1,185 @@
+"""
+Aether - Phase tracing
+
+Lightweight spans for the phases of a run (config, sourcemap, bundling,
+drivers, submit, queue wait, execution, polling, result parsing), written
+as a Chrome trace with --trace (open it in chrome://tracing or Perfetto).
+
+Spans are recorded on lanes, shown as rows in the trace viewer. The lane
+defaults to the current thread; each remote task's coroutine sets its own
+lane (set_lane) so concurrent tasks sharing an event loop get a row each.
+Queue and execution spans are derived from the task states seen while
+polling, so their boundaries are only as precise as the poll interval.
+
+Tracing is off (every span a no-op) until enable() is called.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from . import __version__
+
+_enabled = False
+_lock = threading.Lock()
+_origin = time.perf_counter()
+_events = []  # Chrome trace events
+_lanes = {}  # {lane name: tid}
+_tasks = {}  # {task_path: {"lane", "state", "since"}} for tasks still being polled
+_lane = contextvars.ContextVar("aether_trace_lane", default=None)
+
+# Task states reported by Open Cloud, as span names
+STATE_SPANS = {"QUEUED": "queued", "PROCESSING": "executing"}
+TERMINAL_STATES = ("COMPLETE", "FAILED", "CANCELLED")
+
+
+def enable():
+    """Start recording (clears anything recorded before)"""
+    global _enabled, _origin
+    with _lock:
+        _enabled = True
+        _origin = time.perf_counter()
+        _events.clear()
+        _lanes.clear()
+        _tasks.clear()
+
+
+def set_lane(name):
+    """Record this context's spans (e.g. one remote task's coroutine) on their own row"""
+    if _enabled:
+        _lane.set(name)
+
+
+def _now():
+    return time.perf_counter()
+
+
+def _tid(lane):
+    if lane not in _lanes:
+        _lanes[lane] = len(_lanes) + 1
+    return _lanes[lane]
+
+
+def _record(name, category, start, end, args=None, lane=None):
+    with _lock:
+        _events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - _origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": _tid(lane or _lane.get() or threading.current_thread().name),
+            "args": args or {},
+        })
+
+
+def _record_async(name, category, start, end, task_path, args, lane):
+    """
+    A task state span. These are async events (their own track per task) as
+    they are derived from polls and need not nest inside the poll spans.
+    """
+    common = {"name": name, "cat": category, "id": task_path, "pid": os.getpid()}
+    with _lock:
+        tid = _tid(lane)
+        _events.append(dict(common, ph="b", ts=(start - _origin) * 1e6, tid=tid, args=args))
+        _events.append(dict(common, ph="e", ts=(end - _origin) * 1e6, tid=tid))
+
+
+def _instant(name, category, at, args=None, lane=None):
+    with _lock:
+        _events.append({
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": (at - _origin) * 1e6,
+            "pid": os.getpid(),
+            "tid": _tid(lane or _lane.get() or threading.current_thread().name),
+            "args": args or {},
+        })
+
+
+@contextmanager
+def span(name, category="phase", **args):
+    """
+    Time the enclosed block as one span. Yields the span's args dict so
+    the block can attach details (e.g. where a sourcemap came from).
+    """
+    if not _enabled:
+        yield {}
+        return
+    start = _now()
+    try:
+        yield args
+    finally:
+        _record(name, category, start, _now(), args)
+
+
+def task_submitted(task_path):
+    """A remote task was created; it counts as queued until a poll says otherwise"""
+    if not _enabled:
+        return
+    lane = _lane.get() or threading.current_thread().name
+    with _lock:
+        _tasks[task_path] = {"lane": lane, "state": "QUEUED", "since": _now()}
+
+
+def task_state(task_path, state):
+    """
+    A poll observed `state`. Closes the span of the previous state when it
+    changed, and the last one when the task finished.
+    """
+    if not _enabled:
+        return
+    now = _now()
+    with _lock:
+        task = _tasks.get(task_path)
+    if task is None or state == task["state"]:
+        return
+    _record_async(
+        STATE_SPANS.get(task["state"], task["state"].lower()), "task", task["since"], now,
+        task_path, {"observed_by": "poll"}, task["lane"]
+    )
+    if state in TERMINAL_STATES:
+        _instant(state.lower(), "task", now, {"task": task_path}, lane=task["lane"])
+        with _lock:
+            _tasks.pop(task_path, None)
+    else:
+        task["state"], task["since"] = state, now
+
+
+def task_ended(task_path, reason):
+    """The task stopped being polled without finishing (timeout, cancelled)"""
+    if not _enabled:
+        return
+    with _lock:
+        task = _tasks.pop(task_path, None)
+    if task is None:
+        return
+    now = _now()
+    _record_async(
+        STATE_SPANS.get(task["state"], task["state"].lower()), "task", task["since"], now,
+        task_path, {"observed_by": "poll", "ended": reason}, task["lane"]
+    )
+    _instant(reason, "task", now, {"task": task_path}, lane=task["lane"])
+
+
+def write(path):
+    """Write everything recorded so far as a Chrome trace JSON file"""
+    with _lock:
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "aether"}}]
+        metadata += [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": lane}}
+            for lane, tid in _lanes.items()
+        ]
+        trace = {
+            "traceEvents": metadata + sorted(_events, key=lambda e: e["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"aether_version": __version__},
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f)
@@ -3,8 +3,7 @@ Aether - Professional CLI UI using Rich
 """
 import os
 import sys
-import time
-import threading
+import asyncio
 from pathlib import Path
 
 from rich.console import Console
@@ -24,10 +23,6 @@ class Dashboard:
         self.version = version
         self.workspace = os.getcwd()
         self.rojo_project = "default.project.json"
-        self._spinner_thread = None
-        self._spinner_running = False
-        self._current_file = None
-        self._progress = 0
         
     def clear(self):
         """Clear the terminal screen"""
@@ -40,42 +35,21 @@ class Dashboard:
         # console.print(f"Rojo Project: {self.rojo_project}") # Removing to reduce noise
         console.print()
             
-    def _spinner_loop(self):
-        """Animate spinner while waiting for cloud response"""
-        frame_idx = 0
-        while self._spinner_running:
-            frame = SPINNER_FRAMES[frame_idx % len(SPINNER_FRAMES)]
-            
-            # Use dim text for progress
-            status = f"\r{frame} Running tests... {int(self._progress)}%"
-            # Simple output, no fancy bar to keep it minimal as requested? 
-            # User example: "Running: tests/raycast.spec.luau ..."
-            # But they also asked for "Muted" style.
-            # Let's keep it simple.
-            
-            print(f"\r{status}".ljust(80), end="", flush=True)
-            
-            frame_idx += 1
-            time.sleep(0.08)
-            
-            # Simulate progress 
-            if self._progress < 90:
-                self._progress += 0.5
-                
-    def start_spinner(self, filename):
-        """Start the spinner animation"""
-        self._current_file = filename
-        self._progress = 0
-        self._spinner_running = True
-        self._spinner_thread = threading.Thread(target=self._spinner_loop, daemon=True)
-        self._spinner_thread.start()
+    def clear_line(self):
+        """Erase the spinner line so regular output can be printed"""
+        print("\r" + " " * 80 + "\r", end="")
         
-    def stop_spinner(self):
-        """Stop the spinner animation"""
-        self._spinner_running = False
-        if self._spinner_thread:
-            self._spinner_thread.join(timeout=0.5)
-        print("\r" + " " * 80 + "\r", end="")  # Clear the line
+    async def spin(self, label="Running tests..."):
+        """Animate the spinner as a coroutine until cancelled (shares the caller's event loop)"""
+        frame_idx = 0
+        try:
+            while True:
+                frame = SPINNER_FRAMES[frame_idx % len(SPINNER_FRAMES)]
+                print(f"\r{frame} {label}".ljust(80), end="", flush=True)
+                frame_idx += 1
+                await asyncio.sleep(0.08)
+        finally:
+            self.clear_line()
         
     def print_running(self, filename):
         """Print the running status"""
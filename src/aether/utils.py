@@ -1,6 +1,7 @@
 """
 Aether - Configuration and utilities
 """
+import os
 from pathlib import Path
 
 
@@ -17,3 +18,11 @@ def get_project_paths():
         "packages": root / "Packages",
         "tests": root / "tests"
     }
+
+
+def get_cache_dir():
+    """Get the directory used for persistent caches (override with AETHER_CACHE_DIR)"""
+    override = os.environ.get("AETHER_CACHE_DIR")
+    if override:
+        return Path(override)
+    return Path.home() / ".cache" / "aether"
@@ -0,0 +1,51 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _module(name):
+    return {"name": name, "className": "ModuleScript", "filePaths": [f"src/shared/{name}.luau"]}
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    Factory for a small project under tmp_path: modules Shared.Util and
+    Shared.Other (in a sourcemap.json too), tests/_helpers.luau and specs.
+    `specs` maps spec names to sources; by default spec a requires only
+    _helpers and spec b requires Other.
+    """
+    def make(helpers="return {}\n", specs=None):
+        if specs is None:
+            specs = {
+                "a": "local helpers = require(script.Parent._helpers)\nreturn function() end\n",
+                "b": 'local Other = require(game:GetService("ReplicatedStorage").Shared.Other)\n'
+                     "return function() end\n",
+            }
+        util = write(tmp_path / "src" / "shared" / "Util.luau", "return {}\n")
+        other = write(tmp_path / "src" / "shared" / "Other.luau", "return {}\n")
+        tests = tmp_path / "tests"
+        write(tests / "_helpers.luau", helpers)
+        spec_paths = [write(tests / f"{name}.spec.luau", source) for name, source in specs.items()]
+        write(tmp_path / "sourcemap.json", json.dumps({"name": "Game", "className": "DataModel", "children": [
+            {"name": "ReplicatedStorage", "className": "ReplicatedStorage", "children": [
+                {"name": "Shared", "className": "Folder", "children": [_module("Util"), _module("Other")]},
+            ]},
+        ]}))
+        return SimpleNamespace(
+            root=tmp_path, util=util, other=other, tests=tests, helpers=tests / "_helpers.luau",
+            specs=spec_paths,
+            instance_map={
+                str(util): ("ReplicatedStorage", "Shared", "Util"),
+                str(other): ("ReplicatedStorage", "Shared", "Other"),
+            },
+        )
+
+    return make
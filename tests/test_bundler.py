@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from aether import stats
+from aether.bundler import bundle_scripts
+from aether.utils import get_project_paths
+
+
+@pytest.fixture
+def bundled_modules(project, monkeypatch):
+    """Bundle a project with one spec through its sourcemap.json; returns the bundled module names"""
+    def bundle(spec_source, config=None):
+        p = project(specs={"a": spec_source})
+        monkeypatch.chdir(p.root)
+        monkeypatch.setenv("AETHER_CACHE_DIR", str(p.root / "cache"))
+        stats.reset()
+        _, source_map = bundle_scripts(get_project_paths(), config or {}, specs=p.specs)
+        return sorted(Path(m["file"]).stem for m in source_map)
+
+    return bundle
+
+
+REQUIRES_UTIL = 'local Util = require(game:GetService("ReplicatedStorage").Shared.Util)\nreturn function() end\n'
+
+
+def test_tree_shake_drops_modules_no_spec_requires(bundled_modules):
+    assert bundled_modules(REQUIRES_UTIL) == ["Util"]
+    assert stats.get("bundle.tree_shake.dropped") == 1
+
+
+def test_tree_shake_falls_back_to_everything_on_dynamic_require(bundled_modules):
+    spec = 'local name = "Util"\nlocal Util = require(script.Parent[name])\nreturn function() end\n'
+    assert bundled_modules(spec) == ["Other", "Util"]
+    assert stats.get("bundle.tree_shake.fallbacks") == 1
+
+
+def test_tree_shake_falls_back_to_everything_on_unknown_instance(bundled_modules):
+    spec = 'local Gone = require(game:GetService("ReplicatedStorage").Shared.Gone)\nreturn function() end\n'
+    assert bundled_modules(spec) == ["Other", "Util"]
+    assert stats.get("bundle.tree_shake.fallbacks") == 1
+
+
+def test_tree_shake_can_be_disabled(bundled_modules):
+    assert bundled_modules(REQUIRES_UTIL, {"tree_shake": False}) == ["Other", "Util"]
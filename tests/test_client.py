@@ -0,0 +1,65 @@
+import socket
+import threading
+
+import pytest
+import requests
+
+from aether.client import CloudClient
+
+
+@pytest.fixture
+def dropping_server():
+    """A server that reads each request and closes the connection without answering"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    received = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            received.append(conn.recv(65536))
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}", received
+    server.close()
+
+
+def client():
+    return CloudClient(connect_timeout=1.0, read_timeout=1.0, max_retries=2, backoff=0.01)
+
+
+def test_post_is_not_retried_once_the_request_was_sent(dropping_server):
+    url, received = dropping_server
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client().post(url, json={"script": "return 1"})
+    assert len(received) == 1
+
+
+def test_get_is_retried_after_the_connection_drops(dropping_server):
+    url, received = dropping_server
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client().get(url)
+    assert len(received) == 3
+
+
+def test_post_is_retried_when_the_connection_is_refused():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # Nothing listens here once closed
+    c = client()
+    attempts = []
+    send = c.session.request
+
+    def counting_request(*args, **kwargs):
+        attempts.append(args)
+        return send(*args, **kwargs)
+
+    c.session.request = counting_request
+    with pytest.raises(requests.exceptions.ConnectionError):
+        c.post(f"http://127.0.0.1:{port}/", json={})
+    assert len(attempts) == 3
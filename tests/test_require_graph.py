@@ -0,0 +1,135 @@
+from aether.require_graph import ImpactIndex, parse_dependencies, reachable_files, spec_entry_points
+
+
+HELPERS_REQUIRING_UTIL = 'local RS = game:GetService("ReplicatedStorage")\nreturn require(RS.Shared.Util)\n'
+
+
+def test_module_reached_through_helpers_impacts_every_spec(project):
+    p = project(HELPERS_REQUIRING_UTIL)
+    index = ImpactIndex()
+    index.rebuild(p.specs, p.tests, p.instance_map)
+
+    assert index.impacted_specs([str(p.util)]) == sorted(p.specs, key=str)
+    assert index.impacted_specs([str(p.other)]) == [p.specs[1]]
+
+
+def test_helpers_closure_follows_helpers_edits(project):
+    p = project()
+    index = ImpactIndex()
+    index.rebuild(p.specs, p.tests, p.instance_map)
+    assert index.impacted_specs([str(p.util)]) == []
+
+    p.helpers.write_text(HELPERS_REQUIRING_UTIL, encoding="utf-8")
+    index.update([str(p.helpers)], p.specs, p.tests, p.instance_map)
+    assert index.impacted_specs([str(p.util)]) == sorted(p.specs, key=str)
+
+
+def test_dynamic_require_in_helpers_impacts_every_spec(project):
+    p = project("return require(someModule)\n")
+    index = ImpactIndex()
+    index.rebuild(p.specs, p.tests, p.instance_map)
+
+    assert index.impacted_specs([str(p.other)]) == sorted(p.specs, key=str)
+
+
+SCRIPT = ("ReplicatedStorage", "Shared", "Feature", "Init")
+
+
+def resolved(source, script_path=SCRIPT):
+    return [target for target, _ in parse_dependencies(source, script_path)]
+
+
+def test_parses_script_parent_chains():
+    source = """
+        local Sibling = require(script.Parent.Sibling)
+        local Up = require(script.Parent.Parent.Util)
+        local Child = require(script.Child)
+    """
+    assert resolved(source) == [
+        ("ReplicatedStorage", "Shared", "Feature", "Sibling"),
+        ("ReplicatedStorage", "Shared", "Util"),
+        ("ReplicatedStorage", "Shared", "Feature", "Init", "Child"),
+    ]
+
+
+def test_parses_get_service_and_aliases():
+    source = """
+        local ReplicatedStorage = game:GetService("ReplicatedStorage")
+        local Shared = ReplicatedStorage.Shared
+        local A = require(game:GetService('ServerScriptService').Server.A)
+        local B = require(Shared.B)
+        local C = require(ReplicatedStorage["Packages"].C)
+    """
+    assert resolved(source) == [
+        ("ServerScriptService", "Server", "A"),
+        ("ReplicatedStorage", "Shared", "B"),
+        ("ReplicatedStorage", "Packages", "C"),
+    ]
+
+
+def test_parses_wait_for_child_and_find_first_child():
+    source = """
+        local Packages = game:GetService("ReplicatedStorage"):WaitForChild("Packages", 5)
+        local Promise = require(Packages:WaitForChild("Promise"))
+        local Signal = require(script.Parent:FindFirstChild("Signal"))
+    """
+    assert resolved(source) == [
+        ("ReplicatedStorage", "Packages", "Promise"),
+        ("ReplicatedStorage", "Shared", "Feature", "Signal"),
+    ]
+
+
+def test_ignores_commented_requires_and_marks_dynamic_ones():
+    source = """
+        -- require(script.Parent.Commented)
+        --[[ require(script.Parent.Block) ]]
+        local name = "Thing"
+        local A = require(script.Parent[name])
+        local B = require(modules.B)
+        local C = require("./C")
+    """
+    assert resolved(source) == [None, None, None]
+
+
+def test_rebound_alias_is_ambiguous():
+    source = """
+        local Folder = script.Parent.A
+        local Folder = script.Parent.B
+        return require(Folder.Module)
+    """
+    assert resolved(source) == [None]
+
+
+def test_entry_points_mount_specs_and_helpers(project):
+    p = project()
+    entries = spec_entry_points(p.specs, p.tests)
+    assert entries == [
+        (str(p.specs[0]), ("ReplicatedStorage", "Tests", "a.spec")),
+        (str(p.specs[1]), ("ReplicatedStorage", "Tests", "b.spec")),
+        (str(p.helpers), ("ReplicatedStorage", "Tests", "_helpers")),
+    ]
+
+    p.helpers.unlink()
+    assert len(spec_entry_points(p.specs, p.tests)) == 2
+
+
+def test_reachable_files_follows_requires(project):
+    p = project(HELPERS_REQUIRING_UTIL)
+
+    keep, reason = reachable_files(spec_entry_points(p.specs[:1], p.tests), p.instance_map)
+    assert (keep, reason) == ({str(p.util)}, None)
+
+    keep, reason = reachable_files(spec_entry_points(p.specs, p.tests), p.instance_map)
+    assert (keep, reason) == ({str(p.util), str(p.other)}, None)
+
+
+def test_reachable_files_gives_up_on_unresolvable_requires(project):
+    p = project("return require(someModule)\n")
+    keep, reason = reachable_files(spec_entry_points(p.specs, p.tests), p.instance_map)
+    assert keep is None
+    assert "dynamic require(someModule)" in reason
+
+    p.helpers.write_text('return require(game:GetService("ReplicatedStorage").Shared.Missing)\n', encoding="utf-8")
+    keep, reason = reachable_files(spec_entry_points(p.specs, p.tests), p.instance_map)
+    assert keep is None
+    assert reason.startswith("unresolved require(")
@@ -37,7 +37,8 @@ def verify():
     bundle = "-- MOCK BUNDLE CONTENT --"
     
     # Mock requests
-    with patch("aether.runner.requests") as mock_req:
+    with patch("aether.engine.get_client") as mock_get_client:
+        mock_req = mock_get_client.return_value
         # Mock Response
         mock_resp = MagicMock()
         mock_resp.json.return_value = {"path": "task/id"}